@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from io import BytesIO
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import Http404, HttpRequest, HttpResponse
+from django.urls import Resolver404, resolve
+from django.views.decorators.csrf import csrf_exempt
+
+from .responses import error_response
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_REQUESTS = 10
+BATCH_PATH = "/api/batch/"
+
+# Never forwarded to sub-requests: bodies, and encodings (the envelope embeds
+# raw JSON; the outer response is compressed as a whole).
+DROPPED_META = {"CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_ACCEPT_ENCODING"}
+
+
+def _parse(request: HttpRequest) -> list[dict[str, str]]:
+    try:
+        payload = json.loads(request.body or b"null")
+    except ValueError as exc:
+        raise ValueError("Body must be JSON.") from exc
+
+    items = payload.get("requests") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError("Expected {\"requests\": [{\"id\", \"path\"}, ...]}.")
+    if len(items) > MAX_BATCH_REQUESTS:
+        raise ValueError(f"At most {MAX_BATCH_REQUESTS} requests per batch.")
+
+    parsed = []
+    for i, item in enumerate(items):
+        path = item.get("path") if isinstance(item, dict) else None
+        if not isinstance(path, str) or not path.startswith("/api/"):
+            raise ValueError(f"requests[{i}].path must be an /api/ path.")
+        if path.partition("?")[0] == BATCH_PATH:
+            raise ValueError("Batches cannot be nested.")
+        if item.get("method", "GET").upper() != "GET":
+            raise ValueError("Only GET sub-requests are supported.")
+        parsed.append({"id": str(item.get("id", i)), "path": path})
+    return parsed
+
+
+def _sub_request(request: HttpRequest, path_qs: str) -> HttpRequest:
+    path, _, query = path_qs.partition("?")
+    meta = {k: v for k, v in request.META.items() if k not in DROPPED_META}
+    meta.update(
+        {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "wsgi.input": BytesIO(),
+        }
+    )
+    sub = WSGIRequest(meta)
+    # Reuse what the outer request's middleware already resolved.
+    sub.user = request.user
+    sub.session = request.session
+    return sub
+
+
+def _call(request: HttpRequest, path: str) -> HttpResponse:
+    sub = _sub_request(request, path)
+    try:
+        match = resolve(sub.path_info)
+        if iscoroutinefunction(match.func):
+            # async views are streams (stats_stream); nothing to batch
+            return error_response(
+                code="not_batchable",
+                message="Async views cannot be batched.",
+                status=400,
+            )
+        sub.resolver_match = match
+        response = match.func(sub, *match.args, **match.kwargs)
+        if hasattr(response, "render") and callable(response.render):
+            response = response.render()
+        return response
+    except (Http404, Resolver404):
+        return error_response(code="not_found", message="Not found.", status=404)
+    except PermissionDenied:
+        return error_response(
+            code="permission_denied", message="Permission denied.", status=403
+        )
+    except Exception:
+        logger.exception("Batched sub-request %s failed", path)
+        return error_response(
+            code="server_error", message="Internal server error.", status=500
+        )
+
+
+def _call_in_thread(request: HttpRequest, path: str) -> HttpResponse:
+    try:
+        return _call(request, path)
+    finally:
+        # Executor threads never see request_finished, and a persistent
+        # connection (CONN_MAX_AGE) would stay open in each one: close them.
+        connections.close_all()
+
+
+def _encode(item_id: str, response: HttpResponse) -> bytes:
+    try:
+        return _encode_response(item_id, response)
+    except Exception:
+        logger.exception("Could not encode batched response %s", item_id)
+        return _encode_response(
+            item_id,
+            error_response(
+                code="server_error", message="Internal server error.", status=500
+            ),
+        )
+
+
+def _encode_response(item_id: str, response: HttpResponse) -> bytes:
+    if response.streaming:
+        response.close()
+        response = error_response(
+            code="not_batchable",
+            message="Streaming responses cannot be batched.",
+            status=400,
+        )
+
+    content_type = response.get("Content-Type", "")
+    # JSON bodies are spliced in as-is instead of being decoded and re-encoded.
+    if content_type.startswith("application/json") and response.content:
+        body = response.content
+    else:
+        body = json.dumps(response.content.decode(response.charset)).encode()
+
+    head: dict[str, Any] = {"id": item_id, "status": response.status_code}
+    if response.has_header("ETag"):
+        head["etag"] = response["ETag"]
+    return json.dumps(head).encode()[:-1] + b', "body": ' + body + b"}"
+
+
+@csrf_exempt  # sub-requests are GET-only, so nothing here changes state
+async def batch(request):
+    """
+    POST /api/batch/ {"requests": [{"id": "...", "path": "/api/..."}, ...]}
+
+    Runs GET sub-requests in-process (URL resolver + view, no network hop)
+    with the caller's session/user. Under ASGI they run concurrently in
+    worker threads; under WSGI one after another.
+    """
+    if request.method != "POST":
+        return error_response(
+            code="method_not_allowed",
+            message=f"Method {request.method} not allowed.",
+            status=405,
+        )
+
+    try:
+        items = await sync_to_async(_parse)(request)
+    except ValueError as exc:
+        return error_response(code="invalid_batch", message=str(exc), status=400)
+
+    # Resolve the lazy user once, up front, instead of racing in every thread.
+    await sync_to_async(lambda: request.user.is_authenticated)()
+
+    if isinstance(request, ASGIRequest):
+        responses = await asyncio.gather(
+            *(
+                sync_to_async(_call_in_thread, thread_sensitive=False)(
+                    request, item["path"]
+                )
+                for item in items
+            )
+        )
+    else:
+        responses = [
+            await sync_to_async(_call)(request, item["path"]) for item in items
+        ]
+
+    parts = [_encode(item["id"], r) for item, r in zip(items, responses)]
+    return HttpResponse(
+        b'{"responses": [' + b", ".join(parts) + b"]}",
+        content_type="application/json",
+    )
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from collections import OrderedDict
+from hashlib import md5
+
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.http import quote_etag
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+# Below this the headers + framing outweigh what compression saves.
+MIN_BYTES = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 9+ costs several times more CPU for a few % on JSON
+CACHE_BYTES = 8 * 1024 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The best encoding the client accepts (q > 0); brotli wins ties."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli else ["gzip"]
+    best = max(candidates, key=lambda enc: accepted.get(enc, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+class CompressedCache:
+    """Thread-safe LRU of compressed bodies keyed by (content ETag, encoding)."""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str]) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+compressed_cache = CompressedCache()
+
+
+def is_cacheable(request, response) -> bool:
+    """GET 200s the view marked shareable (`cache_control(public/max_age)`)."""
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return False
+    cache_control = response.get("Cache-Control", "")
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return "public" in cache_control or bool(get_max_age(response))
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli for non-streaming text responses of at least MIN_BYTES.
+
+    Cacheable responses get a content ETag (if the view set none) and their
+    compressed body is kept in `compressed_cache` under it, so unchanged
+    payloads are only compressed once per worker. Responses that set cookies
+    are left alone (BREACH).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "")
+        if len(response.content) < MIN_BYTES or not content_type.startswith(
+            COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or response.cookies:
+            return response
+
+        content = response.content
+        if is_cacheable(request, response):
+            digest = md5(content, usedforsecurity=False).hexdigest()
+            if not response.has_header("ETag"):
+                response.headers["ETag"] = quote_etag(digest)
+            key = (digest, encoding)
+            body = compressed_cache.get(key)
+            if body is None:
+                body = compress(content, encoding)
+                compressed_cache.put(key, body)
+        else:
+            body = compress(content, encoding)
+
+        if len(body) >= len(content):
+            return response
+
+        response.content = body
+        response.headers["Content-Length"] = str(len(body))
+        response.headers["Content-Encoding"] = encoding
+        # the compressed body is a different representation (RFC 9110 8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
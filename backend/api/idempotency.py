@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import functools
+import re
+import secrets
+import time
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .responses import error_response
+
+# Idempotency-Key support for POST endpoints that clients retry after
+# timeouts. The first response (status, headers, body) is stored in the
+# default cache under the key *and* a fingerprint of the request, so a retry
+# is answered from the cache before authentication, throttling, validation or
+# any query runs. A different request reusing the same key is simply treated
+# as a new request.
+#
+# While the first request is running (it holds a lock for at most
+# IDEMPOTENCY_LOCK_SECONDS), duplicates poll for its result for up to
+# IDEMPOTENCY_WAIT_SECONDS, then give up with a 409. The lock holds a random
+# token, so a request that outlived its lock does not release the lock a
+# duplicate took over in the meantime.
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+VALID_KEY = re.compile(r"^[\x21-\x7e]{1,255}$")
+
+# Never replayed: transient failures the client should be able to retry.
+UNCACHED_STATUSES = {429}
+SKIPPED_HEADERS = {"set-cookie", "vary", "date"}
+
+POLL_SECONDS = 0.05
+
+
+def _fingerprint(request) -> str:
+    digest = sha256()
+    for part in (
+        request.method,
+        request.get_full_path(),
+        # credentials, not identities: auth has not run yet
+        request.META.get("HTTP_AUTHORIZATION", ""),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ""),
+    ):
+        digest.update(part.encode() + b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(stored: dict) -> HttpResponse:
+    response = HttpResponse(stored["body"], status=stored["status"])
+    for name, value in stored["headers"]:
+        response[name] = value
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _store(response: HttpResponse) -> dict:
+    return {
+        "status": response.status_code,
+        "headers": [
+            (name, value)
+            for name, value in response.items()
+            if name.lower() not in SKIPPED_HEADERS
+        ],
+        "body": response.content,
+    }
+
+
+def _release(lock_key: str, token: str) -> None:
+    # Not atomic, but the lock would have to expire and be taken over
+    # between these two calls; the common case (it already expired and
+    # someone else holds it) is covered.
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def idempotent(view_func):
+    """
+    Honour an `Idempotency-Key` header on POST. Apply to DRF views with
+    `method_decorator(idempotent, name="dispatch")` so replays skip
+    throttling and authentication as well as the handler.
+    """
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method != "POST" or key is None:
+            return view_func(request, *args, **kwargs)
+        if not VALID_KEY.match(key):
+            return error_response(
+                code="invalid_idempotency_key",
+                message=f"{IDEMPOTENCY_HEADER} must be 1-255 printable characters.",
+            )
+
+        cache_key = "idem:" + sha256(
+            f"{key}\0{_fingerprint(request)}".encode()
+        ).hexdigest()
+        lock_key = cache_key + ":lock"
+
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return _replay(stored)
+
+        lock_timeout = settings.IDEMPOTENCY_LOCK_SECONDS
+        token = secrets.token_hex(8)
+        if not cache.add(lock_key, token, timeout=lock_timeout):
+            deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(POLL_SECONDS)
+                stored = cache.get(cache_key)
+                if stored is not None:
+                    return _replay(stored)
+                if cache.add(lock_key, token, timeout=lock_timeout):
+                    break  # the first request failed without storing a result
+            else:
+                return error_response(
+                    code="idempotency_in_progress",
+                    message="A request with this Idempotency-Key is in progress.",
+                    status=409,
+                )
+
+        try:
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, "render") and callable(response.render):
+                response.render()
+            if (
+                response.status_code < 500
+                and response.status_code not in UNCACHED_STATUSES
+                and not response.streaming
+            ):
+                cache.set(cache_key, _store(response), settings.IDEMPOTENCY_TTL)
+            return response
+        finally:
+            _release(lock_key, token)
+
+    return wrapper
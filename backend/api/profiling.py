@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+
+from .logs import request_id_var
+
+logger = logging.getLogger(__name__)
+
+# On-demand request profiling. A request is profiled when it carries a signed
+# X-Profile header (`manage.py profile_token`), when a staff user adds
+# `?_profile=1`, or for a PROFILE_SAMPLE_RATE fraction of requests.
+#
+# Modes:
+#   "cprofile": cProfile (-> .prof, for pstats/snakeviz) plus the stack sampler
+#   "sample":   stack sampler only (-> .collapsed, for flamegraph.pl/speedscope)
+#
+# Each profile is stored as <name>.json (request metadata) plus its output
+# files in PROFILE_DIR. Only the newest PROFILE_MAX_FILES profiles are kept.
+#
+# Only one cProfile can be active per process (on 3.12+ a second enable()
+# raises ValueError), so a "cprofile" request that finds one already running
+# in another thread is sampled instead.
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-ID"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_SALT = "api.profiling"
+MODES = ("cprofile", "sample")
+SUFFIXES = (".json", ".prof", ".collapsed")
+
+VALID_NAME = re.compile(r"^\d+-[A-Za-z0-9_-]+$")
+
+_cprofile_lock = threading.Lock()
+
+
+def make_profile_token(mode: str = "cprofile") -> str:
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    return signing.TimestampSigner(salt=PROFILE_SALT).sign(mode)
+
+
+def _mode_from_token(token: str) -> str | None:
+    try:
+        mode = signing.TimestampSigner(salt=PROFILE_SALT).unsign(
+            token, max_age=settings.PROFILE_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else None
+
+
+def requested_mode(request) -> str | None:
+    """Which mode (if any) to profile this request with."""
+    token = request.headers.get(PROFILE_HEADER)
+    if token:
+        return _mode_from_token(token)
+
+    flag = request.GET.get(PROFILE_QUERY_PARAM)
+    if flag is not None:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_active and user.is_staff:
+            return flag if flag in MODES else "cprofile"
+        return None
+
+    rate = settings.PROFILE_SAMPLE_RATE
+    if rate > 0 and random.random() < rate:
+        return "sample"
+    return None
+
+
+# ---------------- Stack sampler ----------------
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and counts identical stacks (collapsed-stack format).
+
+    The profiled thread pays nothing except GIL hand-offs, so this is cheap
+    enough to leave on for a sampled fraction of production traffic.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def __enter__(self) -> StackSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+# ---------------- Storage ----------------
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_file(filename: str) -> Path | None:
+    """Path of a stored profile file, or None for anything not ours."""
+    name, dot, suffix = filename.rpartition(".")
+    if not VALID_NAME.match(name) or f"{dot}{suffix}" not in SUFFIXES:
+        return None
+    path = profile_dir() / filename
+    return path if path.is_file() else None
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    """Stored profiles, newest first: metadata plus available files."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for meta_path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            continue
+        meta["files"] = [
+            meta_path.stem + suffix
+            for suffix in SUFFIXES
+            if (directory / (meta_path.stem + suffix)).is_file()
+        ]
+        profiles.append(meta)
+    return profiles
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    # Names start with a millisecond timestamp, so they sort oldest-first.
+    for meta_path in sorted(directory.glob("*.json"))[: -max(keep, 1)]:
+        for suffix in SUFFIXES:
+            (directory / (meta_path.stem + suffix)).unlink(missing_ok=True)
+
+
+def save_profile(
+    meta: dict[str, Any],
+    profiler: cProfile.Profile | None,
+    sampler: StackSampler,
+) -> str:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    request_id = re.sub(r"[^A-Za-z0-9_-]", "_", request_id_var.get()) or "req"
+    name = f"{int(time.time() * 1000)}-{request_id}"
+
+    if profiler is not None:
+        profiler.dump_stats(directory / f"{name}.prof")
+    (directory / f"{name}.collapsed").write_text(sampler.collapsed())
+    # metadata last: list_profiles() only sees complete profiles
+    (directory / f"{name}.json").write_text(json.dumps({"name": name, **meta}))
+
+    _rotate(directory, settings.PROFILE_MAX_FILES)
+    return name
+
+
+# ---------------- Middleware ----------------
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the rest of the middleware chain and the view for requests
+    selected by `requested_mode`. Sits after AuthenticationMiddleware so the
+    staff query flag can see `request.user`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        profiler = None
+        if mode == "cprofile":
+            if _cprofile_lock.acquire(blocking=False):
+                profiler = cProfile.Profile()
+            else:
+                mode = "sample"  # another thread is being cProfiled
+        interval = settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        start = time.perf_counter()
+        try:
+            with StackSampler(threading.get_ident(), interval) as sampler:
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            if profiler is not None:
+                _cprofile_lock.release()
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        meta = {
+            "mode": mode,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+            "samples": sampler.stacks.total(),
+            "created": time.time(),
+        }
+        try:
+            response[PROFILE_ID_HEADER] = save_profile(meta, profiler, sampler)
+        except OSError:
+            logger.warning("Could not write profile to %s", profile_dir())
+        return response
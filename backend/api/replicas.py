@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# POSTs that only read (api.batch runs GET sub-requests)
+READ_ONLY_PATHS = {"/api/batch/"}
+
+# Only set by ReplicaPinMiddleware for safe, unpinned requests: management
+# commands, shells and writes read from the primary.
+_use_replicas: ContextVar[bool] = ContextVar("db_use_replicas", default=False)
+
+# 0 when the replica has replayed everything it received (an idle primary
+# would otherwise look like growing lag); NULL on a non-replica.
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def replica_lag_seconds(alias: str) -> float:
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0  # no replication to measure (e.g. two local SQLite files)
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LAG_SQL)
+        (lag,) = cursor.fetchone()
+    return float(lag or 0)
+
+
+class ReplicaHealth:
+    """
+    Per-process cache of which replicas are in rotation.
+
+    Each replica's lag is re-measured at most every REPLICA_CHECK_INTERVAL
+    seconds; a replica that lags too much or errors is skipped until its
+    next check.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checked: dict[str, tuple[float, bool]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checked.clear()
+
+    def healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(alias)
+            if checked and now - checked[0] < settings.REPLICA_CHECK_INTERVAL:
+                return checked[1]
+            # claim the check so concurrent requests keep the previous verdict
+            self._checked[alias] = (now, checked[1] if checked else True)
+
+        try:
+            lag = replica_lag_seconds(alias)
+            ok = lag <= settings.REPLICA_MAX_LAG_SECONDS
+            if not ok:
+                logger.warning("Replica %s lags %.1fs; out of rotation", alias, lag)
+        except DatabaseError:
+            logger.warning("Replica %s unreachable; out of rotation", alias)
+            ok = False
+
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), ok)
+        return ok
+
+
+replica_health = ReplicaHealth()
+
+
+def pick_replica() -> str | None:
+    if not _use_replicas.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    candidates = [a for a in settings.REPLICA_DATABASES if replica_health.healthy(a)]
+    return random.choice(candidates) if candidates else None
+
+
+class ReplicaRouter:
+    """Reads go to a healthy replica when allowed (see above); writes to default."""
+
+    def db_for_read(self, model, **hints) -> str:
+        return pick_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # replicas hold the same data as the primary
+        return True
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes: unsafe requests use the primary throughout and pin the
+    client (via a short-lived cookie) to it for REPLICA_PIN_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+
+        wrote = (
+            request.method not in SAFE_METHODS
+            and request.path not in READ_ONLY_PATHS
+        )
+        token = _use_replicas.set(not wrote and not self._has_pin(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replicas.reset(token)
+
+        if wrote:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time()) + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
+
+    def _has_pin(self, request) -> bool:
+        try:
+            until = int(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            return False
+        now = time.time()
+        # the upper bound stops a hand-made cookie pinning a client forever
+        return now < until <= now + settings.REPLICA_PIN_SECONDS
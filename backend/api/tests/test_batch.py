@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncClient, SimpleTestCase, TestCase
+
+from api.batch import MAX_BATCH_REQUESTS
+
+
+class BatchEndpointTests(TestCase):
+    def _batch(self, requests, client=None):
+        return (client or self.client).post(
+            "/api/batch/", {"requests": requests}, content_type="application/json"
+        )
+
+    def test_batch_runs_sub_requests_with_session(self):
+        user = get_user_model().objects.create_user(username="u", password="pass")
+        self.client.force_login(user)
+
+        resp = self._batch(
+            [
+                {"id": "health", "path": "/api/health/"},
+                {"id": "auth", "path": "/api/auth-check/"},
+                {"id": "missing", "path": "/api/nope/"},
+            ]
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json()["responses"],
+            [
+                {"id": "health", "status": 200, "body": {"status": "ok"}},
+                {"id": "auth", "status": 200, "body": {"status": "ok"}},
+                {
+                    "id": "missing",
+                    "status": 404,
+                    "body": {
+                        "error": {
+                            "code": "not_found",
+                            "message": "Not found.",
+                            "details": None,
+                        }
+                    },
+                },
+            ],
+        )
+
+    def test_sub_request_query_strings_and_errors(self):
+        resp = self._batch(
+            [{"id": "p", "path": "/api/games/sudoku/percentile/?solve_ms=abc"}]
+        )
+
+        (item,) = resp.json()["responses"]
+        self.assertEqual(item["status"], 400)
+        self.assertEqual(item["body"]["error"]["code"], "invalid_query")
+
+    def test_async_views_are_rejected_per_item(self):
+        resp = self._batch(
+            [
+                {"id": "stream", "path": "/api/stats/stream/"},
+                {"id": "health", "path": "/api/health/"},
+            ]
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        stream, health = resp.json()["responses"]
+        self.assertEqual(stream["status"], 400)
+        self.assertEqual(stream["body"]["error"]["code"], "not_batchable")
+        self.assertEqual(health["status"], 200)
+
+    def test_unencodable_response_fails_only_its_item(self):
+        broken = HttpResponse(b"\xff", content_type="text/plain; charset=utf-8")
+        with (
+            mock.patch("api.batch._call", side_effect=[broken, HttpResponse()]),
+            self.assertLogs("api.batch", "ERROR"),
+        ):
+            resp = self._batch(
+                [{"id": "a", "path": "/api/health/"}, {"id": "b", "path": "/api/health/"}]
+            )
+
+        statuses = [(r["id"], r["status"]) for r in resp.json()["responses"]]
+        self.assertEqual(statuses, [("a", 500), ("b", 200)])
+
+    def test_invalid_batches_are_rejected(self):
+        too_many = [{"path": "/api/health/"}] * (MAX_BATCH_REQUESTS + 1)
+        for requests in (
+            [],
+            too_many,
+            [{"path": "https://example.com/"}],
+            [{"path": "/api/batch/"}],
+            [{"path": "/api/health/", "method": "DELETE"}],
+        ):
+            resp = self._batch(requests)
+            self.assertEqual(resp.status_code, 400, requests)
+            self.assertEqual(resp.json()["error"]["code"], "invalid_batch")
+
+    def test_get_is_not_allowed(self):
+        resp = self.client.get("/api/batch/")
+        self.assertEqual(resp.status_code, 405)
+
+
+class AsgiBatchEndpointTests(SimpleTestCase):
+    async def test_concurrent_sub_requests_under_asgi(self):
+        resp = await AsyncClient().post(
+            "/api/batch/",
+            {
+                "requests": [
+                    {"id": "a", "path": "/api/health/"},
+                    {"id": "b", "path": "/api/health/"},
+                    {"id": "c", "path": "/api/auth-check/"},
+                    {"id": "d", "path": "/api/stats/stream/"},
+                ]
+            },
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        statuses = [(r["id"], r["status"]) for r in resp.json()["responses"]]
+        self.assertEqual(statuses[:2], [("a", 200), ("b", 200)])
+        self.assertEqual(statuses[2][0], "c")
+        self.assertIn(statuses[2][1], (401, 403))
+        self.assertEqual(statuses[3], ("d", 400))  # async view: not awaited here
+
+    async def test_worker_threads_close_their_connections(self):
+        with mock.patch("api.batch.connections") as conns:
+            await AsyncClient().post(
+                "/api/batch/",
+                {"requests": [{"path": "/api/health/"}, {"path": "/api/health/"}]},
+                content_type="application/json",
+            )
+
+        self.assertEqual(conns.close_all.call_count, 2)
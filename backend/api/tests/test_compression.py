@@ -0,0 +1,63 @@
+import gzip
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from api.compression import brotli, compressed_cache, negotiate
+from apps.content.models import Project
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        compressed_cache.clear()
+        for i in range(10):
+            Project.objects.create(
+                slug=f"project-{i}",
+                title=f"Project {i}",
+                description="A reasonably long description. " * 3,
+            )
+
+    def _get(self, accept_encoding):
+        return self.client.get(
+            "/api/content/projects/", HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+
+    def test_gzip_json_response(self):
+        response = self._get("gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        body = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(body), 10)
+
+    def test_brotli_preferred_when_accepted(self):
+        if brotli is None:
+            self.skipTest("brotli not installed")
+
+        response = self._get("gzip, deflate, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))), 10)
+
+    def test_repeat_hits_reuse_compressed_body(self):
+        first = self._get("gzip")
+        with mock.patch("api.compression.compress") as compress:
+            second = self._get("gzip")
+
+        compress.assert_not_called()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(compressed_cache.stats()["hits"], 1)
+
+    def test_identity_and_small_responses_are_untouched(self):
+        self.assertFalse(self._get("identity").has_header("Content-Encoding"))
+        health = self.client.get("/api/health/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(health.has_header("Content-Encoding"))
+
+    def test_negotiate_honours_q_values(self):
+        self.assertEqual(negotiate("gzip;q=1.0, br;q=0"), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0"))
+        self.assertIsNone(negotiate(""))
+        self.assertEqual(negotiate("*"), "br" if brotli else "gzip")
@@ -0,0 +1,63 @@
+import json
+import logging
+from io import StringIO
+
+from django.test import SimpleTestCase
+
+from api.logs import (
+    QueueListenerHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var,
+)
+
+
+class StructuredLoggingTests(SimpleTestCase):
+    def _record(self, name="apps.games", level=logging.INFO, msg="hi"):
+        return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+    def test_request_id_header(self):
+        resp = self.client.get("/api/health/")
+        self.assertRegex(resp["X-Request-ID"], r"^[0-9a-f]{32}$")
+
+        resp = self.client.get("/api/health/", HTTP_X_REQUEST_ID="edge-1234abcd")
+        self.assertEqual(resp["X-Request-ID"], "edge-1234abcd")
+
+        resp = self.client.get("/api/health/", HTTP_X_REQUEST_ID="bad id\n")
+        self.assertNotEqual(resp["X-Request-ID"], "bad id\n")
+
+    def test_access_record_per_request(self):
+        with self.assertLogs("api.access", "INFO") as logs:
+            self.client.get("/api/health/")
+
+        (record,) = logs.records
+        self.assertEqual((record.path, record.status), ("/api/health/", 200))
+
+    def test_sampling_by_logger_prefix(self):
+        sampler = SamplingFilter("apps.games=0,apps=1")
+
+        self.assertFalse(sampler.filter(self._record("apps.games.views")))
+        self.assertTrue(sampler.filter(self._record("apps.games", logging.WARNING)))
+        self.assertTrue(sampler.filter(self._record("apps.content")))
+        self.assertTrue(sampler.filter(self._record("django.request")))
+
+    def test_queue_handler_writes_json_lines_off_thread(self):
+        stream = StringIO()
+        handler = QueueListenerHandler(stream=stream)
+        handler.addFilter(RequestIdFilter())
+
+        token = request_id_var.set("req-12345678")
+        try:
+            record = self._record(msg="score %s")
+            record.args = (42,)
+            record.solve_ms = 42
+            handler.handle(record)
+        finally:
+            request_id_var.reset(token)
+        handler.stop()
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry["msg"], "score 42")
+        self.assertEqual(entry["request_id"], "req-12345678")
+        self.assertEqual(entry["solve_ms"], 42)
+        self.assertEqual(entry["level"], "INFO")
@@ -0,0 +1,117 @@
+import pstats
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from api.logs import request_id_var
+from api.profiling import (
+    PROFILE_ID_HEADER,
+    ProfilingMiddleware,
+    list_profiles,
+    make_profile_token,
+)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = override_settings(
+            PROFILE_DIR=self.tmp.name, PROFILE_MAX_FILES=2
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.staff = get_user_model().objects.create_user(
+            username="admin", password="pass", is_staff=True
+        )
+
+    def test_unflagged_requests_are_not_profiled(self):
+        resp = self.client.get("/api/health/?_profile=1")
+
+        self.assertNotIn(PROFILE_ID_HEADER, resp)
+        self.assertEqual(list_profiles(), [])
+
+    def test_staff_query_flag_writes_pstats_and_collapsed_stacks(self):
+        self.client.force_login(self.staff)
+
+        resp = self.client.get("/api/health/?_profile=1")
+
+        name = resp[PROFILE_ID_HEADER]
+        (profile,) = list_profiles()
+        self.assertEqual(profile["name"], name)
+        self.assertEqual(profile["path"], "/api/health/?_profile=1")
+        self.assertEqual(profile["status"], 200)
+        self.assertEqual(
+            profile["files"], [f"{name}.json", f"{name}.prof", f"{name}.collapsed"]
+        )
+        stats = pstats.Stats(str(Path(self.tmp.name, f"{name}.prof")))
+        self.assertIn("health", {func for _, _, func in stats.stats})
+
+    def test_signed_header(self):
+        resp = self.client.get("/api/health/", HTTP_X_PROFILE="sample:bogus")
+        self.assertNotIn(PROFILE_ID_HEADER, resp)
+
+        resp = self.client.get(
+            "/api/health/", HTTP_X_PROFILE=make_profile_token("sample")
+        )
+        name = resp[PROFILE_ID_HEADER]
+        (profile,) = list_profiles()
+        self.assertEqual(profile["mode"], "sample")
+        self.assertEqual(profile["files"], [f"{name}.json", f"{name}.collapsed"])
+
+    def test_concurrent_cprofile_requests_fall_back_to_the_sampler(self):
+        token = make_profile_token()
+        factory = RequestFactory()
+        responses = []
+
+        def other_request():
+            request_id_var.set("other")
+            responses.append(
+                middleware(factory.get("/api/health/", HTTP_X_PROFILE=token))
+            )
+
+        def view(request):
+            if request_id_var.get() != "other":  # still profiling the first
+                thread = threading.Thread(target=other_request)
+                thread.start()
+                thread.join()
+            return HttpResponse("ok")
+
+        middleware = ProfilingMiddleware(view)
+        first = middleware(factory.get("/api/health/", HTTP_X_PROFILE=token))
+        (second,) = responses
+
+        modes = {p["name"]: p["mode"] for p in list_profiles()}
+        self.assertEqual(modes[first[PROFILE_ID_HEADER]], "cprofile")
+        self.assertEqual(modes[second[PROFILE_ID_HEADER]], "sample")
+
+    def test_directory_is_bounded(self):
+        token = make_profile_token("sample")
+        names = [
+            self.client.get("/api/health/", HTTP_X_PROFILE=token)[PROFILE_ID_HEADER]
+            for _ in range(3)
+        ]
+
+        self.assertEqual([p["name"] for p in list_profiles()], names[:0:-1])
+        self.assertEqual(len(list(Path(self.tmp.name).iterdir())), 4)
+
+    def test_admin_lists_and_downloads_profiles(self):
+        name = self.client.get(
+            "/api/health/", HTTP_X_PROFILE=make_profile_token()
+        )[PROFILE_ID_HEADER]
+
+        self.assertEqual(self.client.get("/admin/profiles/").status_code, 302)
+
+        self.client.force_login(self.staff)
+        resp = self.client.get("/admin/profiles/")
+        self.assertContains(resp, f"{name}.prof")
+
+        resp = self.client.get(f"/admin/profiles/{name}.prof")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("attachment", resp["Content-Disposition"])
+        resp = self.client.get("/admin/profiles/settings.py")
+        self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from api.replicas import PIN_COOKIE, replica_health
+from apps.content.models import Project
+
+
+@override_settings(
+    DATABASE_ROUTERS=["api.replicas.ReplicaRouter"],
+    REPLICA_DATABASES=["replica1"],
+    REPLICA_PIN_SECONDS=5,
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    # TransactionTestCase: TestCase's wrapping atomic() would pin every read
+    # to the primary.
+    databases = {"default", "replica1"}
+
+    def setUp(self):
+        replica_health.reset()
+        Project.objects.using("default").create(slug="primary", title="Primary")
+        Project.objects.using("replica1").create(slug="replica", title="Replica")
+
+    def _slugs(self):
+        response = self.client.get("/api/content/projects/")
+        self.assertEqual(response.status_code, 200)
+        return [p["slug"] for p in response.json()]
+
+    def test_safe_reads_go_to_replica(self):
+        self.assertEqual(self._slugs(), ["replica"])
+
+    def test_client_reads_own_writes_after_unsafe_request(self):
+        response = self.client.post("/api/content/projects/")
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        self.assertEqual(self._slugs(), ["primary"])
+
+    def test_expired_or_forged_pin_is_ignored(self):
+        self.client.cookies[PIN_COOKIE] = "9999999999"
+        self.assertEqual(self._slugs(), ["replica"])
+
+    def test_lagging_replica_is_taken_out_of_rotation(self):
+        with mock.patch("api.replicas.replica_lag_seconds", return_value=60.0):
+            self.assertEqual(self._slugs(), ["primary"])
+
+    def test_writes_always_go_to_primary(self):
+        Project.objects.create(slug="new", title="New")
+
+        self.assertTrue(Project.objects.using("default").filter(slug="new").exists())
+        self.assertFalse(
+            Project.objects.using("replica1").filter(slug="new").exists()
+        )
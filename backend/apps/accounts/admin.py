@@ -1,2 +1,18 @@
+from django.contrib import admin
 
-# Register your models here.
+from .models import RefreshToken, RevokedAccessToken
+
+
+@admin.register(RefreshToken)
+class RefreshTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "created_at", "expires_at", "revoked_at")
+    list_filter = ("revoked_at",)
+    search_fields = ("user__username", "jti")
+    readonly_fields = ("jti", "user", "created_at", "expires_at")
+    ordering = ("-created_at",)
+
+
+@admin.register(RevokedAccessToken)
+class RevokedAccessTokenAdmin(admin.ModelAdmin):
+    list_display = ("jti", "expires_at")
+    search_fields = ("jti",)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .tokens import TokenError, decode_access_token
+
+
+class TokenUser:
+    """
+    `request.user` for token-authenticated requests, built from the claims.
+
+    Not a model instance: code that needs the row should use `user.pk`
+    (e.g. `Score(user_id=request.user.pk)`) or fetch it explicitly.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.pk = self.id = payload["uid"]
+        self.username = payload.get("usr", "")
+        self.is_staff = bool(payload.get("stf"))
+        self.is_superuser = bool(payload.get("su"))
+        self._perms = frozenset(payload.get("perms", ()))
+
+    def __str__(self) -> str:
+        return self.username
+
+    def __eq__(self, other: object) -> bool:
+        return getattr(other, "is_authenticated", False) and other.pk == self.pk
+
+    def __hash__(self) -> int:
+        return hash(self.pk)
+
+    def get_username(self) -> str:
+        return self.username
+
+    def has_perm(self, perm: str, obj: Any = None) -> bool:
+        return self.is_superuser or perm in self._perms
+
+    def has_perms(self, perms, obj: Any = None) -> bool:
+        return all(self.has_perm(perm, obj) for perm in perms)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """`Authorization: Bearer <access token>`; verified without DB queries."""
+
+    keyword = b"bearer"
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if not parts or parts[0].lower() != self.keyword:
+            return None
+        if len(parts) != 2:
+            raise AuthenticationFailed("Invalid Authorization header.")
+
+        try:
+            payload = decode_access_token(parts[1].decode("ascii"))
+        except (TokenError, UnicodeDecodeError) as exc:
+            raise AuthenticationFailed(str(exc) or "Invalid token.") from exc
+        return TokenUser(payload), payload
+
+    def authenticate_header(self, request) -> str:
+        return 'Bearer realm="api"'
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.tokens import issue_access_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Authenticated request throughput: session cookie vs bearer token "
+        "(in-process, against the configured database)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--path", default="/api/auth-check/")
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options) -> None:
+        path, count = options["path"], options["requests"]
+        if count < 1:
+            raise CommandError("--requests must be at least 1.")
+
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost"
+        user = get_user_model().objects.create_user(
+            username=f"bench-auth-{uuid.uuid4().hex[:8]}"
+        )
+        try:
+            session = Client(HTTP_HOST=host)
+            session.force_login(user)
+            bearer = Client(
+                HTTP_HOST=host,
+                HTTP_AUTHORIZATION=f"Bearer {issue_access_token(user)}",
+            )
+
+            for label, client in (("session", session), ("bearer", bearer)):
+                response = client.get(path)  # warm-up (+ revocation list load)
+                if response.status_code != 200:
+                    raise CommandError(f"{label}: {path} -> {response.status_code}")
+
+                with CaptureQueriesContext(connection) as queries:
+                    client.get(path)
+                query_count = len(queries)
+
+                start = time.perf_counter()
+                for _ in range(count):
+                    client.get(path)
+                elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"{label:>8}: {count / elapsed:8.1f} req/s "
+                    f"{elapsed / count * 1e6:8.1f} us/req "
+                    f"{query_count} queries/req"
+                )
+        finally:
+            user.delete()
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.tokens import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired refresh tokens and access-token revocations."
+
+    def handle(self, *args, **options) -> None:
+        refresh, access = prune_expired_tokens()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. refresh_tokens={refresh} revoked_access_tokens={access}"
+            )
+        )
@@ -1,2 +1,37 @@
+import uuid
 
-# Create your models here.
+from django.conf import settings
+from django.db import models
+
+
+class RefreshToken(models.Model):
+    """
+    Server-side record of an issued refresh token (the token itself is signed).
+
+    Refreshing revokes the row and issues a new one; presenting an already
+    revoked token revokes every refresh token of that user (reuse detection).
+    """
+
+    jti = models.UUIDField(default=uuid.uuid4, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="refresh_tokens",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        state = "revoked" if self.revoked_at else "active"
+        return f"{self.user} refresh {self.jti} ({state})"
+
+
+class RevokedAccessToken(models.Model):
+    """Access tokens revoked before expiry; mirrored in-process by `tokens`."""
+
+    jti = models.UUIDField(unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"revoked access {self.jti}"
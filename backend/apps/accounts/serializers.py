@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+
+class TokenObtainSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150)
+    password = serializers.CharField(max_length=128, trim_whitespace=False)
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    refresh = serializers.CharField(max_length=512)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(max_length=512, required=False)
@@ -1,2 +1,137 @@
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.games.models import Score
+
+from .models import RefreshToken, RevokedAccessToken
+from .tokens import issue_access_token, issue_token_pair, revocations
+
+
+class SignedTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()  # auth throttle counters
+        revocations.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username="player", password="s3cret-pass"
+        )
+
+    def _bearer(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _obtain(self, password="s3cret-pass"):
+        return self.client.post(
+            "/api/accounts/token/",
+            {"username": "player", "password": password},
+            format="json",
+        )
+
+    def test_obtain_token_pair(self):
+        resp = self._obtain()
+
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(body["token_type"], "Bearer")
+        self.assertTrue(body["access"] and body["refresh"])
+        self.assertEqual(RefreshToken.objects.filter(user=self.user).count(), 1)
+
+    def test_wrong_password_is_rejected(self):
+        resp = self._obtain(password="nope")
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()["error"]["code"], "invalid_credentials")
+
+    def test_bearer_auth_needs_no_queries(self):
+        self._bearer(issue_access_token(self.user))
+        self.client.get("/api/auth-check/")  # loads the revocation list
+
+        with self.assertNumQueries(0):
+            resp = self.client.get("/api/auth-check/")
+
+        self.assertEqual(resp.status_code, 200)
+
+    def test_bad_tokens_are_rejected(self):
+        access = issue_access_token(self.user)
+        refresh = issue_token_pair(self.user)["refresh"]
+        for token in (access[:-2] + "xx", refresh, "garbage"):
+            self._bearer(token)
+            resp = self.client.get("/api/auth-check/")
+            self.assertEqual(resp.status_code, 401, token)
+
+    @override_settings(ACCESS_TOKEN_TTL=-1)
+    def test_expired_token_is_rejected(self):
+        self._bearer(issue_access_token(self.user))
+
+        resp = self.client.get("/api/auth-check/")
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertIn("Bearer", resp["WWW-Authenticate"])
+
+    def test_refresh_rotates_and_detects_reuse(self):
+        old = self._obtain().json()["refresh"]
+
+        resp = self.client.post(
+            "/api/accounts/token/refresh/", {"refresh": old}, format="json"
+        )
+        self.assertEqual(resp.status_code, 200)
+        new = resp.json()["refresh"]
+
+        resp = self.client.post(
+            "/api/accounts/token/refresh/", {"refresh": old}, format="json"
+        )
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()["error"]["code"], "invalid_token")
+
+        # reuse revoked the whole family, including the fresh token
+        resp = self.client.post(
+            "/api/accounts/token/refresh/", {"refresh": new}, format="json"
+        )
+        self.assertEqual(resp.status_code, 401)
+        self.assertFalse(RefreshToken.objects.filter(revoked_at__isnull=True).exists())
+
+    def test_revoke_logs_out(self):
+        pair = self._obtain().json()
+        self._bearer(pair["access"])
+
+        resp = self.client.post(
+            "/api/accounts/token/revoke/", {"refresh": pair["refresh"]}, format="json"
+        )
+        self.assertEqual(resp.status_code, 204)
+
+        self.assertEqual(self.client.get("/api/auth-check/").status_code, 401)
+        self.assertEqual(RevokedAccessToken.objects.count(), 1)
+
+        # other workers pick it up from the table on their next reload
+        revocations.clear()
+        self.assertEqual(self.client.get("/api/auth-check/").status_code, 401)
+
+    def test_token_user_can_write_owned_rows(self):
+        self._bearer(issue_access_token(self.user))
+
+        resp = self.client.post(
+            "/api/games/scores/", {"game": "bip", "solve_ms": 42_000}, format="json"
+        )
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(Score.objects.get().user, self.user)
+
+    def test_staff_flag_is_carried_in_token(self):
+        admin = get_user_model().objects.create_user(
+            username="admin", password="x", is_staff=True
+        )
+        self._bearer(issue_access_token(admin))
+
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 200)
+
+    @override_settings(REFRESH_TOKEN_TTL=-1)
+    def test_prune_tokens(self):
+        issue_token_pair(self.user)
+
+        call_command("prune_tokens", stdout=StringIO())
+
+        self.assertFalse(RefreshToken.objects.exists())
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .models import RefreshToken, RevokedAccessToken
+
+# Tokens are `django.core.signing` objects (HMAC-SHA256 with SECRET_KEY, so
+# SECRET_KEY_FALLBACKS rotation works). Distinct salts keep a refresh token
+# from being accepted as an access token and vice versa.
+#
+# Access payload: uid, usr (username), stf/su (staff/superuser), perms (model
+# permissions, staff only), jti, exp (unix seconds).
+# Refresh payload: uid, jti (-> RefreshToken row), exp.
+ACCESS_SALT = "apps.accounts.tokens.access"
+REFRESH_SALT = "apps.accounts.tokens.refresh"
+
+
+class TokenError(Exception):
+    pass
+
+
+def _sign(payload: dict[str, Any], salt: str) -> str:
+    return signing.Signer(salt=salt).sign_object(payload)
+
+
+def _unsign(token: str, salt: str) -> dict[str, Any]:
+    try:
+        payload = signing.Signer(salt=salt).unsign_object(token)
+    except (signing.BadSignature, ValueError) as exc:
+        raise TokenError("Invalid token.") from exc
+    if not isinstance(payload, dict) or payload.get("exp", 0) <= time.time():
+        raise TokenError("Token expired.")
+    return payload
+
+
+def _expiry(payload: dict[str, Any]) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=dt_timezone.utc)
+
+
+# ---------------- Revocation list ----------------
+
+
+class RevocationCache:
+    """
+    In-process copy of the unexpired `RevokedAccessToken` jtis.
+
+    Reloaded at most every TOKEN_REVOCATION_REFRESH_SECONDS, so a revocation
+    made on another worker applies within that window (immediately on the
+    worker that made it).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._revoked: dict[str, float] = {}
+        self._loaded_at = float("-inf")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked = {}
+            self._loaded_at = float("-inf")
+
+    def add(self, jti: str, exp: float) -> None:
+        with self._lock:
+            self._revoked[jti] = exp
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            refresh_every = settings.TOKEN_REVOCATION_REFRESH_SECONDS
+            stale = now - self._loaded_at >= refresh_every
+            if stale:
+                # claim the reload; other threads keep using the current set
+                self._loaded_at = now
+        if stale:
+            self._reload()
+        return jti in self._revoked
+
+    def _reload(self) -> None:
+        rows = RevokedAccessToken.objects.filter(
+            expires_at__gt=timezone.now()
+        ).values_list("jti", "expires_at")
+        revoked = {jti.hex: expires.timestamp() for jti, expires in rows}
+        with self._lock:
+            self._revoked = revoked
+
+
+revocations = RevocationCache()
+
+
+# ---------------- Access tokens ----------------
+
+
+def issue_access_token(user) -> str:
+    payload = {
+        "uid": user.pk,
+        "usr": user.get_username(),
+        "stf": int(user.is_staff),
+        "su": int(user.is_superuser),
+        "jti": uuid.uuid4().hex,
+        "exp": int(time.time()) + settings.ACCESS_TOKEN_TTL,
+    }
+    if user.is_staff and not user.is_superuser:
+        payload["perms"] = sorted(user.get_all_permissions())
+    return _sign(payload, ACCESS_SALT)
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    """Signature + expiry + revocation check; no DB access on the hot path."""
+    payload = _unsign(token, ACCESS_SALT)
+    if revocations.is_revoked(payload.get("jti", "")):
+        raise TokenError("Token revoked.")
+    return payload
+
+
+def revoke_access_token(payload: dict[str, Any]) -> None:
+    RevokedAccessToken.objects.get_or_create(
+        jti=payload["jti"], defaults={"expires_at": _expiry(payload)}
+    )
+    revocations.add(payload["jti"], payload["exp"])
+
+
+# ---------------- Refresh tokens ----------------
+
+
+def issue_token_pair(user) -> dict[str, Any]:
+    expires_at = timezone.now() + timedelta(seconds=settings.REFRESH_TOKEN_TTL)
+    row = RefreshToken.objects.create(user=user, expires_at=expires_at)
+    refresh = _sign(
+        {"uid": user.pk, "jti": row.jti.hex, "exp": int(expires_at.timestamp())},
+        REFRESH_SALT,
+    )
+    return {
+        "token_type": "Bearer",
+        "access": issue_access_token(user),
+        "expires_in": settings.ACCESS_TOKEN_TTL,
+        "refresh": refresh,
+    }
+
+
+def rotate_refresh_token(token: str) -> dict[str, Any]:
+    payload = _unsign(token, REFRESH_SALT)
+    row = (
+        RefreshToken.objects.select_related("user")
+        .filter(jti=payload.get("jti"), user_id=payload.get("uid"))
+        .first()
+    )
+    if row is None or not row.user.is_active:
+        raise TokenError("Invalid token.")
+
+    # No surrounding transaction: the conditional update is the atomic step,
+    # and the reuse revocation below must survive the error we raise.
+    now = timezone.now()
+    active = RefreshToken.objects.filter(revoked_at__isnull=True)
+    if not active.filter(pk=row.pk).update(revoked_at=now):
+        # An already-rotated token came back: assume it leaked and log the
+        # user out everywhere.
+        active.filter(user_id=row.user_id).update(revoked_at=now)
+        raise TokenError("Token reused.")
+
+    return issue_token_pair(row.user)
+
+
+def revoke_refresh_token(token: str) -> None:
+    payload = _unsign(token, REFRESH_SALT)
+    RefreshToken.objects.filter(
+        jti=payload.get("jti"), user_id=payload.get("uid"), revoked_at__isnull=True
+    ).update(revoked_at=timezone.now())
+
+
+def prune_expired_tokens() -> tuple[int, int]:
+    """-> (refresh rows deleted, revoked access rows deleted)"""
+    now = timezone.now()
+    refresh, _ = RefreshToken.objects.filter(expires_at__lte=now).delete()
+    access, _ = RevokedAccessToken.objects.filter(expires_at__lte=now).delete()
+    return refresh, access
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from .views import TokenObtainView, TokenRefreshView, TokenRevokeView
+
+urlpatterns = [
+    path("accounts/token/", TokenObtainView.as_view(), name="accounts-token"),
+    path(
+        "accounts/token/refresh/",
+        TokenRefreshView.as_view(),
+        name="accounts-token-refresh",
+    ),
+    path(
+        "accounts/token/revoke/",
+        TokenRevokeView.as_view(),
+        name="accounts-token-revoke",
+    ),
+]
@@ -1,2 +1,92 @@
+from django.contrib.auth import authenticate
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
 
-# Create your views here.
+from api.responses import error_response
+
+from .authentication import SignedTokenAuthentication
+from .serializers import (
+    RefreshTokenSerializer,
+    TokenObtainSerializer,
+    TokenRevokeSerializer,
+)
+from .tokens import (
+    TokenError,
+    issue_token_pair,
+    revoke_access_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+
+
+def _invalid_token(exc: TokenError):
+    return error_response(code="invalid_token", message=str(exc), status=401)
+
+
+class TokenObtainView(APIView):
+    """POST /api/accounts/token/ {username, password} -> access + refresh."""
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "auth"
+
+    def post(self, request):
+        serializer = TokenObtainSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = authenticate(request, **serializer.validated_data)
+        if user is None:
+            return error_response(
+                code="invalid_credentials",
+                message="Invalid username or password.",
+                status=401,
+            )
+        return Response(issue_token_pair(user))
+
+
+class TokenRefreshView(APIView):
+    """POST /api/accounts/token/refresh/ {refresh} -> rotated pair."""
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "auth"
+
+    def post(self, request):
+        serializer = RefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            return Response(rotate_refresh_token(serializer.validated_data["refresh"]))
+        except TokenError as exc:
+            return _invalid_token(exc)
+
+
+class TokenRevokeView(APIView):
+    """
+    POST /api/accounts/token/revoke/ (logout).
+
+    Revokes the bearer access token, if any, and the `refresh` token in the
+    body, if given.
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = [SignedTokenAuthentication]
+
+    def post(self, request):
+        serializer = TokenRevokeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        refresh = serializer.validated_data.get("refresh")
+        if refresh:
+            try:
+                revoke_refresh_token(refresh)
+            except TokenError as exc:
+                return _invalid_token(exc)
+        if request.auth:
+            revoke_access_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime, timedelta
+from hashlib import sha256
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Live site stats, streamed as Server-Sent Events (views.stats_stream, ASGI).
+#
+# One StatsHub per process. While anyone is connected, a single ticker task
+# refreshes a snapshot every LIVE_STATS_TICK_SECONDS: it tails new Score and
+# Submission rows (id > last seen) into a fixed-size ring of recent events,
+# reads this minute's visitor counter from the cache, and encodes one SSE
+# frame. Every client is sent that same frame, so N viewers cost one
+# aggregation per tick, not N.
+#
+# Backpressure: clients never get a queue. Each one waits for the next frame
+# and sends the newest; a slow reader simply skips the snapshots it was too
+# slow for. LIVE_STATS_MAX_CONNECTIONS bounds what stalled readers can hold.
+
+VISITORS_KEY = "live-stats:visitors"
+VISITOR_BUCKET_SECONDS = 60
+MAX_SEEN_VISITORS = 10_000
+RECENT_EVENTS = 10
+RETRY_MS = 5000
+
+
+@dataclass(frozen=True)
+class Event:
+    at: datetime
+    kind: str  # "solve" | "submission"
+    detail: dict[str, Any] = field(default_factory=dict)
+
+
+class EventRing:
+    """The last `size` events; the oldest is overwritten first."""
+
+    def __init__(self, size: int) -> None:
+        self._items: list[Event | None] = [None] * size
+        self._count = 0  # appended so far
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._items))
+
+    def append(self, event: Event) -> None:
+        self._items[self._count % len(self._items)] = event
+        self._count += 1
+
+    def newest_first(self) -> Iterator[Event]:
+        size = len(self._items)
+        for i in range(self._count - 1, self._count - 1 - len(self), -1):
+            yield self._items[i % size]
+
+
+# ---------------- Active visitors ----------------
+
+
+def _visitor_bucket(now: float | None = None) -> int:
+    return int((time.time() if now is None else now) // VISITOR_BUCKET_SECONDS)
+
+
+class ActiveVisitorMiddleware:
+    """
+    Counts distinct visitors (IP + User-Agent) per minute in the default
+    cache, so every worker's traffic reaches the stream. Each worker remembers
+    whom it already counted this minute and skips the cache for them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._lock = threading.Lock()
+        self._bucket: int | None = None
+        self._seen: set[str] = set()
+
+    def __call__(self, request):
+        self.record(request)
+        return self.get_response(request)
+
+    def record(self, request) -> None:
+        bucket = _visitor_bucket()
+        visitor = sha256(
+            "{}\0{}".format(
+                request.META.get("REMOTE_ADDR", ""),
+                request.META.get("HTTP_USER_AGENT", ""),
+            ).encode()
+        ).hexdigest()[:16]
+        with self._lock:
+            if bucket != self._bucket or len(self._seen) >= MAX_SEEN_VISITORS:
+                self._bucket = bucket
+                self._seen.clear()
+            if visitor in self._seen:
+                return
+            self._seen.add(visitor)
+
+        timeout = 3 * VISITOR_BUCKET_SECONDS
+        counter = f"{VISITORS_KEY}:{bucket}"
+        # cache.add is the cross-worker "first time this minute" check
+        if cache.add(f"{counter}:{visitor}", 1, timeout=timeout):
+            if not cache.add(counter, 1, timeout=timeout):
+                try:
+                    cache.incr(counter)
+                except ValueError:  # expired in between
+                    pass
+
+
+def active_visitors() -> int:
+    """Distinct visitors this minute, or last minute while this one fills up."""
+    bucket = _visitor_bucket()
+    counts = cache.get_many([f"{VISITORS_KEY}:{b}" for b in (bucket, bucket - 1)])
+    return max(counts.values(), default=0)
+
+
+# ---------------- Hub ----------------
+
+
+def _start_of_today() -> datetime:
+    return timezone.make_aware(datetime.combine(timezone.localdate(), dtime.min))
+
+
+class StatsHub:
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.ring: EventRing | None = None
+        self.connections = 0
+        self.frame = b""
+        self.version = 0
+        self._data = ""
+        self._changed: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._last_ids: dict[str, int] = {}
+        self._today = None
+        self._submissions_today = 0
+
+    # -- aggregation (sync: runs in a worker thread) --
+
+    def _tail(self, queryset, kind: str) -> list:
+        """Rows newer than the last seen id, at most one ring's worth."""
+        rows = list(
+            queryset.filter(pk__gt=self._last_ids.get(kind, 0)).order_by("-pk")[
+                : settings.LIVE_STATS_RING_SIZE
+            ]
+        )
+        if rows:
+            self._last_ids[kind] = rows[0].pk
+        return rows[::-1]
+
+    def refresh(self) -> dict[str, Any]:
+        from apps.games.models import Score
+        from apps.submissions.models import Submission
+
+        if self.ring is None:
+            self.ring = EventRing(settings.LIVE_STATS_RING_SIZE)
+
+        scores = self._tail(
+            Score.objects.only("created_at", "game", "puzzle_key", "solve_ms"),
+            "solve",
+        )
+        for s in scores:
+            self.ring.append(
+                Event(
+                    s.created_at,
+                    "solve",
+                    {"game": s.game, "puzzle_key": s.puzzle_key, "solve_ms": s.solve_ms},
+                )
+            )
+
+        submissions = Submission.objects.filter(is_spam=False)
+        new = self._tail(submissions.only("created_at"), "submission")
+        for s in new:
+            self.ring.append(Event(s.created_at, "submission"))
+
+        today = timezone.localdate()
+        if today != self._today or len(new) == settings.LIVE_STATS_RING_SIZE:
+            # first tick, midnight, or more arrived than one tail returns
+            self._today = today
+            self._submissions_today = submissions.filter(
+                created_at__gte=_start_of_today()
+            ).count()
+        else:
+            self._submissions_today += len(new)
+
+        hour_ago = timezone.now() - timedelta(hours=1)
+        events = list(self.ring.newest_first())
+        events.sort(key=lambda e: e.at, reverse=True)
+        return {
+            "active_visitors": active_visitors(),
+            "viewers": self.connections,
+            # an indexed count: the ring only holds the last RING_SIZE events
+            "solves_last_hour": Score.objects.filter(created_at__gte=hour_ago).count(),
+            "submissions_today": self._submissions_today,
+            "recent": [
+                {"type": e.kind, "at": e.at.isoformat(), **e.detail}
+                for e in events[:RECENT_EVENTS]
+            ],
+        }
+
+    # -- fan-out (event loop) --
+
+    def publish(self, snapshot: dict[str, Any]) -> None:
+        data = json.dumps(snapshot, separators=(",", ":"))
+        if data == self._data:
+            return  # unchanged: clients only get keep-alive pings
+        self._data = data
+        self.version += 1
+        self.frame = f"id: {self.version}\nevent: stats\ndata: {data}\n\n".encode()
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _run(self) -> None:
+        refresh = sync_to_async(self.refresh)
+        while True:
+            try:
+                self.publish(await refresh())
+            except Exception:  # keep ticking; the next refresh may work
+                logger.exception("Live stats refresh failed")
+            await asyncio.sleep(settings.LIVE_STATS_TICK_SECONDS)
+
+    def has_capacity(self) -> bool:
+        return self.connections < settings.LIVE_STATS_MAX_CONNECTIONS
+
+    def connect(self) -> bool:
+        """Take a connection slot and make sure the ticker runs."""
+        if not self.has_capacity():
+            return False
+        self.connections += 1
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._changed = asyncio.Event()
+            # A fresh context: the ticker outlives this request (its request
+            # id, its thread-sensitive executor, ...).
+            self._task = loop.create_task(
+                self._run(), name="live-stats", context=contextvars.Context()
+            )
+        return True
+
+    def disconnect(self) -> None:
+        self.connections -= 1
+        if self.connections == 0 and self._task is not None:
+            self._task.cancel()  # nobody is watching: no more queries
+            self._task = None
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        SSE body for one client. The slot is taken on first iteration, where
+        the finally below is sure to release it: a response that is never
+        sent holds none.
+        """
+        retry = f"retry: {RETRY_MS}\n\n".encode()
+        if not self.connect():
+            yield retry  # filled up since the view checked: come back later
+            return
+        try:
+            yield retry
+            sent = 0
+            while True:
+                changed = self._changed
+                if self.version == sent:
+                    try:
+                        await asyncio.wait_for(
+                            changed.wait(), settings.LIVE_STATS_PING_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        yield b": ping\n\n"
+                        continue
+                # the newest frame, whatever this client missed meanwhile
+                sent = self.version
+                yield self.frame
+        finally:
+            self.disconnect()
+
+
+stats_hub = StatsHub()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import connections
+
+
+def db_pool_stats() -> dict[str, dict[str, Any]]:
+    """
+    Per-alias connection pool stats for this worker process.
+
+    Wraps `psycopg_pool.ConnectionPool.get_stats()` (counters are cumulative
+    since the pool opened). Aliases without `OPTIONS["pool"]` report
+    `{"pooled": False}`.
+    """
+    stats: dict[str, dict[str, Any]] = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            stats[alias] = {"pooled": False}
+            continue
+
+        raw = pool.get_stats()
+        size = raw.get("pool_size", 0)
+        idle = raw.get("pool_available", 0)
+        checkouts = raw.get("requests_num", 0)
+        wait_ms = raw.get("requests_wait_ms", 0)
+        stats[alias] = {
+            "pooled": True,
+            "min_size": raw.get("pool_min"),
+            "max_size": raw.get("pool_max"),
+            "size": size,
+            "idle": idle,
+            "checked_out": size - idle,
+            "waiting": raw.get("requests_waiting", 0),
+            "checkouts": checkouts,
+            "avg_checkout_wait_ms": round(wait_ms / checkouts, 3) if checkouts else 0.0,
+            "checkout_timeouts": raw.get("requests_errors", 0),
+            "connections_lost": raw.get("connections_lost", 0),
+        }
+    return stats
@@ -1,9 +1,25 @@
 import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
 from django.contrib.auth import get_user_model
-from django.test import SimpleTestCase, TestCase
+from django.core.cache import cache
+from django.test import (
+    AsyncClient,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.utils import timezone
 from rest_framework.test import APIClient
 
+from apps.analytics.live import Event, EventRing, active_visitors, stats_hub
+from apps.analytics.metrics import db_pool_stats
+from apps.games.models import Score
+from apps.submissions.models import Submission
+
 
 class HealthEndpointTests(SimpleTestCase):
     def test_health_returns_ok(self):
@@ -50,3 +66,169 @@ class AuthCheckEndpointTests(TestCase):
 
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.json(), {"status": "ok"})
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_metrics_requires_staff(self):
+        user = get_user_model().objects.create_user(username="u", password="pass")
+        self.client.force_authenticate(user=user)
+
+        resp = self.client.get("/api/metrics/")
+
+        self.assertEqual(resp.status_code, 403)
+
+    def test_metrics_reports_unpooled_database(self):
+        admin = get_user_model().objects.create_user(
+            username="admin", password="pass", is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        resp = self.client.get("/api/metrics/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["db"]["default"], {"pooled": False})
+
+    def test_pool_stats_are_summarised(self):
+        raw = {
+            "pool_min": 1,
+            "pool_max": 4,
+            "pool_size": 3,
+            "pool_available": 1,
+            "requests_waiting": 2,
+            "requests_num": 10,
+            "requests_wait_ms": 25,
+            "requests_errors": 1,
+        }
+        pool = SimpleNamespace(get_stats=lambda: raw)
+        fake = {"default": SimpleNamespace(pool=pool)}
+
+        with mock.patch("apps.analytics.metrics.connections", fake):
+            stats = db_pool_stats()["default"]
+
+        self.assertTrue(stats["pooled"])
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["waiting"], 2)
+        self.assertEqual(stats["avg_checkout_wait_ms"], 2.5)
+        self.assertEqual(stats["checkout_timeouts"], 1)
+
+
+class LiveStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        stats_hub.clear()
+        self.addCleanup(stats_hub.clear)
+
+    def test_ring_keeps_the_newest_events(self):
+        ring = EventRing(3)
+        for i in range(5):
+            ring.append(Event(at=i, kind="solve"))
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([e.at for e in ring.newest_first()], [4, 3, 2])
+
+    def test_distinct_visitors_are_counted_once(self):
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.1"):
+            self.client.get("/api/health/", REMOTE_ADDR=ip)
+
+        self.assertEqual(active_visitors(), 2)
+
+    def test_refresh_tails_new_rows(self):
+        Score.objects.create(game="sudoku", solve_ms=1000)
+        Submission.objects.create(kind="feedback", message="hi")
+        first = stats_hub.refresh()
+
+        Score.objects.create(game="sudoku", puzzle_key="2026-10-19", solve_ms=2000)
+        Submission.objects.create(kind="feedback", message="again")
+        Submission.objects.create(kind="feedback", message="spam", is_spam=True)
+        with self.assertNumQueries(3):  # one tail per table, the hourly count
+            second = stats_hub.refresh()
+
+        self.assertEqual(first["solves_last_hour"], 1)
+        self.assertEqual(first["submissions_today"], 1)
+        self.assertEqual(second["solves_last_hour"], 2)
+        self.assertEqual(second["submissions_today"], 2)
+        self.assertEqual(second["recent"][0]["type"], "submission")
+        self.assertEqual(second["recent"][1]["puzzle_key"], "2026-10-19")
+        self.assertNotIn("message", second["recent"][0])
+
+    @override_settings(LIVE_STATS_RING_SIZE=2)
+    def test_solves_last_hour_is_not_capped_by_the_ring(self):
+        for ms in (1000, 2000, 3000):
+            Score.objects.create(game="sudoku", solve_ms=ms)
+        old = Score.objects.create(game="sudoku", solve_ms=4000)
+        Score.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+
+        snapshot = stats_hub.refresh()
+
+        self.assertEqual(snapshot["solves_last_hour"], 3)
+        self.assertEqual(len(snapshot["recent"]), 2)
+
+    def test_wsgi_requests_are_refused(self):
+        resp = self.client.get("/api/stats/stream/")
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.json()["error"]["code"], "stream_unavailable")
+
+
+@override_settings(LIVE_STATS_TICK_SECONDS=0.01, LIVE_STATS_MAX_CONNECTIONS=2)
+class LiveStatsStreamTests(TransactionTestCase):
+    def setUp(self):
+        stats_hub.clear()
+        self.addCleanup(stats_hub.clear)
+
+    async def _next_frame(self, stream) -> dict:
+        async for chunk in stream:
+            if chunk.startswith(b"id:"):
+                return json.loads(chunk.split(b"data: ", 1)[1])
+        self.fail("stream ended")
+
+    async def test_viewers_share_one_snapshot(self):
+        await Score.objects.acreate(game="sudoku", solve_ms=1000)
+        a = stats_hub.stream()
+        b = stats_hub.stream()
+        over = stats_hub.stream()
+        self.assertEqual(stats_hub.connections, 0)  # slots are taken lazily
+
+        self.assertEqual(await anext(a), b"retry: 5000\n\n")
+        self.assertEqual(await anext(b), b"retry: 5000\n\n")
+        self.assertEqual(stats_hub.connections, 2)
+        # over the cap: told when to retry, then the stream ends
+        self.assertEqual([chunk async for chunk in over], [b"retry: 5000\n\n"])
+        self.assertEqual(stats_hub.connections, 2)
+
+        frame = await self._next_frame(a)
+        self.assertEqual(frame, {**frame, "solves_last_hour": 1, "viewers": 2})
+        # b starts from the newest shared frame, not a backlog
+        self.assertEqual(await self._next_frame(b), frame)
+
+        await Score.objects.acreate(game="sudoku", solve_ms=900)
+        self.assertEqual((await self._next_frame(a))["solves_last_hour"], 2)
+
+        await a.aclose()
+        await b.aclose()
+        self.assertEqual(stats_hub.connections, 0)
+        self.assertIsNone(stats_hub._task)  # no viewers, no queries
+
+    async def test_endpoint_streams_events_up_to_the_cap(self):
+        client = AsyncClient()
+        first = await client.get("/api/stats/stream/")
+        second = await client.get("/api/stats/stream/")
+        unsent = await client.get("/api/stats/stream/")
+        # a response whose body never starts holds no slot
+        self.assertEqual(stats_hub.connections, 0)
+
+        self.assertEqual(first["Content-Type"], "text/event-stream")
+        self.assertEqual(first["Cache-Control"], "no-cache")
+        self.assertEqual(await anext(first.streaming_content), b"retry: 5000\n\n")
+        await anext(second.streaming_content)
+        self.assertEqual(stats_hub.connections, 2)
+
+        full = await client.get("/api/stats/stream/")
+        self.assertEqual(unsent.status_code, 200)
+        self.assertEqual(full.status_code, 503)
+        self.assertEqual(full.json()["error"]["code"], "too_many_connections")
+        self.assertEqual(full["Retry-After"], "30")
@@ -1,8 +1,10 @@
 from django.urls import path
 
-from .views import auth_check, health
+from .views import auth_check, health, metrics, stats_stream
 
 urlpatterns = [
     path("health/", health),
     path("auth-check/", auth_check),
+    path("metrics/", metrics),
+    path("stats/stream/", stats_stream),
 ]
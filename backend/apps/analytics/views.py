@@ -1,11 +1,16 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 
+from api.compression import compressed_cache
 from api.responses import error_response
 
+from .live import stats_hub
+from .metrics import db_pool_stats
+
 
 def health(request):
     if request.method != "GET":
@@ -21,3 +26,41 @@ def health(request):
 @permission_classes([IsAuthenticated])
 def auth_check(request):
     return Response({"status": "ok"})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return Response({"db": db_pool_stats(), "compression": compressed_cache.stats()})
+
+
+async def stats_stream(request):
+    """Live site stats as Server-Sent Events; see live.py."""
+    if request.method != "GET":
+        return error_response(
+            code="method_not_allowed",
+            message=f"Method {request.method} not allowed.",
+            status=405,
+        )
+    if not isinstance(request, ASGIRequest):
+        # under WSGI every open stream would pin a worker
+        return error_response(
+            code="stream_unavailable",
+            message="The stats stream is only served by the ASGI app.",
+            status=503,
+        )
+    if not stats_hub.has_capacity():
+        response = error_response(
+            code="too_many_connections",
+            message="Too many stats viewers; retry shortly.",
+            status=503,
+        )
+        response["Retry-After"] = "30"
+        return response
+
+    response = StreamingHttpResponse(
+        stats_hub.stream(), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return response
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Project
+from .models import BlogPost, Project
 
 
 @admin.register(Project)
@@ -11,3 +11,13 @@ class ProjectAdmin(admin.ModelAdmin):
     list_filter = ("is_featured",)
     search_fields = ("title", "slug")
     ordering = ("sort_order", "title")
+
+
+@admin.register(BlogPost)
+class BlogPostAdmin(admin.ModelAdmin):
+    list_display = ("title", "slug", "is_published", "published_at", "reading_minutes")
+    list_filter = ("is_published",)
+    search_fields = ("title", "slug")
+    prepopulated_fields = {"slug": ("title",)}
+    readonly_fields = ("reading_minutes", "excerpt", "renderer_version", "updated_at")
+    ordering = ("-published_at",)
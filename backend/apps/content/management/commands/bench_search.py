@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.content.search import InvertedIndex, SearchDocument
+
+# Zipf-ish vocabulary so postings look like real text: a few very common
+# words, a long tail of rare ones.
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vi", "so", "de", "pa", "ri", "gu"]
+
+
+def _vocabulary(size: int, rng: random.Random) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = "Build an in-memory search index over synthetic documents; time queries."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--docs", type=int, default=30_000)
+        parser.add_argument("--words", type=int, default=120, help="Per document.")
+        parser.add_argument("--queries", type=int, default=2_000)
+
+    def handle(self, *args, **options) -> None:
+        rng = random.Random(0)
+        vocab = _vocabulary(20_000, rng)
+        cum_weights = list(
+            itertools.accumulate(1 / (rank + 1) for rank in range(len(vocab)))
+        )
+
+        def text(k: int) -> str:
+            return " ".join(rng.choices(vocab, cum_weights=cum_weights, k=k))
+
+        index = InvertedIndex()
+        start = time.perf_counter()
+        for i in range(options["docs"]):
+            index.add(
+                SearchDocument(
+                    key=f"doc:{i}",
+                    type="doc",
+                    slug=f"doc-{i}",
+                    title=text(5),
+                    body=text(options["words"]),
+                )
+            )
+        build_s = time.perf_counter() - start
+        self.stdout.write(
+            f"built {options['docs']} docs, {len(index.terms)} terms in {build_s:.1f}s"
+        )
+
+        # typeahead: 1-2 full words + a 2-4 char prefix of a mid-frequency word
+        queries = []
+        for _ in range(options["queries"]):
+            words = rng.choices(vocab[:2000], k=rng.randint(0, 2))
+            last = rng.choice(vocab[100:5000])
+            queries.append(" ".join([*words, last[: rng.randint(2, 4)]]))
+
+        # cold: champion lists computed on first use; warm: the steady state
+        for label in ("cold", "warm"):
+            timings, hits = [], 0
+            for query in queries:
+                start = time.perf_counter()
+                hits += bool(index.search(query, 10))
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f"{label}: {len(queries)} queries ({hits} with hits): "
+                f"p50={statistics.median(timings):.3f}ms "
+                f"p95={timings[int(len(timings) * 0.95)]:.3f}ms "
+                f"p99={timings[int(len(timings) * 0.99)]:.3f}ms"
+            )
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.content.models import RENDERED_FIELDS, BlogPost
+from apps.content.rendering import (
+    RENDERER_VERSION,
+    RenderedPost,
+    render_markdown,
+    source_hash,
+)
+from apps.content.search import search_service
+
+
+def _render(item: tuple[int, str]) -> tuple[int, str, RenderedPost]:
+    pk, source = item
+    return pk, source_hash(source), render_markdown(source)
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render stored blog posts whose Markdown or RENDERER_VERSION "
+        "changed (or all with --force), rendering in parallel processes."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--force", action="store_true")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Rows per bulk_update."
+        )
+
+    def handle(self, *args, **options) -> None:
+        rows = BlogPost.objects.values_list(
+            "pk", "body_markdown", "source_hash", "renderer_version"
+        )
+        todo = [
+            (pk, source)
+            for pk, source, digest, version in rows.iterator()
+            if options["force"]
+            or version != RENDERER_VERSION
+            or digest != source_hash(source)
+        ]
+        if not todo:
+            self.stdout.write(self.style.SUCCESS("All posts are current."))
+            return
+
+        start = time.perf_counter()
+        if options["workers"] > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+                results = list(pool.map(_render, todo, chunksize=8))
+        else:
+            results = [_render(item) for item in todo]
+        render_s = time.perf_counter() - start
+
+        posts = []
+        for pk, digest, rendered in results:
+            posts.append(
+                BlogPost(
+                    pk=pk,
+                    body_html=rendered.html,
+                    toc=rendered.toc,
+                    reading_minutes=rendered.reading_minutes,
+                    excerpt=rendered.excerpt,
+                    source_hash=digest,
+                    renderer_version=RENDERER_VERSION,
+                )
+            )
+        with transaction.atomic():
+            BlogPost.objects.bulk_update(
+                posts, RENDERED_FIELDS, batch_size=options["batch_size"]
+            )
+        search_service.invalidate()  # bulk_update sends no signals
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-rendered {len(posts)} posts in {render_s:.2f}s "
+                f"({options['workers']} workers)."
+            )
+        )
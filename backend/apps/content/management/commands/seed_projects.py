@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
-from django.core.management.base import BaseCommand
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from apps.content.models import Project
+from apps.content.search import search_service
 
 SEED_PROJECTS: list[dict[str, Any]] = [
     {
@@ -47,15 +52,54 @@ SEED_PROJECTS: list[dict[str, Any]] = [
 ]
 
 
+# Fields a seed row may set; `slug` is the natural key.
+PROJECT_FIELDS = [
+    "title",
+    "description",
+    "live_url",
+    "repo_url",
+    "sort_order",
+    "is_featured",
+]
+
+
+def load_rows(path: Path) -> list[dict[str, Any]]:
+    """Read a JSON array or NDJSON (one object per line) file."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".ndjson", ".jsonl"):
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        rows = json.loads(text)
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise CommandError(f"{path}: expected a list of objects.")
+    return rows
+
+
+def batched(rows: list[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
 class Command(BaseCommand):
-    help = "Seed local Project data (repeatable)."
+    help = "Seed/sync Project data from JSON/NDJSON files (repeatable, diff-only)."
 
     def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "files",
+            nargs="*",
+            help="JSON array or .ndjson/.jsonl files; defaults to the built-in seed.",
+        )
         parser.add_argument(
             "--clear",
             action="store_true",
             help="Delete all existing projects before seeding.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows compared and written per batch.",
+        )
 
     @transaction.atomic
     def handle(self, *args, **options) -> None:
@@ -67,19 +111,92 @@ class Command(BaseCommand):
                 )
             )
 
-        created = 0
-        updated = 0
+        rows: list[dict[str, Any]] = []
+        for name in options["files"]:
+            try:
+                rows.extend(load_rows(Path(name)))
+            except (OSError, json.JSONDecodeError) as exc:
+                raise CommandError(f"Could not read {name}: {exc}") from exc
+        if not options["files"]:
+            rows = SEED_PROJECTS
 
-        for project_data in SEED_PROJECTS:
-            obj, was_created = Project.objects.update_or_create(
-                slug=project_data["slug"],
-                defaults={k: v for k, v in project_data.items() if k != "slug"},
+        # Last occurrence of a slug wins, like applying the files in order.
+        by_slug: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            unknown = set(row) - {"slug", *PROJECT_FIELDS}
+            if not row.get("slug") or unknown:
+                raise CommandError(f"Bad project row (slug/fields): {row!r}")
+            try:
+                # coerce up front so "10" vs 10 doesn't count as a change
+                by_slug[row["slug"]] = {
+                    field: Project._meta.get_field(field).to_python(value)
+                    for field, value in row.items()
+                }
+            except ValidationError as exc:
+                raise CommandError(f"Invalid project {row['slug']}: {exc}") from exc
+
+        created = updated = unchanged = 0
+        for batch in batched(list(by_slug.values()), options["batch_size"]):
+            c, u, n = self._sync_batch(batch)
+            created, updated, unchanged = created + c, updated + u, unchanged + n
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. created={created} updated={updated} unchanged={unchanged}"
             )
-            if was_created:
-                created += 1
-                self.stdout.write(self.style.SUCCESS(f"Created: {obj.slug}"))
+        )
+
+    def _sync_batch(self, batch: list[dict[str, Any]]) -> tuple[int, int, int]:
+        """One SELECT, at most one upsert and one bulk UPDATE per batch."""
+        existing = Project.objects.in_bulk(
+            [row["slug"] for row in batch], field_name="slug"
+        )
+
+        to_create: list[Project] = []
+        to_update: list[Project] = []
+        changed_fields: set[str] = set()
+
+        for row in batch:
+            obj = existing.get(row["slug"])
+            if obj is None:
+                obj = Project(**row)
+                to_create.append(obj)
             else:
-                updated += 1
-                self.stdout.write(self.style.SUCCESS(f"Updated: {obj.slug}"))
+                changes = {
+                    field: value
+                    for field, value in row.items()
+                    if field != "slug" and getattr(obj, field) != value
+                }
+                if not changes:
+                    continue
+                for field, value in changes.items():
+                    setattr(obj, field, value)
+                changed_fields.update(changes)
+                to_update.append(obj)
+
+            try:
+                obj.clean_fields()
+            except ValidationError as exc:
+                raise CommandError(f"Invalid project {row['slug']}: {exc}") from exc
+
+        if to_create:
+            # update_conflicts keeps this safe if a row appeared since the SELECT.
+            Project.objects.bulk_create(
+                to_create,
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=PROJECT_FIELDS,
+            )
+        if to_update:
+            Project.objects.bulk_update(to_update, sorted(changed_fields))
+        if to_create or to_update:
+            # bulk writes send no signals
+            transaction.on_commit(search_service.invalidate)
+
+        for obj in to_create:
+            self.stdout.write(self.style.SUCCESS(f"Created: {obj.slug}"))
+        for obj in to_update:
+            self.stdout.write(self.style.SUCCESS(f"Updated: {obj.slug}"))
 
-        self.stdout.write(self.style.SUCCESS(f"Done. created={created} updated={updated}"))
+        unchanged = len(batch) - len(to_create) - len(to_update)
+        return len(to_create), len(to_update), unchanged
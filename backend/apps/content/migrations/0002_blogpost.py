@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(unique=True)),
+                ('title', models.CharField(max_length=200)),
+                ('body_markdown', models.TextField()),
+                ('is_published', models.BooleanField(default=False)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('body_html', models.TextField(blank=True, editable=False)),
+                ('toc', models.JSONField(blank=True, default=list, editable=False)),
+                ('reading_minutes', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('excerpt', models.TextField(blank=True, editable=False)),
+                ('source_hash', models.CharField(blank=True, editable=False, max_length=64)),
+                ('renderer_version', models.PositiveSmallIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'ordering': ['-published_at', '-id'],
+                'indexes': [models.Index(fields=['is_published', '-published_at'], name='content_blo_is_publ_82544e_idx')],
+            },
+        ),
+    ]
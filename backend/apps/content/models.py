@@ -1,5 +1,7 @@
 from django.db import models
 
+from .rendering import RENDERER_VERSION, render_markdown, source_hash
+
 
 class Project(models.Model):
     slug = models.SlugField(unique=True)
@@ -15,3 +17,64 @@ class Project(models.Model):
 
     def __str__(self) -> str:
         return self.title
+
+
+RENDERED_FIELDS = (
+    "body_html",
+    "toc",
+    "reading_minutes",
+    "excerpt",
+    "source_hash",
+    "renderer_version",
+)
+
+
+class BlogPost(models.Model):
+    slug = models.SlugField(unique=True)
+    title = models.CharField(max_length=200)
+    body_markdown = models.TextField()
+    is_published = models.BooleanField(default=False)
+    published_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Compiled from body_markdown on save (rendering.py); the API only reads
+    # these. source_hash + renderer_version say whether they are current.
+    body_html = models.TextField(blank=True, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    reading_minutes = models.PositiveSmallIntegerField(default=0, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    source_hash = models.CharField(max_length=64, blank=True, editable=False)
+    renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        ordering = ["-published_at", "-id"]
+        indexes = [models.Index(fields=["is_published", "-published_at"])]
+
+    def __str__(self) -> str:
+        return self.title
+
+    @property
+    def needs_render(self) -> bool:
+        return (
+            self.renderer_version != RENDERER_VERSION
+            or self.source_hash != source_hash(self.body_markdown)
+        )
+
+    def render(self, *, force: bool = False) -> bool:
+        """Recompile the stored HTML if the source or renderer changed."""
+        if not (force or self.needs_render):
+            return False
+        rendered = render_markdown(self.body_markdown)
+        self.body_html = rendered.html
+        self.toc = rendered.toc
+        self.reading_minutes = rendered.reading_minutes
+        self.excerpt = rendered.excerpt
+        self.source_hash = source_hash(self.body_markdown)
+        self.renderer_version = RENDERER_VERSION
+        return True
+
+    def save(self, *args, **kwargs):
+        if self.render() and kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import html
+import math
+import re
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any
+
+import markdown
+from django.utils.html import strip_tags
+
+# Blog Markdown is compiled once, when a post is saved, into the columns the
+# API serves. Bump RENDERER_VERSION whenever the output for the same source
+# changes (extensions, options, excerpt rules) and run `manage.py
+# render_posts` to bring stored posts up to date.
+#
+# Sources are written by staff in the admin, so raw HTML is passed through.
+RENDERER_VERSION = 1
+
+EXTENSIONS = ["extra", "toc", "codehilite", "sane_lists", "smarty"]
+EXTENSION_CONFIGS = {
+    "toc": {"permalink": False, "toc_depth": "2-4"},
+    # Pygments classes; the frontend ships the stylesheet
+    "codehilite": {"css_class": "highlight", "guess_lang": False},
+}
+
+WORDS_PER_MINUTE = 225
+EXCERPT_CHARS = 280
+
+FIRST_PARAGRAPH = re.compile(r"<p>(.*?)</p>", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class RenderedPost:
+    html: str
+    toc: list[dict[str, Any]]
+    reading_minutes: int
+    excerpt: str
+
+
+def source_hash(source: str) -> str:
+    return sha256(source.encode("utf-8")).hexdigest()
+
+
+def _toc(tokens: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": t["id"],
+            "title": t["name"],
+            "level": t["level"],
+            "children": _toc(t["children"]),
+        }
+        for t in tokens
+    ]
+
+
+def _excerpt(body_html: str) -> str:
+    match = FIRST_PARAGRAPH.search(body_html)
+    if match is None:
+        return ""
+    text = " ".join(html.unescape(strip_tags(match.group(1))).split())
+    if len(text) <= EXCERPT_CHARS:
+        return text
+    return text[: EXCERPT_CHARS - 1].rsplit(" ", 1)[0] + "…"
+
+
+def render_markdown(source: str) -> RenderedPost:
+    """Pure function of `source` (and RENDERER_VERSION): safe to run in a pool."""
+    md = markdown.Markdown(extensions=EXTENSIONS, extension_configs=EXTENSION_CONFIGS)
+    body_html = md.convert(source)
+    words = len(strip_tags(body_html).split())
+    return RenderedPost(
+        html=body_html,
+        toc=_toc(md.toc_tokens),
+        reading_minutes=max(1, math.ceil(words / WORDS_PER_MINUTE)),
+        excerpt=_excerpt(body_html),
+    )
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+# Site search: an in-process inverted index over projects and published blog
+# posts, BM25-ranked, with prefix matching on the last query word (typeahead).
+#
+# Freshness: model signals (signals.py) update this worker's index on commit and
+# bump a generation number in the default cache. Other workers compare that
+# number at most every SEARCH_REFRESH_SECONDS and rebuild in a background
+# thread when it moved (or when the index is older than SEARCH_MAX_AGE_SECONDS,
+# which covers a per-process cache where they can't see the bump). Queries
+# keep using the old index until the new one is swapped in.
+#
+# An index is never modified once queries can see it: updates change a copy
+# and swap it in. So queries run without a lock, and the lock only covers
+# the swaps. Each worker builds its index on its first search.
+
+GENERATION_KEY = "content-search:generation"
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to "
+    "was with".split()
+)
+TITLE_BOOST = 3
+K1 = 1.2
+B = 0.75
+# Typeahead work bounds: a prefix expands to at most MAX_PREFIX_TERMS terms
+# (most common first, out of the first MAX_PREFIX_SCAN), and a query scores
+# at most CHAMPIONS candidates: all documents of its rarest word, or that
+# word's CHAMPIONS best. Both are cached until the index changes.
+MAX_PREFIX_SCAN = 2000
+MAX_PREFIX_TERMS = 8
+CHAMPIONS = 100
+MAX_CACHE_ENTRIES = 10_000
+
+
+def tokenize(text: str) -> list[str]:
+    # casefold + strip accents, so "Café" matches "cafe"
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [t for t in TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    key: str  # "<type>:<pk>"
+    type: str
+    slug: str
+    title: str
+    body: str
+    visible_from: float = 0.0  # unix time; scheduled posts stay hidden
+
+
+@dataclass
+class InvertedIndex:
+    postings: dict[str, dict[str, int]] = field(default_factory=dict)
+    terms: list[str] = field(default_factory=list)  # sorted, for prefixes
+    lengths: dict[str, int] = field(default_factory=dict)
+    docs: dict[str, SearchDocument] = field(default_factory=dict)
+    total_length: int = 0
+    # expansions and candidate lists; cleared whenever the index changes
+    _cache: dict[tuple, list[str]] = field(default_factory=dict, repr=False)
+
+    def copy(self) -> InvertedIndex:
+        return InvertedIndex(
+            postings={term: dict(p) for term, p in self.postings.items()},
+            terms=list(self.terms),
+            lengths=dict(self.lengths),
+            docs=dict(self.docs),
+            total_length=self.total_length,
+        )
+
+    def add(self, doc: SearchDocument) -> None:
+        if doc.key in self.docs:
+            self.remove(doc.key)
+        counts: dict[str, int] = {}
+        for token in tokenize(doc.title):
+            counts[token] = counts.get(token, 0) + TITLE_BOOST
+        for token in tokenize(doc.body):
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                insort(self.terms, term)
+            posting[doc.key] = tf
+        self._cache.clear()
+        length = sum(counts.values())
+        self.lengths[doc.key] = length
+        self.total_length += length
+        self.docs[doc.key] = doc
+
+    def remove(self, key: str) -> None:
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.total_length -= self.lengths.pop(key)
+        self._cache.clear()
+        for term in set(tokenize(doc.title)) | set(tokenize(doc.body)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def _cached(self, key: tuple, compute):
+        value = self._cache.get(key)
+        if value is None:
+            if len(self._cache) >= MAX_CACHE_ENTRIES:
+                self._cache.clear()
+            value = self._cache[key] = compute()
+        return value
+
+    def _expand(self, prefix: str) -> list[str]:
+        """The most common indexed terms starting with `prefix`."""
+        i = bisect_left(self.terms, prefix)
+        matches = []
+        for term in self.terms[i : i + MAX_PREFIX_SCAN]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        if len(matches) <= MAX_PREFIX_TERMS:
+            return matches
+        return heapq.nlargest(
+            MAX_PREFIX_TERMS, matches, key=lambda t: len(self.postings[t])
+        )
+
+    def _norm(self, key: str, avg_length: float) -> float:
+        return K1 * (1 - B + B * self.lengths[key] / avg_length)
+
+    def _candidates(self, group: tuple[str, ...]) -> list[str]:
+        """
+        Documents matching any term of `group`: all of them, or for common
+        words the CHAMPIONS best-scoring ones.
+        """
+        if sum(len(self.postings[t]) for t in group) <= CHAMPIONS:
+            return list({key for t in group for key in self.postings[t]})
+        avg_length = self.total_length / len(self.docs)
+        best: dict[str, float] = {}
+        for term in group:
+            posting = self.postings[term]
+            for key, tf in posting.items():
+                score = tf / (tf + self._norm(key, avg_length)) / len(posting)
+                if score > best.get(key, 0.0):
+                    best[key] = score
+        return heapq.nlargest(CHAMPIONS, best, key=best.__getitem__)
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[SearchDocument, float]]:
+        """
+        All query words must match (AND). The last word also matches as a
+        prefix, unless the query ends with a space.
+        """
+        words = tokenize(query)
+        if not words or not self.docs:
+            return []
+        prefix = None if query[-1:].isspace() else words.pop()
+
+        groups = [(w,) if w in self.postings else () for w in words]
+        if prefix is not None:
+            groups.append(
+                tuple(self._cached(("expand", prefix), lambda: self._expand(prefix)))
+            )
+        if not all(groups):
+            return []
+
+        n = len(self.docs)
+        avg_length = self.total_length / n
+        idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for group in groups
+            for term in group
+            if (df := len(self.postings[term]))
+        }
+
+        # Candidates come from the rarest word; the others are probed per
+        # candidate, so the work is bounded by the smallest posting lists.
+        driver = min(groups, key=lambda g: sum(len(self.postings[t]) for t in g))
+        candidates = self._cached(
+            ("candidates", driver), lambda: self._candidates(driver)
+        )
+
+        totals: dict[str, float] = {}
+        for key in candidates:
+            norm = self._norm(key, avg_length)
+            total = 0.0
+            for group in groups:
+                # BM25 for this word: its best-scoring matching term
+                best = 0.0
+                for term in group:
+                    tf = self.postings[term].get(key)
+                    if tf:
+                        best = max(best, idf[term] * tf * (K1 + 1) / (tf + norm))
+                if not best:
+                    break
+                total += best
+            else:
+                totals[key] = total
+
+        now = time.time()
+        visible = (
+            (self.docs[key], score)
+            for key, score in totals.items()
+            if self.docs[key].visible_from <= now
+        )
+        return heapq.nlargest(limit, visible, key=lambda item: item[1])
+
+
+# ---------------- Content tables -> documents ----------------
+
+
+def project_document(project) -> SearchDocument:
+    return SearchDocument(
+        key=f"project:{project.pk}",
+        type="project",
+        slug=project.slug,
+        title=project.title,
+        body=project.description,
+    )
+
+
+def post_document(post) -> SearchDocument | None:
+    if not post.is_published or post.published_at is None:
+        return None
+    return SearchDocument(
+        key=f"post:{post.pk}",
+        type="post",
+        slug=post.slug,
+        title=post.title,
+        body=strip_tags(post.body_html),
+        visible_from=post.published_at.timestamp(),
+    )
+
+
+def build_index() -> InvertedIndex:
+    from .models import BlogPost, Project
+
+    index = InvertedIndex()
+    for project in Project.objects.only("slug", "title", "description").iterator():
+        index.add(project_document(project))
+    posts = BlogPost.objects.filter(is_published=True).only(
+        "slug", "title", "body_html", "is_published", "published_at"
+    )
+    for post in posts.iterator():
+        doc = post_document(post)
+        if doc is not None:
+            index.add(doc)
+    return index
+
+
+class SearchService:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._index: InvertedIndex | None = None
+        self._generation: int | None = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._rebuilding = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._generation = None
+
+    def _current_generation(self) -> int:
+        return cache.get(GENERATION_KEY, 0)
+
+    def _build(self) -> None:
+        generation = self._current_generation()
+        index = build_index()
+        with self._lock:
+            self._index = index
+            self._generation = generation
+            self._built_at = self._checked_at = time.monotonic()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self._build()
+        except DatabaseError:
+            logger.warning("Search index rebuild failed", exc_info=True)
+        finally:
+            self._rebuilding = False
+            close_old_connections()
+
+    def _maybe_refresh(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            too_soon = now - self._checked_at < settings.SEARCH_REFRESH_SECONDS
+            if self._rebuilding or too_soon:
+                return
+            self._checked_at = now
+            generation, built_at = self._generation, self._built_at
+
+        if (
+            self._current_generation() == generation
+            and now - built_at < settings.SEARCH_MAX_AGE_SECONDS
+        ):
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(
+            target=self._rebuild_in_background, name="search-rebuild", daemon=True
+        ).start()
+
+    def ensure_built(self) -> InvertedIndex:
+        index = self._index
+        if index is None:
+            with self._build_lock:  # one build, however many first requests
+                if self._index is None:
+                    self._build()
+                index = self._index
+        return index
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[SearchDocument, float]]:
+        index = self.ensure_built()
+        self._maybe_refresh()
+        return index.search(query, limit)
+
+    # -- called from signal handlers, after commit --
+
+    def _bump(self) -> None:
+        try:
+            generation = cache.incr(GENERATION_KEY)
+        except ValueError:  # key missing
+            cache.add(GENERATION_KEY, 1, timeout=None)
+            generation = self._current_generation()
+        with self._lock:
+            # still current if ours was the only change since we last looked
+            if self._generation == generation - 1:
+                self._generation = generation
+
+    def upsert(self, doc: SearchDocument | None, key: str) -> None:
+        with self._lock:
+            if self._index is not None:
+                index = self._index.copy()  # queries may be reading this one
+                if doc is None:
+                    index.remove(key)
+                else:
+                    index.add(doc)
+                self._index = index
+        self._bump()
+
+    def invalidate(self) -> None:
+        """For bulk writes that bypass signals: every worker rebuilds."""
+        self._bump()
+        with self._lock:
+            self._generation = None  # this worker too
+
+
+search_service = SearchService()
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Project
+from .models import BlogPost, Project
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -15,3 +15,20 @@ class ProjectSerializer(serializers.ModelSerializer):
             "sort_order",
             "is_featured",
         ]
+
+
+# Also the columns the blog views load (`.only(...)`).
+BLOG_LIST_FIELDS = ("slug", "title", "excerpt", "reading_minutes", "published_at")
+BLOG_DETAIL_FIELDS = (*BLOG_LIST_FIELDS, "updated_at", "body_html", "toc")
+
+
+class BlogPostListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BlogPost
+        fields = BLOG_LIST_FIELDS
+
+
+class BlogPostDetailSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BlogPost
+        fields = BLOG_DETAIL_FIELDS
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BlogPost, Project
+from .search import post_document, project_document, search_service
+
+# Keep the search index in step with admin edits. Applied on commit, so a
+# rolled-back save never shows up in results.
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, **kwargs):
+    doc = project_document(instance)
+    transaction.on_commit(lambda: search_service.upsert(doc, doc.key))
+
+
+@receiver(post_save, sender=BlogPost)
+def index_post(sender, instance, **kwargs):
+    doc, key = post_document(instance), f"post:{instance.pk}"
+    transaction.on_commit(lambda: search_service.upsert(doc, key))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=BlogPost)
+def unindex(sender, instance, **kwargs):
+    key = f"{'project' if sender is Project else 'post'}:{instance.pk}"
+    transaction.on_commit(lambda: search_service.upsert(None, key))
@@ -1,6 +1,21 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APITestCase
 
-from .models import Project
+from . import rendering
+from .models import BlogPost, Project
+from .search import InvertedIndex, SearchDocument, search_service, tokenize
 
 
 class ProjectListTests(APITestCase):
@@ -50,3 +65,279 @@ class ProjectListTests(APITestCase):
                 },
             ],
         )
+
+
+class SeedProjectsCommandTests(TestCase):
+    def _write(self, name, content):
+        path = Path(self.tmp.name) / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _seed(self, *args):
+        out = StringIO()
+        call_command("seed_projects", *args, stdout=out)
+        return out.getvalue()
+
+    def test_builtin_seed_is_repeatable(self):
+        assert "created=4 updated=0 unchanged=0" in self._seed()
+        assert "created=0 updated=0 unchanged=4" in self._seed()
+
+    def test_json_and_ndjson_files_apply_only_changes(self):
+        Project.objects.create(slug="keep", title="Keep", sort_order=1)
+        Project.objects.create(slug="edit", title="Old title", sort_order=2)
+        json_file = self._write(
+            "projects.json",
+            json.dumps(
+                [
+                    {"slug": "keep", "title": "Keep", "sort_order": "1"},
+                    {"slug": "edit", "title": "New title"},
+                ]
+            ),
+        )
+        ndjson_file = self._write(
+            "more.ndjson",
+            '{"slug": "new-one", "title": "New", "is_featured": true}\n\n',
+        )
+
+        output = self._seed(json_file, ndjson_file)
+
+        assert "created=1 updated=1 unchanged=1" in output
+        assert Project.objects.get(slug="edit").title == "New title"
+        assert Project.objects.get(slug="edit").sort_order == 2
+        assert Project.objects.get(slug="new-one").is_featured is True
+
+    def test_queries_are_constant_per_batch(self):
+        def rows(n, title):
+            return json.dumps(
+                [{"slug": f"p-{i}", "title": f"{title} {i}"} for i in range(n)]
+            )
+
+        self._seed(self._write("small.json", rows(3, "A")))
+        with CaptureQueriesContext(connection) as few:
+            self._seed(self._write("small2.json", rows(3, "B")))
+        self._seed(self._write("large.json", rows(60, "A")))
+        with CaptureQueriesContext(connection) as many:
+            self._seed(self._write("large2.json", rows(60, "C")))
+
+        assert len(few.captured_queries) == len(many.captured_queries)
+
+    def test_rejects_unknown_fields(self):
+        bad = self._write("bad.json", json.dumps([{"slug": "x", "colour": "red"}]))
+        with self.assertRaises(CommandError):
+            self._seed(bad)
+
+
+POST_SOURCE = """Intro with *emphasis* & a [link](https://example.com).
+
+## Setup
+
+```python
+print("hi")
+```
+
+### Details
+
+More text.
+"""
+
+
+class BlogPostTests(APITestCase):
+    def _post(self, slug="hello", **overrides):
+        fields = {
+            "slug": slug,
+            "title": slug.title(),
+            "body_markdown": POST_SOURCE,
+            "is_published": True,
+            "published_at": timezone.now(),
+        }
+        fields.update(overrides)
+        return BlogPost.objects.create(**fields)
+
+    def test_save_compiles_markdown_once(self):
+        post = self._post()
+
+        self.assertIn('<div class="highlight">', post.body_html)
+        self.assertEqual(post.excerpt, "Intro with emphasis & a link.")
+        self.assertEqual(post.reading_minutes, 1)
+        (setup,) = post.toc
+        self.assertEqual((setup["id"], setup["title"]), ("setup", "Setup"))
+        self.assertEqual(setup["children"][0]["title"], "Details")
+
+        with mock.patch.object(rendering, "markdown") as md:
+            post.title = "Renamed"
+            post.save()
+        md.Markdown.assert_not_called()
+
+        post.body_markdown = "Changed."
+        post.save(update_fields=["body_markdown"])
+        post.refresh_from_db()
+        self.assertEqual(post.body_html, "<p>Changed.</p>")
+
+    def test_list_reads_only_precomputed_columns(self):
+        self._post("a")
+        self._post("draft", is_published=False)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get("/api/content/posts/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json(),
+            [
+                {
+                    "slug": "a",
+                    "title": "A",
+                    "excerpt": "Intro with emphasis & a link.",
+                    "reading_minutes": 1,
+                    "published_at": resp.json()[0]["published_at"],
+                }
+            ],
+        )
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertNotIn("body_markdown", sql)
+        self.assertNotIn("body_html", sql)
+
+    def test_detail_serves_stored_html(self):
+        self._post("hello")
+
+        resp = self.client.get("/api/content/posts/hello/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("<h2 id=\"setup\">Setup</h2>", resp.json()["body_html"])
+        self.assertEqual(
+            self.client.get("/api/content/posts/missing/").status_code, 404
+        )
+
+    def test_render_posts_updates_only_stale_posts(self):
+        current = self._post("current")
+        stale = self._post("stale")
+        BlogPost.objects.filter(pk=stale.pk).update(renderer_version=0, body_html="")
+
+        out = StringIO()
+        call_command("render_posts", "--workers", "2", stdout=out)
+
+        self.assertIn("Re-rendered 1 posts", out.getvalue())
+        stale.refresh_from_db()
+        self.assertEqual(stale.renderer_version, rendering.RENDERER_VERSION)
+        self.assertEqual(stale.body_html, current.body_html)
+
+        out = StringIO()
+        call_command("render_posts", stdout=out)
+        self.assertIn("All posts are current.", out.getvalue())
+
+
+class InvertedIndexTests(TestCase):
+    def _index(self, *docs):
+        index = InvertedIndex()
+        for i, (title, body) in enumerate(docs):
+            index.add(
+                SearchDocument(
+                    key=f"d:{i}", type="d", slug=f"d{i}", title=title, body=body
+                )
+            )
+        return index
+
+    def _slugs(self, index, query):
+        return [doc.slug for doc, _ in index.search(query)]
+
+    def test_tokenize_folds_case_accents_and_stopwords(self):
+        self.assertEqual(tokenize("The Café of Zürich"), ["cafe", "zurich"])
+
+    def test_bm25_prefers_title_and_rare_terms(self):
+        index = self._index(
+            ("Django tips", "caching and search"),
+            ("Notes", "django django caching"),
+            ("Sudoku", "a puzzle game"),
+        )
+
+        self.assertEqual(self._slugs(index, "django "), ["d0", "d1"])
+        self.assertEqual(self._slugs(index, "caching sudo"), [])  # AND
+        self.assertEqual(self._slugs(index, "puzzle sudo"), ["d2"])
+
+    def test_last_word_matches_as_prefix(self):
+        index = self._index(("Postgres pooling", ""), ("Post office", ""))
+
+        self.assertEqual(sorted(self._slugs(index, "pos")), ["d0", "d1"])
+        self.assertEqual(self._slugs(index, "postg"), ["d0"])
+        self.assertEqual(self._slugs(index, "pos "), [])  # complete word now
+
+    def test_remove_drops_terms(self):
+        index = self._index(("Unique title", "body"))
+
+        index.remove("d:0")
+
+        self.assertEqual(index.terms, [])
+        self.assertEqual(self._slugs(index, "uniq"), [])
+
+
+class SearchEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        search_service.clear()
+        self.addCleanup(search_service.clear)
+
+    def _search(self, q):
+        resp = self.client.get("/api/content/search/", {"q": q})
+        self.assertEqual(resp.status_code, 200)
+        return [(r["type"], r["slug"]) for r in resp.json()["results"]]
+
+    def test_search_projects_and_published_posts(self):
+        Project.objects.create(slug="site", title="Personal site", description="Django")
+        BlogPost.objects.create(
+            slug="live",
+            title="Django search",
+            body_markdown="An inverted index.",
+            is_published=True,
+            published_at=timezone.now(),
+        )
+        BlogPost.objects.create(slug="draft", title="Django draft", body_markdown="x")
+        BlogPost.objects.create(
+            slug="later",
+            title="Django later",
+            body_markdown="x",
+            is_published=True,
+            published_at=timezone.now() + timedelta(days=1),
+        )
+
+        self.assertEqual(
+            sorted(self._search("djan")), [("post", "live"), ("project", "site")]
+        )
+        self.assertEqual(self._search("inverted ind"), [("post", "live")])
+        self.assertEqual(self._search(""), [])
+
+    def test_signals_update_index_on_commit(self):
+        self.assertEqual(self._search("brotli"), [])  # index built, empty
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(slug="zip", title="Brotli benchmarks")
+        self.assertEqual(self._search("brot"), [("project", "zip")])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.title = "Gzip benchmarks"
+            project.save()
+        self.assertEqual(self._search("brot"), [])
+        self.assertEqual(self._search("gzi"), [("project", "zip")])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(self._search("gzi"), [])
+
+    def test_updates_swap_in_a_new_index(self):
+        self._search("brotli")
+        before = search_service.ensure_built()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(slug="zip", title="Brotli benchmarks")
+
+        # a query still running on the old index sees it unchanged
+        self.assertIsNot(search_service.ensure_built(), before)
+        self.assertEqual(before.search("brot"), [])
+        self.assertEqual(self._search("brot"), [("project", "zip")])
+
+
+# config/wsgi.py in a fresh interpreter, as `gunicorn --preload` imports it in
+# the master, then a fork standing in for a worker.
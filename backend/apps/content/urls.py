@@ -1,7 +1,19 @@
 from django.urls import path
 
-from .views import ProjectListAPIView
+from .views import (
+    BlogPostDetailAPIView,
+    BlogPostListAPIView,
+    ProjectListAPIView,
+    search,
+)
 
 urlpatterns = [
     path("content/projects/", ProjectListAPIView.as_view(), name="content-projects-list"),
+    path("content/posts/", BlogPostListAPIView.as_view(), name="content-posts-list"),
+    path("content/search/", search, name="content-search"),
+    path(
+        "content/posts/<slug:slug>/",
+        BlogPostDetailAPIView.as_view(),
+        name="content-posts-detail",
+    ),
 ]
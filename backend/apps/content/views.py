@@ -1,9 +1,79 @@
-from rest_framework.generics import ListAPIView
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
-from .models import Project
-from .serializers import ProjectSerializer
+from .models import BlogPost, Project
+from .search import search_service
+from .serializers import (
+    BLOG_DETAIL_FIELDS,
+    BLOG_LIST_FIELDS,
+    BlogPostDetailSerializer,
+    BlogPostListSerializer,
+    ProjectSerializer,
+)
 
 
+# Public and rarely edited: cacheable, so the compressed body is reused too.
+@method_decorator(cache_control(public=True, max_age=60), name="dispatch")
 class ProjectListAPIView(ListAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+
+
+def _published_posts():
+    return BlogPost.objects.filter(is_published=True, published_at__lte=timezone.now())
+
+
+# Posts are compiled at save time; these views only select the precomputed
+# columns they serialize (never body_markdown).
+@method_decorator(cache_control(public=True, max_age=60), name="dispatch")
+class BlogPostListAPIView(ListAPIView):
+    serializer_class = BlogPostListSerializer
+
+    def get_queryset(self):
+        return _published_posts().only(*BLOG_LIST_FIELDS)
+
+
+@method_decorator(cache_control(public=True, max_age=60), name="dispatch")
+class BlogPostDetailAPIView(RetrieveAPIView):
+    serializer_class = BlogPostDetailSerializer
+    lookup_field = "slug"
+
+    def get_queryset(self):
+        return _published_posts().only(*BLOG_DETAIL_FIELDS)
+
+
+MAX_QUERY_LENGTH = 100
+MAX_SEARCH_RESULTS = 50
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search(request):
+    """Typeahead search over projects and published posts (search.py)."""
+    query = request.query_params.get("q", "")[:MAX_QUERY_LENGTH]
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        limit = 10
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+
+    results = search_service.search(query, limit)
+    return Response(
+        {
+            "query": query,
+            "results": [
+                {
+                    "type": doc.type,
+                    "slug": doc.slug,
+                    "title": doc.title,
+                    "score": round(score, 3),
+                }
+                for doc, score in results
+            ],
+        }
+    )
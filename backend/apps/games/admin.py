@@ -1,2 +1,35 @@
+from django.contrib import admin
 
-# Register your models here.
+from .models import GameSave, Puzzle, Score, SolveTimeHistogram
+
+
+@admin.register(Score)
+class ScoreAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "game", "puzzle_key", "solve_ms", "user")
+    list_filter = ("game", "created_at")
+    search_fields = ("puzzle_key", "user__username")
+    ordering = ("-created_at",)
+
+
+@admin.register(SolveTimeHistogram)
+class SolveTimeHistogramAdmin(admin.ModelAdmin):
+    list_display = ("game", "puzzle_key", "total", "updated_at")
+    list_filter = ("game",)
+    search_fields = ("puzzle_key",)
+    readonly_fields = ("counts", "total", "updated_at")
+
+
+@admin.register(Puzzle)
+class PuzzleAdmin(admin.ModelAdmin):
+    list_display = ("game", "puzzle_key", "size", "unique_solution", "created_at")
+    list_filter = ("game", "unique_solution")
+    search_fields = ("puzzle_key",)
+    readonly_fields = ("solution_digest", "solution_bits", "created_at")
+
+
+@admin.register(GameSave)
+class GameSaveAdmin(admin.ModelAdmin):
+    list_display = ("user", "game", "puzzle_key", "version", "updated_at")
+    list_filter = ("game",)
+    search_fields = ("user__username", "puzzle_key")
+    readonly_fields = ("snapshot", "deltas", "version", "updated_at")
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.db import transaction
+
+from .models import Score, SolveTimeHistogram
+
+# Log-scaled buckets:
+# - bucket 0 holds everything under MIN_MS
+# - buckets 1..N-2 are log-spaced between MIN_MS and MAX_MS (~13% wide)
+# - bucket N-1 holds everything at/over MAX_MS
+BUCKET_COUNT = 64
+MIN_MS = 1_000
+MAX_MS = 2 * 60 * 60 * 1000
+
+_RATIO = (MAX_MS / MIN_MS) ** (1 / (BUCKET_COUNT - 2))
+
+# Lower edge of each bucket (ms).
+BUCKET_EDGES: tuple[float, ...] = (
+    (0.0,) + tuple(MIN_MS * _RATIO**i for i in range(BUCKET_COUNT - 2)) + (MAX_MS,)
+)
+
+GAME_WIDE = ""
+
+
+def bucket_index(solve_ms: int) -> int:
+    return min(bisect_right(BUCKET_EDGES, solve_ms) - 1, BUCKET_COUNT - 1)
+
+
+def empty_counts() -> list[int]:
+    return [0] * BUCKET_COUNT
+
+
+def add_solve_times(counts: list[int], solve_times: Iterable[int]) -> int:
+    """Add solve times into `counts` in place; returns how many were added."""
+    added = 0
+    for solve_ms in solve_times:
+        counts[bucket_index(solve_ms)] += 1
+        added += 1
+    return added
+
+
+def estimate_faster_than(counts: list[int], solve_ms: int) -> float | None:
+    """
+    Estimated % of recorded solves that were slower than `solve_ms`.
+
+    Counts below the bucket containing `solve_ms` are exact; inside that bucket
+    we interpolate linearly (the open-ended top bucket is treated as half-below).
+    """
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    idx = bucket_index(solve_ms)
+    below = sum(counts[:idx])
+
+    lower = BUCKET_EDGES[idx]
+    if idx + 1 < BUCKET_COUNT:
+        upper = BUCKET_EDGES[idx + 1]
+        fraction = (solve_ms - lower) / (upper - lower)
+    else:
+        fraction = 0.5
+    below += counts[idx] * fraction
+
+    return round(100 * (total - below) / total, 2)
+
+
+def histogram_keys(game: str, puzzle_key: str) -> list[tuple[str, str]]:
+    keys = [(game, GAME_WIDE)]
+    if puzzle_key:
+        keys.append((game, puzzle_key))
+    return keys
+
+
+def record_solve_times(
+    solves: Iterable[tuple[str, str, int]],
+) -> dict[tuple[str, str], SolveTimeHistogram]:
+    """
+    Fold (game, puzzle_key, solve_ms) rows into their histograms.
+
+    Each solve counts toward the game-wide histogram and, when it has one, its
+    daily puzzle histogram. Every touched row is locked and written once, so a
+    batch of solves costs one read + one write per histogram.
+    """
+    grouped: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for game, puzzle_key, solve_ms in solves:
+        for key in histogram_keys(game, puzzle_key):
+            grouped[key].append(solve_ms)
+
+    updated: dict[tuple[str, str], SolveTimeHistogram] = {}
+    if not grouped:
+        return updated
+
+    histograms = SolveTimeHistogram.objects.select_for_update()
+    with transaction.atomic():
+        for (game, puzzle_key), solve_times in sorted(grouped.items()):
+            histogram, _ = histograms.get_or_create(
+                game=game,
+                puzzle_key=puzzle_key,
+                defaults={"counts": empty_counts()},
+            )
+            if len(histogram.counts) != BUCKET_COUNT:
+                # bucket layout changed; start over (compaction can rebuild)
+                histogram.counts, histogram.total = empty_counts(), 0
+            histogram.total += add_solve_times(histogram.counts, solve_times)
+            histogram.save(update_fields=["counts", "total", "updated_at"])
+            updated[(game, puzzle_key)] = histogram
+
+    return updated
+
+
+def rebuild_histogram(*, game: str, puzzle_key: str) -> SolveTimeHistogram:
+    """Recompute one histogram exactly from `Score` rows."""
+    scores = Score.objects.filter(game=game)
+    if puzzle_key:
+        scores = scores.filter(puzzle_key=puzzle_key)
+
+    counts = empty_counts()
+    total = add_solve_times(
+        counts, scores.values_list("solve_ms", flat=True).iterator()
+    )
+
+    histogram, _ = SolveTimeHistogram.objects.update_or_create(
+        game=game,
+        puzzle_key=puzzle_key,
+        defaults={"counts": counts, "total": total},
+    )
+    return histogram
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.games.models import Game
+from apps.games.solutions import build_puzzle, validate_solution, verify_solution
+
+# Small known-good boards; nothing here touches the database.
+SUDOKU_SOLUTION = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+TANGO_SOLUTION = [
+    ["sun", "moon", "sun", "moon", "moon", "sun"],
+    ["moon", "sun", "moon", "sun", "sun", "moon"],
+    ["sun", "sun", "moon", "moon", "sun", "moon"],
+    ["moon", "moon", "sun", "sun", "moon", "sun"],
+    ["sun", "moon", "moon", "sun", "moon", "sun"],
+    ["moon", "sun", "sun", "moon", "sun", "moon"],
+]
+QUEEN_COLS = [1, 3, 5, 0, 2, 4]
+QUEENS_SOLUTION = [
+    ["queen" if c == col else None for c in range(6)] for col in QUEEN_COLS
+]
+ZIP_PATH = [
+    {"row": r, "col": c if r % 2 == 0 else 5 - c} for r in range(6) for c in range(6)
+]
+
+SAMPLES = [
+    (Game.SUDOKU, 9, {"givens": {"0,0": SUDOKU_SOLUTION[0][0]}}, SUDOKU_SOLUTION),
+    (Game.BANGO, 6, {"givens": {"0,0": "sun"}, "links": []}, TANGO_SOLUTION),
+    (Game.BEENS, 6, {"regions": [[r] * 6 for r in range(6)]}, QUEENS_SOLUTION),
+    (Game.BIP, 6, {"walls": [], "waypoints": [ZIP_PATH[0], ZIP_PATH[-1]]}, ZIP_PATH),
+]
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = "Benchmark solution verification (digest path vs full validator)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--iterations", type=int, default=20_000)
+
+    def handle(self, *args, **options) -> None:
+        iterations = options["iterations"]
+
+        for game, size, definition, solution in SAMPLES:
+            puzzle = build_puzzle(
+                game=game,
+                puzzle_key="bench",
+                size=size,
+                definition=definition,
+                solution=solution,
+            )
+            digest_rate = _rate(lambda: verify_solution(puzzle, solution), iterations)
+            full_rate = _rate(
+                lambda: validate_solution(game, size, definition, solution),
+                iterations,
+            )
+            self.stdout.write(
+                f"{game:<7} digest={digest_rate:>10,.0f}/s "
+                f"full={full_rate:>10,.0f}/s "
+                f"speedup={digest_rate / full_rate:.1f}x"
+            )
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.games.histograms import GAME_WIDE, rebuild_histogram
+from apps.games.models import SolveTimeHistogram
+
+
+class Command(BaseCommand):
+    help = "Compact solve-time histograms (prune stale daily rows, optionally rebuild)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--stale-days",
+            type=int,
+            default=14,
+            help="Drop daily-puzzle histograms not updated for this many days.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute the remaining histograms exactly from scores.",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options) -> None:
+        cutoff = timezone.now() - timedelta(days=options["stale_days"])
+
+        # Game-wide rows already include every daily solve, so old daily rows
+        # can go without losing anything from the overall percentiles.
+        pruned, _ = (
+            SolveTimeHistogram.objects.exclude(puzzle_key=GAME_WIDE)
+            .filter(updated_at__lt=cutoff)
+            .delete()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Pruned stale daily histograms: {pruned}"))
+
+        if options["rebuild"]:
+            rebuilt = 0
+            keys = SolveTimeHistogram.objects.values_list("game", "puzzle_key")
+            for game, puzzle_key in list(keys):
+                rebuild_histogram(game=game, puzzle_key=puzzle_key)
+                rebuilt += 1
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt histograms: {rebuilt}"))
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.games.models import Puzzle
+from apps.games.solutions import SolutionFormatError, build_puzzle
+
+
+class Command(BaseCommand):
+    help = "Import bank/daily puzzles (with reference solutions) from a JSON file."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "path",
+            help=(
+                "JSON array of {game, puzzle_key, size, definition, solution, "
+                "unique_solution?} objects."
+            ),
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options) -> None:
+        path = Path(options["path"])
+        try:
+            rows = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}") from exc
+
+        puzzles = []
+        for row in rows:
+            try:
+                puzzles.append(
+                    build_puzzle(
+                        game=row["game"],
+                        puzzle_key=row["puzzle_key"],
+                        size=int(row["size"]),
+                        definition=row.get("definition") or {},
+                        solution=row["solution"],
+                        unique_solution=bool(row.get("unique_solution", True)),
+                    )
+                )
+            except (KeyError, TypeError, ValueError, SolutionFormatError) as exc:
+                raise CommandError(f"Bad puzzle entry {row!r}: {exc}") from exc
+
+        Puzzle.objects.bulk_create(
+            puzzles,
+            update_conflicts=True,
+            unique_fields=["game", "puzzle_key"],
+            update_fields=[
+                "size",
+                "definition",
+                "solution_digest",
+                "solution_bits",
+                "unique_solution",
+            ],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Done. imported={len(puzzles)}"))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolveTimeHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game', models.CharField(choices=[('bango', 'Bango (Tango-style)'), ('beens', 'Beens (Queens-style)'), ('bip', 'Bip (Zip-style)'), ('sudoku', 'Mini Sudoku')], max_length=16)),
+                ('puzzle_key', models.CharField(blank=True, max_length=64)),
+                ('counts', models.JSONField(default=list)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'puzzle_key'), name='uniq_histogram_game_puzzle')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Score',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.CharField(choices=[('bango', 'Bango (Tango-style)'), ('beens', 'Beens (Queens-style)'), ('bip', 'Bip (Zip-style)'), ('sudoku', 'Mini Sudoku')], max_length=16)),
+                ('puzzle_key', models.CharField(blank=True, max_length=64)),
+                ('solve_ms', models.PositiveIntegerField()),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='game_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', 'puzzle_key', 'solve_ms'], name='games_score_game_bfde4e_idx')],
+            },
+        ),
+    ]
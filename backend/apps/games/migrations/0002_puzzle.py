@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Puzzle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.CharField(choices=[('bango', 'Bango (Tango-style)'), ('beens', 'Beens (Queens-style)'), ('bip', 'Bip (Zip-style)'), ('sudoku', 'Mini Sudoku')], max_length=16)),
+                ('puzzle_key', models.CharField(max_length=64)),
+                ('size', models.PositiveSmallIntegerField()),
+                ('definition', models.JSONField(default=dict)),
+                ('solution_digest', models.CharField(max_length=64)),
+                ('solution_bits', models.BinaryField()),
+                ('unique_solution', models.BooleanField(default=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'puzzle_key'), name='uniq_puzzle_game_key')],
+            },
+        ),
+    ]
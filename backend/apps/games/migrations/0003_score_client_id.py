@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_puzzle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='score',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+    ]
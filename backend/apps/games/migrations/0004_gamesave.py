@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_score_client_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSave',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game', models.CharField(choices=[('bango', 'Bango (Tango-style)'), ('beens', 'Beens (Queens-style)'), ('bip', 'Bip (Zip-style)'), ('sudoku', 'Mini Sudoku')], max_length=16)),
+                ('puzzle_key', models.CharField(blank=True, max_length=64)),
+                ('size', models.PositiveSmallIntegerField()),
+                ('puzzle', models.JSONField(blank=True, default=dict)),
+                ('snapshot', models.BinaryField()),
+                ('deltas', models.BinaryField(blank=True, default=b'')),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_saves', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'game', 'puzzle_key'), name='uniq_save_user_game_puzzle')],
+            },
+        ),
+    ]
@@ -1,2 +1,136 @@
+from django.conf import settings
+from django.db import models
 
-# Create your models here.
+
+class Game(models.TextChoices):
+    BANGO = "bango", "Bango (Tango-style)"
+    BEENS = "beens", "Beens (Queens-style)"
+    BIP = "bip", "Bip (Zip-style)"
+    SUDOKU = "sudoku", "Mini Sudoku"
+
+
+class Puzzle(models.Model):
+    """
+    A bank/daily puzzle with its solution precomputed for cheap verification.
+
+    `solution_bits` is the canonical bit-packed solution and `solution_digest`
+    its sha256; see `apps.games.solutions` for the encodings.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    game = models.CharField(max_length=16, choices=Game.choices)
+    puzzle_key = models.CharField(max_length=64)
+    size = models.PositiveSmallIntegerField()
+    # givens / links / regions / walls + waypoints, depending on the game
+    definition = models.JSONField(default=dict)
+
+    solution_digest = models.CharField(max_length=64)
+    solution_bits = models.BinaryField()
+    # False when the puzzle admits several solutions (full validation fallback)
+    unique_solution = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "puzzle_key"], name="uniq_puzzle_game_key"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.game} {self.puzzle_key}"
+
+
+class Score(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="game_scores",
+    )
+    game = models.CharField(max_length=16, choices=Game.choices)
+    # daily puzzle identifier (e.g. "2026-10-19"); blank for free play
+    puzzle_key = models.CharField(max_length=64, blank=True)
+    solve_ms = models.PositiveIntegerField()
+    # client-generated idempotency id (offline sync); null for direct posts
+    client_id = models.UUIDField(null=True, blank=True, unique=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "puzzle_key", "solve_ms"]),
+            # live stats: solves in the last hour
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        puzzle = self.puzzle_key or "free play"
+        return f"{self.game} ({puzzle}) in {self.solve_ms} ms"
+
+
+class SolveTimeHistogram(models.Model):
+    """
+    Fixed-bucket solve-time counts for one game (+ optional daily puzzle).
+
+    `puzzle_key=""` is the game-wide histogram. Bucket layout lives in
+    `apps.games.histograms`.
+    """
+
+    game = models.CharField(max_length=16, choices=Game.choices)
+    puzzle_key = models.CharField(max_length=64, blank=True)
+
+    counts = models.JSONField(default=list)
+    total = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "puzzle_key"], name="uniq_histogram_game_puzzle"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        puzzle = self.puzzle_key or "all puzzles"
+        return f"{self.game} ({puzzle}): {self.total} solves"
+
+
+class GameSave(models.Model):
+    """
+    In-progress board for one user/game/puzzle, resumable on any device.
+
+    `snapshot` is the bit-packed board and `deltas` the packed moves applied
+    since; see `apps.games.savestate`. `version` bumps on every write and is
+    the optimistic-concurrency token (no row locks).
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="game_saves",
+    )
+    game = models.CharField(max_length=16, choices=Game.choices)
+    puzzle_key = models.CharField(max_length=64, blank=True)
+    size = models.PositiveSmallIntegerField()
+    # puzzle definition, so client-generated free-play boards can be resumed
+    puzzle = models.JSONField(default=dict, blank=True)
+
+    snapshot = models.BinaryField()
+    deltas = models.BinaryField(default=b"", blank=True)
+    version = models.PositiveIntegerField(default=1)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "game", "puzzle_key"], name="uniq_save_user_game_puzzle"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        puzzle = self.puzzle_key or "free play"
+        return f"{self.user} {self.game} ({puzzle}) v{self.version}"
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+from .models import Game
+from .solutions import cell_pos
+
+# In-progress boards are stored as a flat list of ints ("state"):
+# - grid games: one code per cell, row-major
+#     sudoku: value (0..9) + 16 * notesMask (bits 1..9, as in sudokuPuzzles.ts)
+#     bango:  0 empty, 1 sun, 2 moon
+#     beens:  0 empty, 1 x, 2 queen
+# - bip: the path so far, as cell indices (row * size + col)
+#
+# Snapshots are bit-packed (sudoku 2 bytes/cell, bango/beens 2 bits/cell,
+# bip 1 byte/step). Moves are 3 bytes each (">BH"):
+# - grid games: (cell index, new code)
+# - bip:        (truncate path to this length, then append cell; 0xFFFF = none)
+
+MAX_BOARD_SIZE = 12
+NO_CELL = 0xFFFF
+MOVE = struct.Struct(">BH")
+
+SUDOKU_NOTES_MASK = 0b11_1111_1110  # digits 1..9
+TANGO_CODES = {None: 0, "sun": 1, "moon": 2}
+QUEENS_CODES = {None: 0, "x": 1, "queen": 2}
+
+
+class SaveStateError(ValueError):
+    pass
+
+
+def _max_code(game: str) -> int:
+    return 9 + 16 * SUDOKU_NOTES_MASK if game == Game.SUDOKU else 2
+
+
+def _check_size(game: str, size: int) -> None:
+    if game == Game.SUDOKU and size != 9:
+        raise SaveStateError("Sudoku boards are 9x9.")
+    if not 1 <= size <= MAX_BOARD_SIZE:
+        raise SaveStateError(f"Board size must be 1..{MAX_BOARD_SIZE}.")
+
+
+def _check_code(game: str, code: int) -> None:
+    if game == Game.SUDOKU:
+        value, mask = code % 16, code // 16
+        if value > 9 or mask & ~SUDOKU_NOTES_MASK:
+            raise SaveStateError(f"Invalid sudoku cell code {code}.")
+    elif not 0 <= code <= 2:
+        raise SaveStateError(f"Invalid cell code {code}.")
+
+
+# ---------------- Board JSON <-> state ----------------
+
+
+def _board_codes(game: str, size: int, board: Any) -> list[int]:
+    if game == Game.BIP:
+        return [r * size + c for r, c in map(cell_pos, board)]
+
+    if len(board) != size:
+        raise ValueError("wrong row count")
+    cells = [cell for row in board for cell in row]
+    if game == Game.SUDOKU:
+        return [
+            int(cell.get("value") or 0) + 16 * int(cell.get("notesMask") or 0)
+            for cell in cells
+        ]
+    codes = TANGO_CODES if game == Game.BANGO else QUEENS_CODES
+    return [codes[cell] for cell in cells]
+
+
+def board_to_state(game: str, size: int, board: Any) -> list[int]:
+    """Frontend-shaped board JSON -> flat state."""
+    _check_size(game, size)
+    try:
+        state = _board_codes(game, size, board)
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        raise SaveStateError(f"Invalid {game} board.") from exc
+
+    if game == Game.BIP:
+        if any(not 0 <= i < size * size for i in state):
+            raise SaveStateError("Path leaves the board.")
+        return state
+
+    if len(state) != size * size:
+        raise SaveStateError(f"Expected a {size}x{size} grid.")
+    for code in state:
+        _check_code(game, code)
+    return state
+
+
+def state_to_board(game: str, size: int, state: list[int]) -> Any:
+    """Flat state -> frontend-shaped board JSON."""
+    if game == Game.BIP:
+        return [f"{i // size},{i % size}" for i in state]
+
+    if game == Game.SUDOKU:
+        cells = [
+            {"value": (code % 16) or None, "notesMask": code // 16} for code in state
+        ]
+    else:
+        codes = TANGO_CODES if game == Game.BANGO else QUEENS_CODES
+        symbols = {code: symbol for symbol, code in codes.items()}
+        cells = [symbols[code] for code in state]
+    return [cells[r * size : (r + 1) * size] for r in range(size)]
+
+
+# ---------------- Snapshot packing ----------------
+
+
+def pack_state(game: str, state: list[int]) -> bytes:
+    if game == Game.BIP:
+        return bytes(state)
+    if game == Game.SUDOKU:
+        return struct.pack(f">{len(state)}H", *state)
+
+    packed = bytearray((len(state) + 3) // 4)
+    for i, code in enumerate(state):
+        packed[i // 4] |= code << (6 - 2 * (i % 4))
+    return bytes(packed)
+
+
+def unpack_state(game: str, size: int, data: bytes) -> list[int]:
+    data = bytes(data)
+    if game == Game.BIP:
+        return list(data)
+    if game == Game.SUDOKU:
+        return list(struct.unpack(f">{len(data) // 2}H", data))
+
+    cells = size * size
+    return [(data[i // 4] >> (6 - 2 * (i % 4))) & 0b11 for i in range(cells)]
+
+
+# ---------------- Move deltas ----------------
+
+
+def pack_moves(game: str, size: int, moves: Any) -> bytes:
+    """Validate compact-JSON moves ([[a, b], ...]) and pack them."""
+    out = bytearray()
+    for move in moves:
+        try:
+            a, b = (int(x) for x in move)
+        except (TypeError, ValueError) as exc:
+            raise SaveStateError(f"Invalid move {move!r}.") from exc
+        if b == -1:
+            b = NO_CELL
+        _check_move(game, size, a, b)
+        out += MOVE.pack(a, b)
+    return bytes(out)
+
+
+def check_packed_moves(game: str, size: int, data: bytes) -> bytes:
+    """Validate a binary delta body (3 bytes per move)."""
+    if len(data) % MOVE.size:
+        raise SaveStateError(f"Binary moves must be {MOVE.size} bytes each.")
+    for a, b in MOVE.iter_unpack(data):
+        _check_move(game, size, a, b)
+    return bytes(data)
+
+
+def _check_move(game: str, size: int, a: int, b: int) -> None:
+    cells = size * size
+    if game == Game.BIP:
+        if not 0 <= a <= cells or not (0 <= b < cells or b == NO_CELL):
+            raise SaveStateError(f"Invalid path move ({a}, {b}).")
+        return
+    if not 0 <= a < cells or not 0 <= b <= _max_code(game):
+        raise SaveStateError(f"Invalid move ({a}, {b}).")
+    _check_code(game, b)
+
+
+def apply_moves(game: str, state: list[int], moves: bytes) -> list[int]:
+    state = list(state)
+    for a, b in MOVE.iter_unpack(bytes(moves)):
+        if game == Game.BIP:
+            del state[a:]
+            if b != NO_CELL:
+                state.append(b)
+        else:
+            state[a] = b
+    return state
+
+
+def move_count(moves: bytes) -> int:
+    return len(moves) // MOVE.size
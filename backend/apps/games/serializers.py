@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from .models import Game
+
+# Anything over a day is a tab left open, not a solve.
+MAX_SOLVE_MS = 24 * 60 * 60 * 1000
+
+
+class ScoreCreateSerializer(serializers.Serializer):
+    game = serializers.ChoiceField(choices=[g for g, _ in Game.choices])
+    puzzle_key = serializers.CharField(max_length=64, allow_blank=True, required=False)
+    solve_ms = serializers.IntegerField(min_value=1, max_value=MAX_SOLVE_MS)
+    # Required for daily/bank puzzles; checked against the stored digest.
+    solution = serializers.JSONField(required=False, allow_null=True)
+
+
+class ScoreBatchItemSerializer(ScoreCreateSerializer):
+    client_id = serializers.UUIDField()
+
+
+class PercentileQuerySerializer(serializers.Serializer):
+    solve_ms = serializers.IntegerField(min_value=0, max_value=MAX_SOLVE_MS)
+    puzzle = serializers.CharField(max_length=64, allow_blank=True, required=False)
+
+
+class GameSavePutSerializer(serializers.Serializer):
+    size = serializers.IntegerField(min_value=1)
+    puzzle = serializers.JSONField(required=False)
+    board = serializers.JSONField()
+    # the version being replaced; omitted = overwrite whatever is there
+    version = serializers.IntegerField(min_value=1, required=False)
+
+
+class GameSavePatchSerializer(serializers.Serializer):
+    version = serializers.IntegerField(min_value=1)
+    moves = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(), min_length=2, max_length=2
+        ),
+        allow_empty=False,
+        max_length=500,
+    )
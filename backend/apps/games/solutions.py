@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hmac
+from hashlib import sha256
+from typing import Any
+
+from .models import Game, Puzzle
+
+# Canonical encodings (also what we store in `Puzzle.solution_bits`):
+# - sudoku: one nibble per cell (1..9), row-major
+# - bango:  one bit per cell (sun=1, moon=0), row-major
+# - beens:  one bit per cell (queen=1), row-major; "x" marks are ignored
+# - bip:    one byte per path step (row * size + col)
+
+TANGO_SYMBOLS = {"sun": 1, "moon": 0}
+
+
+class SolutionFormatError(ValueError):
+    pass
+
+
+def cell_pos(value: Any) -> tuple[int, int]:
+    # Accept {"row": r, "col": c}, [r, c] or the frontend's "r,c" keys.
+    try:
+        if isinstance(value, dict):
+            return int(value["row"]), int(value["col"])
+        if isinstance(value, str):
+            row, col = value.split(",")
+            return int(row), int(col)
+        row, col = value
+        return int(row), int(col)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise SolutionFormatError(f"Invalid cell position: {value!r}") from exc
+
+
+def _grid(solution: Any, size: int) -> list[list[Any]]:
+    if (
+        not isinstance(solution, list)
+        or len(solution) != size
+        or any(not isinstance(row, list) or len(row) != size for row in solution)
+    ):
+        raise SolutionFormatError(f"Expected a {size}x{size} grid.")
+    return solution
+
+
+def _sudoku_value(cell: Any) -> int:
+    if isinstance(cell, dict):
+        cell = cell.get("value")
+    if isinstance(cell, bool) or not isinstance(cell, int) or not 1 <= cell <= 9:
+        raise SolutionFormatError("Sudoku cells must hold digits 1..9.")
+    return cell
+
+
+def _pack_bits(bits: list[int]) -> bytes:
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return value.to_bytes((len(bits) + 7) // 8, "big")
+
+
+def _sudoku_values(solution: Any, size: int) -> list[int]:
+    if isinstance(solution, str):
+        if len(solution) != size * size or not solution.isdigit():
+            raise SolutionFormatError("Expected one digit per cell.")
+        return [_sudoku_value(int(ch)) for ch in solution]
+    return [_sudoku_value(cell) for row in _grid(solution, size) for cell in row]
+
+
+def _tango_bits(solution: Any, size: int) -> list[int]:
+    try:
+        return [TANGO_SYMBOLS[cell] for row in _grid(solution, size) for cell in row]
+    except (KeyError, TypeError) as exc:
+        raise SolutionFormatError("Bango cells must be 'sun' or 'moon'.") from exc
+
+
+def _queen_bits(solution: Any, size: int) -> list[int]:
+    return [int(cell == "queen") for row in _grid(solution, size) for cell in row]
+
+
+def _zip_path(solution: Any, size: int) -> list[tuple[int, int]]:
+    if not isinstance(solution, list) or len(solution) != size * size:
+        raise SolutionFormatError("Bip paths must visit every cell.")
+    path = [cell_pos(step) for step in solution]
+    if any(not (0 <= r < size and 0 <= c < size) for r, c in path):
+        raise SolutionFormatError("Bip path leaves the board.")
+    return path
+
+
+def encode_solution(game: str, size: int, solution: Any) -> bytes:
+    """Canonical, compact encoding of a submitted solution."""
+    if game == Game.SUDOKU:
+        values = _sudoku_values(solution, size)
+        if len(values) % 2:
+            values.append(0)
+        return bytes((a << 4) | b for a, b in zip(values[::2], values[1::2]))
+    if game == Game.BANGO:
+        return _pack_bits(_tango_bits(solution, size))
+    if game == Game.BEENS:
+        return _pack_bits(_queen_bits(solution, size))
+    if game == Game.BIP:
+        if size * size > 256:
+            raise SolutionFormatError("Bip boards are at most 16x16.")
+        return bytes(r * size + c for r, c in _zip_path(solution, size))
+    raise SolutionFormatError(f"Unknown game '{game}'.")
+
+
+def solution_digest(game: str, packed: bytes) -> str:
+    return sha256(game.encode("utf-8") + b":" + packed).hexdigest()
+
+
+# ---------------- Full constraint validators (fallback path) ----------------
+
+
+def _givens(definition: dict[str, Any]) -> dict[tuple[int, int], Any]:
+    return {cell_pos(k): v for k, v in (definition.get("givens") or {}).items()}
+
+
+def _validate_sudoku(size: int, definition: dict[str, Any], solution: Any) -> bool:
+    values = _sudoku_values(solution, size)
+    grid = [values[r * size : (r + 1) * size] for r in range(size)]
+    digits = set(range(1, 10))
+
+    for i in range(size):
+        if set(grid[i]) != digits or {grid[r][i] for r in range(size)} != digits:
+            return False
+    for br in range(0, size, 3):
+        for bc in range(0, size, 3):
+            box = {grid[r][c] for r in range(br, br + 3) for c in range(bc, bc + 3)}
+            if box != digits:
+                return False
+
+    return all(grid[r][c] == v for (r, c), v in _givens(definition).items())
+
+
+def _validate_tango(size: int, definition: dict[str, Any], solution: Any) -> bool:
+    bits = _tango_bits(solution, size)
+    grid = [bits[r * size : (r + 1) * size] for r in range(size)]
+    half = size // 2
+
+    lines = grid + [[grid[r][c] for r in range(size)] for c in range(size)]
+    for line in lines:
+        if sum(line) != half:
+            return False
+        if any(line[i] == line[i + 1] == line[i + 2] for i in range(size - 2)):
+            return False
+
+    for link in definition.get("links") or []:
+        (ar, ac), (br, bc) = cell_pos(link["a"]), cell_pos(link["b"])
+        same = grid[ar][ac] == grid[br][bc]
+        if same != (link["kind"] == "same"):
+            return False
+
+    givens = _givens(definition)
+    return all(grid[r][c] == TANGO_SYMBOLS.get(v) for (r, c), v in givens.items())
+
+
+def _validate_queens(size: int, definition: dict[str, Any], solution: Any) -> bool:
+    bits = _queen_bits(solution, size)
+    queens = [(i // size, i % size) for i, bit in enumerate(bits) if bit]
+    regions = definition.get("regions") or []
+    if len(queens) != size or len(regions) != size:
+        return False
+
+    rows = {r for r, _ in queens}
+    cols = {c for _, c in queens}
+    region_ids = {regions[r][c] for r, c in queens}
+    all_regions = {v for row in regions for v in row}
+    if len(rows) != size or len(cols) != size or region_ids != all_regions:
+        return False
+
+    # one per row, so touching can only happen between adjacent rows
+    by_row = dict(queens)
+    return all(abs(by_row[r] - by_row[r + 1]) > 1 for r in range(size - 1))
+
+
+def _validate_zip(size: int, definition: dict[str, Any], solution: Any) -> bool:
+    path = _zip_path(solution, size)
+    if len(set(path)) != size * size:
+        return False
+
+    walls = {
+        (int(w["row"]), int(w["col"]), w["side"])
+        for w in definition.get("walls") or []
+    }
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        if abs(r1 - r2) + abs(c1 - c2) != 1:
+            return False
+        # walls live on the top/left edge of the lower/right cell
+        if r1 != r2 and (max(r1, r2), c1, "top") in walls:
+            return False
+        if c1 != c2 and (r1, max(c1, c2), "left") in walls:
+            return False
+
+    waypoints = [cell_pos(p) for p in definition.get("waypoints") or []]
+    if not waypoints or path[0] != waypoints[0] or path[-1] != waypoints[-1]:
+        return False
+    order = {pos: i for i, pos in enumerate(path)}
+    steps = [order[pos] for pos in waypoints]
+    return steps == sorted(steps)
+
+
+VALIDATORS = {
+    Game.SUDOKU: _validate_sudoku,
+    Game.BANGO: _validate_tango,
+    Game.BEENS: _validate_queens,
+    Game.BIP: _validate_zip,
+}
+
+
+def validate_solution(
+    game: str, size: int, definition: dict[str, Any], solution: Any
+) -> bool:
+    """Full constraint check; slow path for puzzles with several solutions."""
+    try:
+        return VALIDATORS[game](size, definition, solution)
+    except (KeyError, IndexError, TypeError, ValueError):  # incl. SolutionFormatError
+        return False
+
+
+# ---------------- Puzzle bank ----------------
+
+
+def build_puzzle(
+    *,
+    game: str,
+    puzzle_key: str,
+    size: int,
+    definition: dict[str, Any],
+    solution: Any,
+    unique_solution: bool = True,
+) -> Puzzle:
+    """
+    Build an unsaved `Puzzle` with its solution digest + bitset precomputed.
+
+    The reference solution is checked once here so every later verification can
+    be a digest compare.
+    """
+    if not validate_solution(game, size, definition, solution):
+        raise SolutionFormatError(
+            f"Reference solution for {game}/{puzzle_key} is invalid."
+        )
+
+    packed = encode_solution(game, size, solution)
+    return Puzzle(
+        game=game,
+        puzzle_key=puzzle_key,
+        size=size,
+        definition=definition,
+        solution_digest=solution_digest(game, packed),
+        solution_bits=packed,
+        unique_solution=unique_solution,
+    )
+
+
+def verify_solution(puzzle: Puzzle, solution: Any) -> bool:
+    """
+    Hot path: canonical encoding + constant-time digest compare.
+
+    Only puzzles flagged as having several solutions fall back to the full
+    constraint validator when the digest does not match.
+    """
+    try:
+        packed = encode_solution(puzzle.game, puzzle.size, solution)
+    except ValueError:  # SolutionFormatError, or anything else bytes() rejects
+        return False
+
+    digest = solution_digest(puzzle.game, packed)
+    if hmac.compare_digest(digest, puzzle.solution_digest):
+        return True
+    if puzzle.unique_solution:
+        return False
+    return validate_solution(puzzle.game, puzzle.size, puzzle.definition, solution)
@@ -0,0 +1,138 @@
+import uuid
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.games.models import Score, SolveTimeHistogram
+from apps.games.solutions import build_puzzle
+
+SUDOKU_SOLUTION = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+
+
+class ScoreBatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        build_puzzle(
+            game="sudoku",
+            puzzle_key="2026-10-19",
+            size=9,
+            definition={"givens": {}},
+            solution=SUDOKU_SOLUTION,
+        ).save()
+
+    def _item(self, **overrides):
+        item = {
+            "client_id": str(uuid.uuid4()),
+            "game": "sudoku",
+            "puzzle_key": "2026-10-19",
+            "solve_ms": 90_000,
+            "solution": SUDOKU_SOLUTION,
+        }
+        item.update(overrides)
+        return item
+
+    def _post(self, items):
+        return self.client.post(
+            "/api/games/scores/batch/", {"scores": items}, format="json"
+        )
+
+    def test_batch_creates_scores_and_updates_histograms_once(self):
+        items = [self._item(solve_ms=ms) for ms in (30_000, 60_000, 90_000)]
+        items.append(self._item(game="bip", puzzle_key="", solution=None))
+
+        resp = self._post(items)
+
+        assert resp.status_code == 200
+        statuses = [r["status"] for r in resp.json()["results"]]
+        assert statuses == ["created"] * 4
+        assert Score.objects.count() == 4
+        daily = SolveTimeHistogram.objects.get(game="sudoku", puzzle_key="2026-10-19")
+        assert daily.total == 3
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        self._post([self._item()])  # histogram rows exist from here on
+
+        with CaptureQueriesContext(connection) as small:
+            self._post([self._item() for _ in range(2)])
+        with CaptureQueriesContext(connection) as large:
+            self._post([self._item() for _ in range(50)])
+
+        assert len(small.captured_queries) == len(large.captured_queries)
+
+    def test_resending_a_batch_is_idempotent(self):
+        items = [self._item(), self._item()]
+        self._post(items)
+
+        resp = self._post(items)
+
+        assert [r["status"] for r in resp.json()["results"]] == ["duplicate"] * 2
+        assert Score.objects.count() == 2
+        assert SolveTimeHistogram.objects.get(puzzle_key="").total == 2
+
+    def test_repeated_id_within_batch_is_duplicate(self):
+        item = self._item()
+        resp = self._post([item, item])
+
+        assert [r["status"] for r in resp.json()["results"]] == [
+            "created",
+            "duplicate",
+        ]
+        assert Score.objects.count() == 1
+
+    def test_concurrent_sync_of_the_same_ids_is_not_counted_twice(self):
+        raced, fresh = self._item(), self._item()
+        self._post([raced])  # "the other device", after our duplicate check
+
+        with mock.patch("apps.games.views._existing_client_ids", return_value=set()):
+            resp = self._post([raced, fresh])
+
+        assert [r["status"] for r in resp.json()["results"]] == [
+            "duplicate",
+            "created",
+        ]
+        assert Score.objects.count() == 2
+        assert SolveTimeHistogram.objects.get(puzzle_key="").total == 2
+
+    def test_bad_items_are_rejected_individually(self):
+        wrong = [row[:] for row in SUDOKU_SOLUTION]
+        wrong[0][0], wrong[0][1] = wrong[0][1], wrong[0][0]
+        items = [
+            self._item(),
+            self._item(solution=wrong),
+            self._item(puzzle_key="1999-01-01"),
+            {"game": "sudoku", "solve_ms": 1000},
+        ]
+
+        results = self._post(items).json()["results"]
+
+        assert [r["status"] for r in results] == ["created"] + ["rejected"] * 3
+        assert results[1]["error"]["code"] == "solution_rejected"
+        assert results[2]["error"]["code"] == "puzzle_not_found"
+        assert results[3]["error"]["code"] == "invalid"
+        assert Score.objects.count() == 1
+
+    def test_empty_and_oversized_batches(self):
+        assert self._post([]).status_code == 400
+        assert self._post([self._item() for _ in range(101)]).status_code == 413
+
+    def test_idempotency_key_replays_batch(self):
+        items = [self._item()]
+        first = self.client.post(
+            "/api/games/scores/batch/",
+            {"scores": items},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=str(uuid.uuid4()),
+        )
+        retry = self.client.post(
+            "/api/games/scores/batch/",
+            {"scores": items},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=first.request["HTTP_IDEMPOTENCY_KEY"],
+        )
+
+        assert retry["Idempotent-Replayed"] == "true"
+        assert retry.json() == first.json()
+        assert Score.objects.count() == 1
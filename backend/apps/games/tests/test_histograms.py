@@ -0,0 +1,142 @@
+import random
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.games.histograms import (
+    BUCKET_COUNT,
+    MAX_MS,
+    MIN_MS,
+    add_solve_times,
+    bucket_index,
+    empty_counts,
+    estimate_faster_than,
+)
+from apps.games.models import Score, SolveTimeHistogram
+from apps.games.solutions import build_puzzle
+
+SUDOKU_SOLUTION = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+
+
+def exact_faster_than(solve_times, solve_ms):
+    slower = sum(1 for t in solve_times if t > solve_ms)
+    return 100 * slower / len(solve_times)
+
+
+class HistogramMathTests(SimpleTestCase):
+    def test_bucket_bounds(self):
+        assert bucket_index(0) == 0
+        assert bucket_index(MIN_MS - 1) == 0
+        assert bucket_index(MIN_MS) == 1
+        assert bucket_index(MAX_MS) == BUCKET_COUNT - 1
+        assert bucket_index(MAX_MS * 10) == BUCKET_COUNT - 1
+
+    def test_empty_histogram_has_no_percentile(self):
+        assert estimate_faster_than(empty_counts(), 30_000) is None
+
+    def test_estimate_matches_exact_percentiles(self):
+        rng = random.Random(1234)
+        # log-normal-ish solve times centred around ~90s
+        solve_times = [int(rng.lognormvariate(11.4, 0.6)) for _ in range(20_000)]
+        counts = empty_counts()
+        add_solve_times(counts, solve_times)
+
+        ordered = sorted(solve_times)
+        for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+            probe = ordered[int(q * (len(ordered) - 1))]
+            estimate = estimate_faster_than(counts, probe)
+            exact = exact_faster_than(solve_times, probe)
+            assert abs(estimate - exact) < 1.0, (q, estimate, exact)
+
+
+class ScoreHistogramEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        build_puzzle(
+            game="sudoku",
+            puzzle_key="2026-10-19",
+            size=9,
+            definition={"givens": {}},
+            solution=SUDOKU_SOLUTION,
+        ).save()
+
+    def _post(self, solve_ms, puzzle_key="2026-10-19"):
+        return self.client.post(
+            "/api/games/scores/",
+            {
+                "game": "sudoku",
+                "puzzle_key": puzzle_key,
+                "solve_ms": solve_ms,
+                "solution": SUDOKU_SOLUTION,
+            },
+            format="json",
+        )
+
+    def test_score_insert_updates_daily_and_game_wide_histograms(self):
+        resp = self._post(60_000)
+        assert resp.status_code == 201
+        assert Score.objects.count() == 1
+
+        daily = SolveTimeHistogram.objects.get(game="sudoku", puzzle_key="2026-10-19")
+        overall = SolveTimeHistogram.objects.get(game="sudoku", puzzle_key="")
+        assert daily.total == 1
+        assert overall.total == 1
+        assert len(daily.counts) == BUCKET_COUNT
+
+    def test_percentile_endpoint_reads_histogram(self):
+        for solve_ms in (30_000, 60_000, 120_000, 240_000):
+            self._post(solve_ms)
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(
+                "/api/games/sudoku/percentile/",
+                {"solve_ms": 45_000, "puzzle": "2026-10-19"},
+            )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] == 4
+        assert 70 <= body["faster_than_pct"] <= 80
+
+    def test_percentile_without_data(self):
+        resp = self.client.get("/api/games/bip/percentile/", {"solve_ms": 1000})
+        assert resp.status_code == 200
+        assert resp.json()["faster_than_pct"] is None
+
+    def test_percentile_unknown_game(self):
+        resp = self.client.get("/api/games/chess/percentile/", {"solve_ms": 1000})
+        assert resp.status_code == 404
+        assert resp.json()["error"]["code"] == "not_found"
+
+    def test_percentile_requires_solve_ms(self):
+        resp = self.client.get("/api/games/sudoku/percentile/")
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "invalid_query"
+
+
+class CompactHistogramsCommandTests(TestCase):
+    def test_prunes_stale_daily_rows_and_rebuilds(self):
+        Score.objects.create(game="beens", puzzle_key="2026-01-01", solve_ms=50_000)
+        Score.objects.create(game="beens", puzzle_key="2026-10-19", solve_ms=70_000)
+        SolveTimeHistogram.objects.create(
+            game="beens", puzzle_key="2026-01-01", counts=empty_counts(), total=1
+        )
+        SolveTimeHistogram.objects.create(
+            game="beens", puzzle_key="2026-10-19", counts=empty_counts(), total=9
+        )
+        SolveTimeHistogram.objects.create(
+            game="beens", puzzle_key="", counts=empty_counts(), total=0
+        )
+        SolveTimeHistogram.objects.filter(puzzle_key="2026-01-01").update(
+            updated_at=timezone.now() - timedelta(days=30)
+        )
+
+        call_command("compact_histograms", "--rebuild", stdout=StringIO())
+
+        assert not SolveTimeHistogram.objects.filter(puzzle_key="2026-01-01").exists()
+        assert SolveTimeHistogram.objects.get(puzzle_key="2026-10-19").total == 1
+        assert SolveTimeHistogram.objects.get(puzzle_key="").total == 2
@@ -0,0 +1,206 @@
+import struct
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.games.models import GameSave
+from apps.games.savestate import (
+    SaveStateError,
+    apply_moves,
+    board_to_state,
+    pack_moves,
+    pack_state,
+    state_to_board,
+    unpack_state,
+)
+from apps.games.views import COMPACT_AFTER_MOVES
+
+URL = "/api/games/saves/sudoku/?puzzle=2026-10-19"
+
+
+def empty_sudoku():
+    return [[{"value": None, "notesMask": 0} for _ in range(9)] for _ in range(9)]
+
+
+class SaveStateCodecTests(SimpleTestCase):
+    def test_sudoku_round_trip_keeps_notes(self):
+        board = empty_sudoku()
+        board[0][0] = {"value": 5, "notesMask": 0}
+        board[4][4] = {"value": None, "notesMask": (1 << 2) | (1 << 9)}
+
+        state = board_to_state("sudoku", 9, board)
+        packed = pack_state("sudoku", state)
+
+        assert len(packed) == 162
+        assert state_to_board("sudoku", 9, unpack_state("sudoku", 9, packed)) == board
+
+    def test_queens_pack_two_bits_per_cell(self):
+        board = [[None] * 6 for _ in range(6)]
+        board[0][1], board[2][3] = "queen", "x"
+
+        packed = pack_state("beens", board_to_state("beens", 6, board))
+
+        assert len(packed) == 9
+        restored = state_to_board("beens", 6, unpack_state("beens", 6, packed))
+        assert restored == board
+
+    def test_zip_moves_truncate_then_extend(self):
+        state = board_to_state("bip", 6, ["0,0", "0,1", "0,2"])
+        moves = pack_moves("bip", 6, [[2, 6], [3, 12], [1, -1]])
+
+        assert apply_moves("bip", state, moves) == [0]
+        assert apply_moves("bip", state, moves[:6]) == [0, 1, 6, 12]
+
+    def test_invalid_moves_are_rejected(self):
+        with self.assertRaises(SaveStateError):
+            pack_moves("sudoku", 9, [[81, 1]])
+        with self.assertRaises(SaveStateError):
+            pack_moves("sudoku", 9, [[0, 10]])  # value 10
+        with self.assertRaises(SaveStateError):
+            pack_moves("bango", 6, [[0, 3]])
+
+
+class GameSaveEndpointTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="player", password="pass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _put(self, board=None):
+        return self.client.put(
+            URL, {"size": 9, "board": board or empty_sudoku()}, format="json"
+        )
+
+    def _patch(self, version, moves):
+        return self.client.patch(
+            URL, {"version": version, "moves": moves}, format="json"
+        )
+
+    def test_requires_auth(self):
+        assert APIClient().get(URL).status_code in (401, 403)
+
+    def test_put_then_patch_then_get(self):
+        assert self._put().json() == {"version": 1}
+
+        # value 7 at r0c0, notes {1,2} at r0c1
+        resp = self._patch(1, [[0, 7], [1, 16 * 0b110]])
+        assert resp.status_code == 200
+        assert resp.json() == {"version": 2}
+
+        body = self.client.get(URL).json()
+        assert body["version"] == 2
+        assert body["board"][0][0] == {"value": 7, "notesMask": 0}
+        assert body["board"][0][1] == {"value": None, "notesMask": 0b110}
+
+    def test_binary_deltas_with_if_match(self):
+        self._put()
+        body = struct.pack(">BH", 80, 9)
+
+        resp = self.client.generic(
+            "PATCH",
+            URL,
+            body,
+            content_type="application/octet-stream",
+            HTTP_IF_MATCH='"1"',
+        )
+
+        assert resp.status_code == 200
+        assert self.client.get(URL).json()["board"][8][8]["value"] == 9
+
+    def test_binary_deltas_need_version(self):
+        self._put()
+        resp = self.client.generic(
+            "PATCH", URL, b"\x00\x00\x01", content_type="application/octet-stream"
+        )
+        assert resp.status_code == 428
+
+    def test_stale_version_conflicts(self):
+        self._put()
+        self._patch(1, [[0, 1]])
+
+        resp = self._patch(1, [[0, 2]])
+
+        assert resp.status_code == 409
+        assert resp.json()["error"]["details"] == {"version": 2}
+
+    def test_delta_log_is_compacted_into_snapshot(self):
+        self._put()
+        version = 1
+        for i in range(COMPACT_AFTER_MOVES):
+            version = self._patch(version, [[i, 1 + i % 9]]).json()["version"]
+
+        save = GameSave.objects.get()
+        assert bytes(save.deltas) == b""
+        assert self.client.get(URL).json()["board"][7][0]["value"] == 1 + 63 % 9
+
+    def test_put_resets_board(self):
+        self._put()
+        self._patch(1, [[0, 3]])
+
+        assert self._put().json() == {"version": 3}
+        assert self.client.get(URL).json()["board"][0][0]["value"] is None
+
+    def test_versioned_put_only_replaces_that_version(self):
+        self._put()
+        self._patch(1, [[0, 3]])  # another device moved on to version 2
+
+        stale = self.client.put(
+            URL, {"size": 9, "board": empty_sudoku(), "version": 1}, format="json"
+        )
+        assert stale.status_code == 409
+        assert stale.json()["error"]["details"] == {"version": 2}
+        assert self.client.get(URL).json()["board"][0][0]["value"] == 3
+
+        resp = self.client.put(
+            URL,
+            {"size": 9, "board": empty_sudoku()},
+            format="json",
+            HTTP_IF_MATCH='"2"',
+        )
+        assert resp.json() == {"version": 3}
+        assert self.client.get(URL).json()["board"][0][0]["value"] is None
+
+    def test_versioned_put_needs_an_existing_save(self):
+        resp = self.client.put(
+            URL, {"size": 9, "board": empty_sudoku(), "version": 1}, format="json"
+        )
+
+        assert resp.status_code == 409
+        assert resp.json()["error"]["details"] == {"version": None}
+        assert not GameSave.objects.exists()
+
+    def test_unversioned_put_overwrites(self):
+        self._put()
+        self._patch(1, [[0, 3]])
+
+        resp = self.client.put(
+            URL,
+            {"size": 9, "board": empty_sudoku()},
+            format="json",
+            HTTP_IF_MATCH="*",
+        )
+
+        assert resp.json() == {"version": 3}
+        assert self.client.get(URL).json()["board"][0][0]["value"] is None
+
+    def test_compact_command_folds_idle_saves(self):
+        self._put()
+        self._patch(1, [[5, 4]])
+        GameSave.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+        call_command("compact_game_saves", stdout=StringIO())
+
+        save = GameSave.objects.get()
+        assert bytes(save.deltas) == b""
+        assert save.version == 2  # same board, same version
+        assert self.client.get(URL).json()["board"][0][5]["value"] == 4
+
+        # the idle client's next save still applies
+        assert self._patch(2, [[6, 1]]).json() == {"version": 3}
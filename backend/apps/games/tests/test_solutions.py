@@ -0,0 +1,186 @@
+import copy
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.games.models import Puzzle, Score
+from apps.games.solutions import (
+    SolutionFormatError,
+    build_puzzle,
+    encode_solution,
+    verify_solution,
+)
+
+SUDOKU_SOLUTION = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+TANGO_SOLUTION = [
+    ["sun", "moon", "sun", "moon", "moon", "sun"],
+    ["moon", "sun", "moon", "sun", "sun", "moon"],
+    ["sun", "sun", "moon", "moon", "sun", "moon"],
+    ["moon", "moon", "sun", "sun", "moon", "sun"],
+    ["sun", "moon", "moon", "sun", "moon", "sun"],
+    ["moon", "sun", "sun", "moon", "sun", "moon"],
+]
+QUEENS_REGIONS = [[r] * 6 for r in range(6)]
+
+
+def queens_grid(cols):
+    return [["queen" if c == col else "x" for c in range(6)] for col in cols]
+
+
+def serpentine_path():
+    return [f"{r},{c if r % 2 == 0 else 5 - c}" for r in range(6) for c in range(6)]
+
+
+class EncodingTests(SimpleTestCase):
+    def test_sudoku_packs_two_cells_per_byte(self):
+        packed = encode_solution("sudoku", 9, SUDOKU_SOLUTION)
+        assert len(packed) == 41
+
+    def test_sudoku_accepts_frontend_cells_and_strings(self):
+        cells = [[{"value": v, "notesMask": 0} for v in row] for row in SUDOKU_SOLUTION]
+        flat = "".join(str(v) for row in SUDOKU_SOLUTION for v in row)
+        expected = encode_solution("sudoku", 9, SUDOKU_SOLUTION)
+        assert encode_solution("sudoku", 9, cells) == expected
+        assert encode_solution("sudoku", 9, flat) == expected
+
+    def test_queens_ignore_x_marks(self):
+        with_marks = queens_grid([1, 3, 5, 0, 2, 4])
+        without = [[c if c == "queen" else None for c in row] for row in with_marks]
+        assert encode_solution("beens", 6, with_marks) == encode_solution(
+            "beens", 6, without
+        )
+
+    def test_incomplete_board_is_a_format_error(self):
+        grid = copy.deepcopy(TANGO_SOLUTION)
+        grid[0][0] = None
+        with self.assertRaises(SolutionFormatError):
+            encode_solution("bango", 6, grid)
+
+
+    def test_bip_board_too_large_for_one_byte_per_step(self):
+        path = [f"{r},{c}" for r in range(17) for c in range(17)]
+        with self.assertRaises(SolutionFormatError):
+            encode_solution("bip", 17, path)
+
+        puzzle = Puzzle(game="bip", size=17, definition={}, unique_solution=False)
+        assert not verify_solution(puzzle, path)
+
+
+class VerifySolutionTests(SimpleTestCase):
+    def test_unique_puzzle_uses_digest_only(self):
+        puzzle = build_puzzle(
+            game="sudoku",
+            puzzle_key="p1",
+            size=9,
+            definition={"givens": {"0,0": SUDOKU_SOLUTION[0][0]}},
+            solution=SUDOKU_SOLUTION,
+        )
+        assert verify_solution(puzzle, SUDOKU_SOLUTION)
+
+        wrong = copy.deepcopy(SUDOKU_SOLUTION)
+        wrong[0][0], wrong[0][1] = wrong[0][1], wrong[0][0]
+        assert not verify_solution(puzzle, wrong)
+
+    def test_multi_solution_puzzle_falls_back_to_validator(self):
+        # One region per row: several queen layouts satisfy the constraints.
+        puzzle = build_puzzle(
+            game="beens",
+            puzzle_key="p2",
+            size=6,
+            definition={"regions": QUEENS_REGIONS},
+            solution=queens_grid([1, 3, 5, 0, 2, 4]),
+            unique_solution=False,
+        )
+        assert verify_solution(puzzle, queens_grid([4, 2, 0, 5, 3, 1]))
+        # touching queens in rows 0/1
+        assert not verify_solution(puzzle, queens_grid([0, 1, 3, 5, 2, 4]))
+
+    def test_tango_links_and_givens_are_checked(self):
+        definition = {
+            "givens": {"0,0": "sun"},
+            "links": [
+                {"a": {"row": 0, "col": 0}, "b": {"row": 0, "col": 1}, "kind": "diff"}
+            ],
+        }
+        puzzle = build_puzzle(
+            game="bango",
+            puzzle_key="p3",
+            size=6,
+            definition=definition,
+            solution=TANGO_SOLUTION,
+            unique_solution=False,
+        )
+        assert verify_solution(puzzle, TANGO_SOLUTION)
+
+        # still a valid board, but a different one that passes the links...
+        mirrored = [row[::-1] for row in TANGO_SOLUTION]
+        assert verify_solution(puzzle, mirrored)
+        # ...whereas flipping every symbol breaks the "sun" given.
+        flipped = [["moon" if v == "sun" else "sun" for v in row] for row in TANGO_SOLUTION]
+        assert not verify_solution(puzzle, flipped)
+
+    def test_zip_path_must_respect_walls_and_waypoints(self):
+        path = serpentine_path()
+        definition = {
+            "walls": [{"row": 1, "col": 0, "side": "top"}],
+            "waypoints": [path[0], path[17], path[-1]],
+        }
+        puzzle = build_puzzle(
+            game="bip",
+            puzzle_key="p4",
+            size=6,
+            definition=definition,
+            solution=path,
+            unique_solution=False,
+        )
+        assert verify_solution(puzzle, path)
+        assert not verify_solution(puzzle, path[::-1])
+
+    def test_invalid_reference_solution_is_rejected(self):
+        with self.assertRaises(SolutionFormatError):
+            build_puzzle(
+                game="beens",
+                puzzle_key="bad",
+                size=6,
+                definition={"regions": QUEENS_REGIONS},
+                solution=queens_grid([0, 1, 2, 3, 4, 5]),
+            )
+
+
+class VerifiedScoreEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        build_puzzle(
+            game="sudoku",
+            puzzle_key="2026-10-19",
+            size=9,
+            definition={"givens": {}},
+            solution=SUDOKU_SOLUTION,
+        ).save()
+
+    def _post(self, **overrides):
+        payload = {
+            "game": "sudoku",
+            "puzzle_key": "2026-10-19",
+            "solve_ms": 90_000,
+            "solution": SUDOKU_SOLUTION,
+        }
+        payload.update(overrides)
+        return self.client.post("/api/games/scores/", payload, format="json")
+
+    def test_correct_solution_is_recorded(self):
+        assert self._post().status_code == 201
+        assert Score.objects.count() == 1
+
+    def test_wrong_solution_is_rejected(self):
+        wrong = copy.deepcopy(SUDOKU_SOLUTION)
+        wrong[8][8] = wrong[8][7]
+        resp = self._post(solution=wrong)
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "solution_rejected"
+        assert Score.objects.count() == 0
+
+    def test_unknown_puzzle_is_404(self):
+        resp = self._post(puzzle_key="1999-01-01")
+        assert resp.status_code == 404
+        assert resp.json()["error"]["code"] == "puzzle_not_found"
@@ -0,0 +1,23 @@
+from django.urls import path
+
+from .views import (
+    GameSaveView,
+    ScoreBatchCreateView,
+    ScoreCreateView,
+    SolveTimePercentileView,
+)
+
+urlpatterns = [
+    path("games/scores/", ScoreCreateView.as_view(), name="games-scores-create"),
+    path(
+        "games/scores/batch/",
+        ScoreBatchCreateView.as_view(),
+        name="games-scores-batch",
+    ),
+    path("games/saves/<str:game>/", GameSaveView.as_view(), name="games-saves"),
+    path(
+        "games/<str:game>/percentile/",
+        SolveTimePercentileView.as_view(),
+        name="games-percentile",
+    ),
+]
@@ -1,2 +1,471 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from rest_framework import status
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
 
-# Create your views here.
+from api.idempotency import idempotent
+from api.responses import error_response
+
+from .histograms import GAME_WIDE, estimate_faster_than, record_solve_times
+from .models import Game, GameSave, Puzzle, Score, SolveTimeHistogram
+from .savestate import (
+    SaveStateError,
+    apply_moves,
+    board_to_state,
+    check_packed_moves,
+    move_count,
+    pack_moves,
+    pack_state,
+    state_to_board,
+    unpack_state,
+)
+from .serializers import (
+    GameSavePatchSerializer,
+    GameSavePutSerializer,
+    PercentileQuerySerializer,
+    ScoreBatchItemSerializer,
+    ScoreCreateSerializer,
+)
+from .solutions import verify_solution
+
+# Enough for a long offline session; keeps one batch to one short transaction.
+MAX_BATCH_SIZE = 100
+
+VERIFY_FIELDS = ("game", "puzzle_key", "size", "solution_digest", "unique_solution")
+
+# Fold the delta log into the snapshot once it holds this many moves.
+COMPACT_AFTER_MOVES = 64
+
+
+def _unknown_game(game: str):
+    return error_response(
+        code="not_found", message=f"Unknown game '{game}'.", status=404
+    )
+
+
+@method_decorator(idempotent, name="dispatch")
+class ScoreCreateView(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "scores"
+
+    def post(self, request):
+        serializer = ScoreCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        game = data["game"]
+        puzzle_key = (data.get("puzzle_key") or "").strip()
+        solve_ms = data["solve_ms"]
+        # by id: token-authenticated users are not model instances
+        user_id = request.user.pk if request.user.is_authenticated else None
+
+        # Free play (no puzzle_key) is client-generated and can't be verified;
+        # bank/daily puzzles must come with a solution matching the digest.
+        if puzzle_key:
+            puzzle = (
+                Puzzle.objects.filter(game=game, puzzle_key=puzzle_key)
+                .only(*VERIFY_FIELDS)
+                .first()
+            )
+            if puzzle is None:
+                return error_response(
+                    code="puzzle_not_found",
+                    message=f"Unknown puzzle '{puzzle_key}'.",
+                    status=404,
+                )
+            if not verify_solution(puzzle, data.get("solution")):
+                return error_response(
+                    code="solution_rejected",
+                    message="Submitted solution does not solve this puzzle.",
+                )
+
+        with transaction.atomic():
+            Score.objects.create(
+                user_id=user_id,
+                game=game,
+                puzzle_key=puzzle_key,
+                solve_ms=solve_ms,
+            )
+            histograms = record_solve_times([(game, puzzle_key, solve_ms)])
+
+        histogram = histograms[(game, puzzle_key or GAME_WIDE)]
+        return Response(
+            {
+                "status": "ok",
+                "faster_than_pct": estimate_faster_than(histogram.counts, solve_ms),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+def _existing_client_ids(client_ids: list) -> set:
+    return set(
+        Score.objects.filter(client_id__in=client_ids).values_list(
+            "client_id", flat=True
+        )
+    )
+
+
+def _insert_scores(scores: list[Score]) -> list[Score]:
+    """
+    Insert `scores` and return the ones actually written. A concurrent sync of
+    the same client_ids makes the bulk insert fail; then each row is retried
+    in its own savepoint and the ones that conflict are left out.
+    """
+    try:
+        with transaction.atomic():
+            return Score.objects.bulk_create(scores)
+    except IntegrityError:
+        pass
+    inserted = []
+    for score in scores:
+        score.pk = None
+        try:
+            with transaction.atomic():
+                score.save(force_insert=True)
+        except IntegrityError:
+            continue
+        inserted.append(score)
+    return inserted
+
+
+@method_decorator(idempotent, name="dispatch")
+class ScoreBatchCreateView(APIView):
+    """
+    Offline sync: many solves in one request, idempotent on `client_id`.
+
+    The batch costs one puzzle lookup, one existing-id lookup, one
+    `bulk_create` and one histogram write per touched game/puzzle, however many
+    items it carries. Each item gets its own result; one bad item does not
+    fail the rest.
+    """
+
+    permission_classes = [AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "scores"
+
+    def post(self, request):
+        items = request.data.get("scores") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return error_response(
+                code="invalid_batch",
+                message="Expected a non-empty 'scores' array.",
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return error_response(
+                code="batch_too_large",
+                message=f"At most {MAX_BATCH_SIZE} scores per batch.",
+                status=413,
+            )
+
+        results: list[dict] = []
+        valid: list[tuple[int, dict]] = []
+        for item in items:
+            serializer = ScoreBatchItemSerializer(data=item)
+            client_id = item.get("client_id") if isinstance(item, dict) else None
+            results.append({"client_id": client_id, "status": "rejected"})
+            if not serializer.is_valid():
+                results[-1]["error"] = {
+                    "code": "invalid",
+                    "message": "Invalid score.",
+                    "details": serializer.errors,
+                }
+                continue
+            data = serializer.validated_data
+            data["puzzle_key"] = (data.get("puzzle_key") or "").strip()
+            valid.append((len(results) - 1, data))
+
+        puzzle_keys = {
+            (data["game"], data["puzzle_key"]) for _, data in valid if data["puzzle_key"]
+        }
+        puzzles = {}
+        if puzzle_keys:
+            candidates = Puzzle.objects.filter(
+                game__in={g for g, _ in puzzle_keys},
+                puzzle_key__in={k for _, k in puzzle_keys},
+            ).only(*VERIFY_FIELDS)
+            puzzles = {(p.game, p.puzzle_key): p for p in candidates}
+
+        existing = _existing_client_ids([d["client_id"] for _, d in valid])
+
+        user_id = request.user.pk if request.user.is_authenticated else None
+        to_create: list[tuple[int, Score]] = []
+        for index, data in valid:
+            result = results[index]
+            result["client_id"] = str(data["client_id"])
+
+            if data["client_id"] in existing:
+                result["status"] = "duplicate"
+                continue
+
+            if data["puzzle_key"]:
+                puzzle = puzzles.get((data["game"], data["puzzle_key"]))
+                if puzzle is None:
+                    result["error"] = {
+                        "code": "puzzle_not_found",
+                        "message": f"Unknown puzzle '{data['puzzle_key']}'.",
+                    }
+                    continue
+                if not verify_solution(puzzle, data.get("solution")):
+                    result["error"] = {
+                        "code": "solution_rejected",
+                        "message": "Submitted solution does not solve this puzzle.",
+                    }
+                    continue
+
+            # repeats inside the same batch count as duplicates too
+            existing.add(data["client_id"])
+            to_create.append(
+                (
+                    index,
+                    Score(
+                        user_id=user_id,
+                        game=data["game"],
+                        puzzle_key=data["puzzle_key"],
+                        solve_ms=data["solve_ms"],
+                        client_id=data["client_id"],
+                    ),
+                )
+            )
+
+        histograms = {}
+        inserted: set = set()
+        if to_create:
+            with transaction.atomic():
+                scores = _insert_scores([score for _, score in to_create])
+                inserted = {s.client_id for s in scores}
+                histograms = record_solve_times(
+                    (s.game, s.puzzle_key, s.solve_ms) for s in scores
+                )
+
+        for index, score in to_create:
+            if score.client_id not in inserted:
+                # another device synced this id between our check and insert
+                results[index]["status"] = "duplicate"
+                continue
+            histogram = histograms[(score.game, score.puzzle_key or GAME_WIDE)]
+            results[index]["status"] = "created"
+            results[index]["faster_than_pct"] = estimate_faster_than(
+                histogram.counts, score.solve_ms
+            )
+
+        return Response({"results": results})
+
+
+class SolveTimePercentileView(APIView):
+    """Reads a single precomputed histogram row; never scans scores."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, game: str):
+        if game not in Game.values:
+            return _unknown_game(game)
+
+        serializer = PercentileQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return error_response(
+                code="invalid_query",
+                message="Invalid percentile query.",
+                details=serializer.errors,
+            )
+        puzzle_key = (serializer.validated_data.get("puzzle") or "").strip()
+        solve_ms = serializer.validated_data["solve_ms"]
+
+        row = (
+            SolveTimeHistogram.objects.filter(game=game, puzzle_key=puzzle_key)
+            .values("counts", "total")
+            .first()
+        )
+        counts = row["counts"] if row else []
+
+        return Response(
+            {
+                "game": game,
+                "puzzle_key": puzzle_key,
+                "solve_ms": solve_ms,
+                "total": row["total"] if row else 0,
+                "faster_than_pct": estimate_faster_than(counts, solve_ms),
+            }
+        )
+
+
+class OctetStreamParser(BaseParser):
+    media_type = "application/octet-stream"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read()
+
+
+def _version_conflict(current: int | None):
+    return error_response(
+        code="version_conflict",
+        message="Save was changed elsewhere; reload it and retry.",
+        status=409,
+        details={"version": current},
+    )
+
+
+def _if_match_version(request) -> int | None:
+    raw = request.headers.get("If-Match", "").removeprefix("W/").strip('"')
+    return int(raw) if raw.isdigit() else None
+
+
+class GameSaveView(APIView):
+    """
+    Server-side autosave for one in-progress board.
+
+    - PUT stores a full snapshot (new game / explicit resync). With a
+      `version` (body or `If-Match: n`) it only replaces that version;
+      without one (or `If-Match: *`) it creates or overwrites.
+    - PATCH appends small move deltas, as compact JSON
+      (`{"version": n, "moves": [[a, b], ...]}`) or as a binary body
+      (`application/octet-stream`, `If-Match: n`).
+    - Every versioned write is conditional; a stale version gets 409.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, OctetStreamParser]
+
+    def _key(self, request, game: str) -> dict:
+        puzzle_key = (request.query_params.get("puzzle") or "").strip()
+        return {"user_id": request.user.pk, "game": game, "puzzle_key": puzzle_key}
+
+    def _saves(self, request, game: str):
+        return GameSave.objects.filter(**self._key(request, game))
+
+    def _saved(self, version: int):
+        return Response({"version": version}, headers={"ETag": f'"{version}"'})
+
+    def get(self, request, game: str):
+        if game not in Game.values:
+            return _unknown_game(game)
+
+        save = self._saves(request, game).first()
+        if save is None:
+            return error_response(code="not_found", message="No save.", status=404)
+
+        state = apply_moves(
+            game, unpack_state(game, save.size, save.snapshot), save.deltas
+        )
+        return Response(
+            {
+                "game": game,
+                "puzzle_key": save.puzzle_key,
+                "size": save.size,
+                "puzzle": save.puzzle,
+                "board": state_to_board(game, save.size, state),
+                "version": save.version,
+            },
+            headers={"ETag": f'"{save.version}"'},
+        )
+
+    def put(self, request, game: str):
+        if game not in Game.values:
+            return _unknown_game(game)
+
+        serializer = GameSavePutSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                code="invalid_save",
+                message="Invalid save.",
+                details=serializer.errors,
+            )
+        data = serializer.validated_data
+        try:
+            state = board_to_state(game, data["size"], data["board"])
+        except SaveStateError as exc:
+            return error_response(code="invalid_save", message=str(exc))
+
+        fields = {
+            "size": data["size"],
+            "puzzle": data.get("puzzle") or {},
+            "snapshot": pack_state(game, state),
+            "deltas": b"",
+        }
+        saves = self._saves(request, game)
+        version = data.get("version", _if_match_version(request))
+        if version is not None:
+            updated = saves.filter(version=version).update(
+                **fields, version=version + 1, updated_at=timezone.now()
+            )
+            if not updated:
+                return _version_conflict(saves.values_list("version", flat=True).first())
+            return self._saved(version + 1)
+
+        if not saves.update(
+            **fields, version=F("version") + 1, updated_at=timezone.now()
+        ):
+            try:
+                with transaction.atomic():
+                    GameSave.objects.create(**self._key(request, game), **fields)
+            except IntegrityError:
+                # created concurrently by another device
+                saves.update(
+                    **fields, version=F("version") + 1, updated_at=timezone.now()
+                )
+
+        return self._saved(saves.values_list("version", flat=True).first())
+
+    def patch(self, request, game: str):
+        if game not in Game.values:
+            return _unknown_game(game)
+
+        saves = self._saves(request, game)
+        row = saves.values("pk", "size", "version", "snapshot", "deltas").first()
+        if row is None:
+            return error_response(code="not_found", message="No save.", status=404)
+
+        try:
+            if isinstance(request.data, bytes):
+                version = _if_match_version(request)
+                if version is None:
+                    return error_response(
+                        code="version_required",
+                        message="Binary deltas need an If-Match version.",
+                        status=428,
+                    )
+                moves = check_packed_moves(game, row["size"], request.data)
+            else:
+                serializer = GameSavePatchSerializer(data=request.data)
+                if not serializer.is_valid():
+                    return error_response(
+                        code="invalid_moves",
+                        message="Invalid moves.",
+                        details=serializer.errors,
+                    )
+                version = serializer.validated_data["version"]
+                moves = pack_moves(game, row["size"], serializer.validated_data["moves"])
+        except SaveStateError as exc:
+            return error_response(code="invalid_moves", message=str(exc))
+
+        if version != row["version"]:
+            return _version_conflict(row["version"])
+
+        fields = {"deltas": bytes(row["deltas"]) + moves}
+        if move_count(fields["deltas"]) >= COMPACT_AFTER_MOVES:
+            state = unpack_state(game, row["size"], row["snapshot"])
+            fields = {
+                "snapshot": pack_state(game, apply_moves(game, state, fields["deltas"])),
+                "deltas": b"",
+            }
+
+        updated = GameSave.objects.filter(pk=row["pk"], version=version).update(
+            **fields, version=version + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            return _version_conflict(saves.values_list("version", flat=True).first())
+        return self._saved(version + 1)
+
+    def delete(self, request, game: str):
+        if game not in Game.values:
+            return _unknown_game(game)
+
+        self._saves(request, game).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils import timezone
 
-from .models import Submission
+from .models import Notification, Submission
 
 
 @admin.action(description="Mark selected submissions as handled")
@@ -9,6 +9,11 @@ def mark_handled(modeladmin, request, queryset):
     queryset.update(is_handled=True, handled_at=timezone.now())
 
 
+@admin.action(description="Mark selected submissions as spam")
+def mark_spam(modeladmin, request, queryset):
+    queryset.update(is_spam=True, is_handled=True, handled_at=timezone.now())
+
+
 @admin.register(Submission)
 class SubmissionAdmin(admin.ModelAdmin):
     list_display = (
@@ -18,8 +23,26 @@ class SubmissionAdmin(admin.ModelAdmin):
         "email",
         "subject",
         "is_handled",
+        "is_spam",
+        "spam_score",
     )
-    list_filter = ("kind", "is_handled", "created_at")
+    list_filter = ("kind", "is_handled", "is_spam", "created_at")
     search_fields = ("name", "email", "subject", "message")
-    actions = [mark_handled]
+    actions = [mark_handled, mark_spam]
+    ordering = ("-created_at",)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "submission",
+        "channel",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("channel", "status")
+    readonly_fields = ("submission", "created_at", "sent_at", "last_error")
     ordering = ("-created_at",)
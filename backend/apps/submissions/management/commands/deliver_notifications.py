@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.submissions.notifications import claim, deliver
+
+
+class Command(BaseCommand):
+    help = (
+        "Outbox worker: deliver pending submission notifications (email over "
+        "one reused SMTP connection, webhooks) with exponential backoff. Safe "
+        "to run several copies: rows are claimed with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when nothing is due.",
+        )
+        parser.add_argument(
+            "--digest",
+            action="store_true",
+            help="Send each batch's emails as one digest message.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Drain what is due, then exit."
+        )
+
+    def handle(self, *args, **options) -> None:
+        connection = get_connection()
+        totals = [0, 0]
+        try:
+            while True:
+                close_old_connections()
+                rows = claim(options["batch_size"])
+                if not rows:
+                    # idle: don't hold the SMTP connection open between polls
+                    connection.close()
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                sent, failed = deliver(rows, connection, digest=options["digest"])
+                if failed:
+                    connection.close()  # start the next batch on a fresh one
+                totals[0] += sent
+                totals[1] += failed
+                if options["verbosity"] >= 2 or failed:
+                    self.stdout.write(f"batch: {sent} sent, {failed} failed")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Delivered {totals[0]}, failed {totals[1]}.")
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0002_alter_submission_email_alter_submission_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='is_spam',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='spam_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
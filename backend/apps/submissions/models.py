@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class Submission(models.Model):
@@ -28,6 +29,11 @@ class Submission(models.Model):
     is_handled = models.BooleanField(default=False)
     handled_at = models.DateTimeField(null=True, blank=True)
 
+    # spam pre-classifier (spam.py): its score at submit time, and the admin
+    # label it is trained on (handled and not spam = ham)
+    spam_score = models.FloatField(null=True, blank=True)
+    is_spam = models.BooleanField(default=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["ip_address", "-created_at"]),
@@ -37,3 +43,40 @@ class Submission(models.Model):
     def __str__(self) -> str:
         who = self.email or "(no email)"
         return f"{self.kind} from {who} @ {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class Notification(models.Model):
+    """
+    Transactional outbox row: written in the same transaction as its
+    Submission, delivered later by `manage.py deliver_notifications`.
+    """
+
+    class Channel(models.TextChoices):
+        EMAIL = "email", "Email"
+        WEBHOOK = "webhook", "Webhook"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    submission = models.ForeignKey(
+        Submission, on_delete=models.CASCADE, related_name="notifications"
+    )
+    channel = models.CharField(max_length=16, choices=Channel.choices)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # also the claim lease: a worker pushes it forward while delivering
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.channel} for submission {self.submission_id} ({self.status})"
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, Submission
+
+logger = logging.getLogger(__name__)
+
+# Outbox delivery. The submit view only inserts Notification rows (inside the
+# Submission's transaction); `deliver_notifications` claims due rows with
+# SELECT ... FOR UPDATE SKIP LOCKED, so several workers never claim the same
+# row, and leases them by pushing next_attempt_at forward before sending. A
+# crashed worker's rows become due again when the lease runs out.
+
+WEBHOOK_TIMEOUT_SECONDS = 10
+
+
+def enqueue_notifications(submission: Submission) -> list[Notification]:
+    """Call inside the transaction that created `submission`."""
+    channels = []
+    if settings.NOTIFY_EMAILS:
+        channels.append(Notification.Channel.EMAIL)
+    if settings.NOTIFY_WEBHOOK_URL:
+        channels.append(Notification.Channel.WEBHOOK)
+    return Notification.objects.bulk_create(
+        Notification(submission=submission, channel=channel) for channel in channels
+    )
+
+
+def backoff_seconds(attempts: int) -> int:
+    """Delay before retry number `attempts` (1-based): base * 2^(n-1), capped."""
+    base = settings.NOTIFY_BACKOFF_SECONDS
+    return min(base * 2 ** (attempts - 1), settings.NOTIFY_BACKOFF_MAX_SECONDS)
+
+
+def claim(batch_size: int) -> list[Notification]:
+    """Lease up to `batch_size` due notifications to this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("submission")
+            .filter(status=Notification.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if rows:
+            Notification.objects.filter(pk__in=[n.pk for n in rows]).update(
+                next_attempt_at=now + timedelta(seconds=settings.NOTIFY_LEASE_SECONDS)
+            )
+    return rows
+
+
+def mark_sent(rows: list[Notification]) -> None:
+    Notification.objects.filter(pk__in=[n.pk for n in rows]).update(
+        status=Notification.Status.SENT, sent_at=timezone.now(), last_error=""
+    )
+
+
+def mark_failed(row: Notification, error: str) -> None:
+    """Schedule a retry with backoff, or give up after NOTIFY_MAX_ATTEMPTS."""
+    attempts = row.attempts + 1
+    update = {"attempts": attempts, "last_error": error[:1000]}
+    if attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+        update["status"] = Notification.Status.FAILED
+        logger.error("Giving up on notification %s: %s", row.pk, error)
+    else:
+        update["next_attempt_at"] = timezone.now() + timedelta(
+            seconds=backoff_seconds(attempts)
+        )
+    Notification.objects.filter(pk=row.pk).update(**update)
+
+
+# ---------------- Payloads ----------------
+
+
+def _summary(submission: Submission) -> str:
+    who = submission.name or "(no name)"
+    if submission.email:
+        who += f" <{submission.email}>"
+    return (
+        f"{submission.get_kind_display()} from {who}\n"
+        f"Subject: {submission.subject or '(none)'}\n"
+        f"Page: {submission.page_url or '(none)'}\n\n"
+        f"{submission.message}\n"
+    )
+
+
+def submission_email(submission: Submission) -> EmailMessage:
+    subject = submission.subject or submission.message[:60]
+    return EmailMessage(
+        subject=f"[{submission.kind}] {subject}",
+        body=_summary(submission),
+        to=settings.NOTIFY_EMAILS,
+        reply_to=[submission.email] if submission.email else None,
+    )
+
+
+def digest_email(submissions: list[Submission]) -> EmailMessage:
+    separator = "\n" + "-" * 40 + "\n\n"
+    return EmailMessage(
+        subject=f"{len(submissions)} new submissions",
+        body=separator.join(_summary(s) for s in submissions),
+        to=settings.NOTIFY_EMAILS,
+    )
+
+
+def webhook_payload(submission: Submission) -> dict:
+    return {
+        "id": submission.pk,
+        "kind": submission.kind,
+        "name": submission.name,
+        "email": submission.email,
+        "subject": submission.subject,
+        "message": submission.message,
+        "page_url": submission.page_url,
+        "created_at": submission.created_at.isoformat(),
+    }
+
+
+def post_webhook(url: str, payload: dict) -> None:
+    # Imported here, like verify_turnstile: only the worker needs urllib.
+    import urllib.request
+
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=WEBHOOK_TIMEOUT_SECONDS) as resp:
+        resp.read()
+
+
+# ---------------- Delivery ----------------
+
+
+def deliver(
+    rows: list[Notification], connection, *, digest: bool = False
+) -> tuple[int, int]:
+    """
+    Deliver claimed rows over the mail `connection` (opened here if needed,
+    then reused for every message). Returns (sent, failed) row counts.
+    """
+    sent: list[Notification] = []
+    failed = 0
+    emails = [n for n in rows if n.channel == Notification.Channel.EMAIL]
+    webhooks = [n for n in rows if n.channel == Notification.Channel.WEBHOOK]
+
+    if emails:
+        try:
+            connection.open()
+        except Exception as exc:  # SMTP down: back off, webhooks still go out
+            for n in emails:
+                mark_failed(n, repr(exc))
+            failed += len(emails)
+            emails = []
+
+    if digest and len(emails) > 1:
+        try:
+            connection.send_messages([digest_email([n.submission for n in emails])])
+            sent.extend(emails)
+        except Exception as exc:
+            for n in emails:
+                mark_failed(n, repr(exc))
+            failed += len(emails)
+        emails = []
+
+    for n in emails:
+        try:
+            connection.send_messages([submission_email(n.submission)])
+            sent.append(n)
+        except Exception as exc:
+            mark_failed(n, repr(exc))
+            failed += 1
+
+    for n in webhooks:
+        try:
+            post_webhook(settings.NOTIFY_WEBHOOK_URL, webhook_payload(n.submission))
+            sent.append(n)
+        except Exception as exc:
+            mark_failed(n, repr(exc))
+            failed += 1
+
+    mark_sent(sent)
+    return len(sent), failed
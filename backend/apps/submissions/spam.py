@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Hashed-token naive Bayes. Features (words, link domains, sender domain) are
+# hashed into a fixed number of buckets. The model is one float32 log-odds
+# weight per bucket plus a prior, so scoring is a set of crc32s and a sum,
+# with no vocabulary kept in memory.
+#
+# File layout (little-endian): MAGIC, n_buckets (uint32), prior (float32),
+# then n_buckets float32 weights. `train_spam_model` writes it atomically;
+# workers pick up a new file within SPAM_MODEL_CHECK_SECONDS.
+MAGIC = b"NBS1"
+HEADER = struct.Struct("<4sIf")
+DEFAULT_BUCKETS = 1 << 18
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9'_-]{1,30}")
+URL_RE = re.compile(r"https?://[^\s<>\"']+", re.IGNORECASE)
+
+
+class SpamModelError(Exception):
+    pass
+
+
+def features(
+    *, subject: str = "", message: str = "", email: str = "", name: str = ""
+) -> set[str]:
+    text = f"{subject}\n{message}".lower()
+    feats = set(TOKEN_RE.findall(text))
+
+    urls = URL_RE.findall(text)
+    feats.update(f"url:{urlsplit(url).hostname or ''}" for url in urls)
+    feats.add(f"urls:{min(len(urls), 3)}")
+
+    if "@" in email:
+        feats.add(f"from:{email.rsplit('@', 1)[1].lower()}")
+    feats.update(f"name:{token}" for token in TOKEN_RE.findall(name.lower()))
+    return feats
+
+
+def _bucket(feature: str, n_buckets: int) -> int:
+    return zlib.crc32(feature.encode()) % n_buckets
+
+
+class SpamModel:
+    def __init__(self, weights: array, prior: float) -> None:
+        self.weights = weights
+        self.prior = prior
+
+    @property
+    def n_buckets(self) -> int:
+        return len(self.weights)
+
+    def score(self, feats: Iterable[str]) -> float:
+        """P(spam) for a feature set."""
+        weights, n = self.weights, len(self.weights)
+        logit = self.prior + sum(weights[_bucket(f, n)] for f in feats)
+        return 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, logit))))
+
+    @classmethod
+    def train(
+        cls,
+        docs: Iterable[tuple[set[str], bool]],
+        n_buckets: int = DEFAULT_BUCKETS,
+        alpha: float = 1.0,
+    ) -> SpamModel:
+        """Bernoulli-style NB over bucket presence, Laplace-smoothed."""
+        spam_counts = [0] * n_buckets
+        ham_counts = [0] * n_buckets
+        n_spam = n_ham = 0
+        for feats, is_spam in docs:
+            counts = spam_counts if is_spam else ham_counts
+            for b in {_bucket(f, n_buckets) for f in feats}:
+                counts[b] += 1
+            if is_spam:
+                n_spam += 1
+            else:
+                n_ham += 1
+        if not n_spam or not n_ham:
+            raise SpamModelError("Need at least one spam and one ham example.")
+
+        spam_total = math.log(n_spam + 2 * alpha)
+        ham_total = math.log(n_ham + 2 * alpha)
+        weights = array("f", bytes(4 * n_buckets))
+        for b in range(n_buckets):
+            s, h = spam_counts[b], ham_counts[b]
+            if s or h:  # unseen buckets stay neutral
+                weights[b] = (math.log(s + alpha) - spam_total) - (
+                    math.log(h + alpha) - ham_total
+                )
+        return cls(weights, math.log(n_spam / n_ham))
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.n_buckets, self.prior))
+            self.weights.tofile(f)
+        os.replace(tmp, path)  # readers never see a partial file
+
+    @classmethod
+    def load(cls, path: str) -> SpamModel:
+        with open(path, "rb") as f:
+            magic, n_buckets, prior = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise SpamModelError(f"{path} is not a spam model.")
+            weights = array("f")
+            weights.fromfile(f, n_buckets)
+        return cls(weights, prior)
+
+
+class SpamClassifier:
+    """
+    The current model for this worker, re-read from SPAM_MODEL_PATH when the
+    file changes (checked at most every SPAM_MODEL_CHECK_SECONDS).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._model: SpamModel | None = None
+        self._mtime: float | None = None
+        self._checked_at = float("-inf")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._model = None
+            self._mtime = None
+            self._checked_at = float("-inf")
+
+    def _refresh(self) -> None:
+        path = settings.SPAM_MODEL_PATH
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._model, self._mtime = None, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            self._model = SpamModel.load(path)
+        except (OSError, SpamModelError, struct.error, EOFError):
+            logger.warning("Could not load spam model from %s", path, exc_info=True)
+        self._mtime = mtime
+
+    def model(self) -> SpamModel | None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at >= settings.SPAM_MODEL_CHECK_SECONDS:
+                self._checked_at = now
+                self._refresh()
+            return self._model
+
+    def score(self, **fields: str) -> float | None:
+        """P(spam) for a submission's fields, or None without a model."""
+        model = self.model()
+        return None if model is None else model.score(features(**fields))
+
+
+spam_classifier = SpamClassifier()
@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.submissions.models import Notification, Submission
+from apps.submissions.notifications import backoff_seconds, claim
+
+
+def _submission(message="Hello there"):
+    return Submission.objects.create(
+        kind="contact", name="Ada", email="ada@example.com", message=message
+    )
+
+
+@override_settings(
+    TURNSTILE_ENABLED=True,
+    TURNSTILE_CONFIGURED=True,
+    TURNSTILE_SECRET_KEY="test-secret",
+    NOTIFY_EMAILS=["me@example.com"],
+    NOTIFY_WEBHOOK_URL="https://hooks.example/notify",
+    NOTIFY_BACKOFF_SECONDS=30,
+    NOTIFY_BACKOFF_MAX_SECONDS=600,
+    NOTIFY_MAX_ATTEMPTS=3,
+)
+class NotificationOutboxTests(TestCase):
+    def _enqueue(self, submission, channels=("email", "webhook")):
+        for channel in channels:
+            Notification.objects.create(submission=submission, channel=channel)
+
+    def _post(self):
+        with patch("apps.submissions.views.verify_turnstile") as verify:
+            verify.return_value = type("R", (), {"success": True, "error_codes": []})()
+            return APIClient().post(
+                "/api/submissions/",
+                {"kind": "feedback", "message": "Nice site", "turnstile_token": "t"},
+                format="json",
+                REMOTE_ADDR="9.9.9.9",
+            )
+
+    def _deliver(self, *args):
+        call_command("deliver_notifications", "--once", *args, stdout=StringIO())
+
+    def test_submit_writes_outbox_rows_in_request(self):
+        resp = self._post()
+
+        assert resp.status_code == 201
+        channels = set(Notification.objects.values_list("channel", flat=True))
+        assert channels == {"email", "webhook"}
+        assert len(mail.outbox) == 0  # nothing is sent inline
+
+    @override_settings(NOTIFY_EMAILS=[], NOTIFY_WEBHOOK_URL="")
+    def test_no_channels_configured_writes_nothing(self):
+        self._post()
+
+        assert Submission.objects.count() == 1
+        assert Notification.objects.count() == 0
+
+    @patch("apps.submissions.notifications.post_webhook")
+    def test_worker_delivers_and_marks_sent(self, post_webhook):
+        self._enqueue(_submission())
+
+        self._deliver()
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["me@example.com"]
+        assert mail.outbox[0].reply_to == ["ada@example.com"]
+        post_webhook.assert_called_once()
+        assert post_webhook.call_args.args[1]["message"] == "Hello there"
+        assert set(Notification.objects.values_list("status", flat=True)) == {"sent"}
+
+    def test_digest_mode_sends_one_email(self):
+        for i in range(3):
+            self._enqueue(_submission(f"Message {i}"), channels=["email"])
+
+        self._deliver("--digest")
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].subject == "3 new submissions"
+        assert "Message 2" in mail.outbox[0].body
+        assert Notification.objects.filter(status="sent").count() == 3
+
+    @patch(
+        "apps.submissions.notifications.post_webhook",
+        side_effect=OSError("connection refused"),
+    )
+    def test_failures_back_off_then_give_up(self, _post_webhook):
+        self._enqueue(_submission(), channels=["webhook"])
+        row = Notification.objects.get()
+
+        self._deliver()
+
+        row.refresh_from_db()
+        assert (row.status, row.attempts) == ("pending", 1)
+        assert "connection refused" in row.last_error
+        delay = row.next_attempt_at - timezone.now()
+        assert timedelta(seconds=25) < delay <= timedelta(seconds=30)
+
+        for _ in range(2):
+            Notification.objects.update(next_attempt_at=timezone.now())
+            self._deliver()
+
+        row.refresh_from_db()
+        assert (row.status, row.attempts) == ("failed", 3)
+
+    @patch("apps.submissions.notifications.post_webhook")
+    def test_smtp_outage_backs_off_email_rows_only(self, post_webhook):
+        self._enqueue(_submission())
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=OSError("SMTP unreachable"),
+        ):
+            self._deliver()
+
+        email = Notification.objects.get(channel="email")
+        assert (email.status, email.attempts) == ("pending", 1)
+        assert "SMTP unreachable" in email.last_error
+        # backed off, not left leased
+        assert email.next_attempt_at - timezone.now() <= timedelta(seconds=30)
+        post_webhook.assert_called_once()
+        assert Notification.objects.get(channel="webhook").status == "sent"
+        assert len(mail.outbox) == 0
+
+    def test_claimed_rows_are_leased(self):
+        self._enqueue(_submission())
+
+        assert len(claim(10)) == 2
+        assert claim(10) == []
+
+    def test_backoff_is_exponential_and_capped(self):
+        assert [backoff_seconds(n) for n in range(1, 7)] == [
+            30,
+            60,
+            120,
+            240,
+            480,
+            600,
+        ]
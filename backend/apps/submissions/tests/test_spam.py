@@ -0,0 +1,127 @@
+import os
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.submissions.models import Submission
+from apps.submissions.spam import SpamModel, features, spam_classifier
+
+SPAM = [
+    "Cheap viagra casino bonus, click https://spam.example/win now",
+    "Buy followers and SEO backlinks cheap https://seo.example/offer",
+    "Crypto casino bonus: claim free spins https://spam.example/spins",
+]
+HAM = [
+    "Loved your sudoku game, the daily puzzle was tricky today",
+    "Hi, I would like to talk about a Django contract role",
+    "Small bug: the percentile chart overlaps on mobile",
+]
+
+
+def _docs():
+    return [(features(message=m), True) for m in SPAM] + [
+        (features(message=m), False) for m in HAM
+    ]
+
+
+class SpamModelTests(TestCase):
+    def test_scores_separate_spam_from_ham(self):
+        model = SpamModel.train(_docs(), n_buckets=1 << 12)
+
+        spam = model.score(features(message="casino bonus https://spam.example/x"))
+        ham = model.score(features(message="the daily sudoku puzzle on mobile"))
+
+        assert spam > 0.9
+        assert ham < 0.1
+
+    def test_save_load_round_trip(self):
+        model = SpamModel.train(_docs(), n_buckets=1 << 12)
+        feats = features(message=SPAM[0])
+
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bin")
+            model.save(path)
+            loaded = SpamModel.load(path)
+
+        assert loaded.n_buckets == 1 << 12
+        assert abs(loaded.score(feats) - model.score(feats)) < 1e-6
+
+    def test_train_command_uses_admin_labels(self):
+        for message in SPAM:
+            Submission.objects.create(kind="feedback", message=message, is_spam=True)
+        for message in HAM:
+            Submission.objects.create(kind="feedback", message=message, is_handled=True)
+        Submission.objects.create(kind="feedback", message="unlabelled")
+
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bin")
+            out = StringIO()
+            call_command(
+                "train_spam_model", output=path, holdout=0, buckets=1024, stdout=out
+            )
+
+            assert "3 spam / 3 ham" in out.getvalue()
+            assert SpamModel.load(path).n_buckets == 1024
+
+
+@override_settings(
+    TURNSTILE_ENABLED=True,
+    TURNSTILE_CONFIGURED=True,
+    TURNSTILE_SECRET_KEY="test-secret",
+    SPAM_MODEL_CHECK_SECONDS=0,
+)
+class SpamPreClassifierViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = str(Path(tmp.name, "model.bin"))
+        overrides = override_settings(SPAM_MODEL_PATH=self.path)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        spam_classifier.clear()
+        self.addCleanup(spam_classifier.clear)
+
+    def _post(self, message, ip):
+        payload = {
+            "kind": "feedback",
+            "message": message,
+            "turnstile_token": "token",
+        }
+        return self.client.post(
+            "/api/submissions/", payload, format="json", REMOTE_ADDR=ip
+        )
+
+    @patch("apps.submissions.views.verify_turnstile")
+    def test_spam_is_rejected_before_turnstile(self, mock_verify):
+        mock_verify.return_value = type("R", (), {"success": True, "error_codes": []})()
+        SpamModel.train(_docs(), n_buckets=1 << 12).save(self.path)
+
+        resp = self._post("casino bonus https://spam.example/free", "1.1.1.1")
+
+        assert resp.status_code == 400
+        assert resp.data["detail"] == "SPAM_REJECTED"
+        mock_verify.assert_not_called()
+        assert Submission.objects.count() == 0
+
+        resp = self._post("the daily sudoku puzzle was tricky", "2.2.2.2")
+
+        assert resp.status_code == 201
+        assert Submission.objects.get().spam_score < 0.1
+
+    @patch("apps.submissions.views.verify_turnstile")
+    def test_model_is_hot_reloaded(self, mock_verify):
+        mock_verify.return_value = type("R", (), {"success": True, "error_codes": []})()
+
+        assert self._post("casino bonus", "1.1.1.1").status_code == 201
+
+        SpamModel.train(_docs(), n_buckets=1 << 12).save(self.path)
+        os.utime(self.path, (1, 1))  # distinct mtime even within one clock tick
+
+        resp = self._post("casino bonus https://spam.example/free", "2.2.2.2")
+        assert resp.status_code == 400
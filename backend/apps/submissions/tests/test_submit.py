@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
@@ -104,3 +105,96 @@ class TestSubmissions(TestCase):
             "/api/submissions/", payload, format="json", REMOTE_ADDR="1.2.3.4"
         )
         assert resp.status_code == 201
+
+
+@override_settings(
+    TURNSTILE_ENABLED=True,
+    TURNSTILE_CONFIGURED=True,
+    TURNSTILE_SECRET_KEY="test-secret",
+)
+class TestIdempotentSubmissions(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()  # replays and throttle counters
+        self.addCleanup(cache.clear)
+
+    def _post(self, key, message="Test message", **extra):
+        payload = {
+            "kind": "contact",
+            "name": "Carmelo",
+            "email": "carmelo@example.com",
+            "subject": "Hello",
+            "message": message,
+            "turnstile_token": "token",
+        }
+        return self.client.post(
+            "/api/submissions/",
+            payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+            REMOTE_ADDR="1.2.3.4",
+            **extra,
+        )
+
+    @patch("apps.submissions.views.verify_turnstile")
+    def test_retry_replays_first_response_without_queries(self, mock_verify):
+        mock_verify.return_value = type("R", (), {"success": True, "error_codes": []})()
+        first = self._post("retry-1")
+
+        with self.assertNumQueries(0):
+            retry = self._post("retry-1")
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.content == first.content
+        assert retry["Content-Type"] == "application/json"
+        assert retry["Idempotent-Replayed"] == "true"
+        assert mock_verify.call_count == 1
+        assert Submission.objects.count() == 1
+
+    @patch("apps.submissions.views.verify_turnstile")
+    def test_key_is_scoped_to_request_fingerprint(self, mock_verify):
+        mock_verify.return_value = type("R", (), {"success": True, "error_codes": []})()
+        self._post("shared-key")
+
+        resp = self._post("shared-key", message="Another message")
+
+        assert resp.status_code == 429  # processed (cooldown), not replayed
+        assert not resp.has_header("Idempotent-Replayed")
+
+    def test_invalid_key_is_rejected(self):
+        resp = self._post("x" * 256)
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "invalid_idempotency_key"
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0.1)
+    @patch("api.idempotency.cache.add", return_value=False)
+    def test_concurrent_duplicate_gives_up_after_waiting(self, _add):
+        resp = self._post("in-flight")
+
+        assert resp.status_code == 409
+        assert resp.json()["error"]["code"] == "idempotency_in_progress"
+        assert Submission.objects.count() == 0
+
+    @patch("apps.submissions.views.verify_turnstile")
+    def test_request_that_outlived_its_lock_leaves_the_new_holder_alone(
+        self, mock_verify
+    ):
+        locks = []
+        add = cache.add
+
+        def record_add(key, value, timeout=None):
+            if key.endswith(":lock"):
+                locks.append(key)
+            return add(key, value, timeout)
+
+        def slow_verify(*args, **kwargs):
+            cache.set(locks[0], "duplicate's token", 30)  # ours expired
+            return type("R", (), {"success": True, "error_codes": []})()
+
+        mock_verify.side_effect = slow_verify
+        with patch("api.idempotency.cache.add", side_effect=record_add):
+            resp = self._post("slow-1")
+
+        assert resp.status_code == 201
+        assert cache.get(locks[0]) == "duplicate's token"
@@ -5,7 +5,7 @@ import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 
-TURNSTILE_VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
+from django.conf import settings
 
 
 @dataclass(frozen=True)
@@ -24,7 +24,8 @@ def verify_turnstile(*, secret_key: str, token: str, remoteip: str | None) -> Tu
 
     data = urllib.parse.urlencode(form).encode("utf-8")
     req = urllib.request.Request(
-        TURNSTILE_VERIFY_URL,
+        # overridable so load tests can point it at a local stub
+        settings.TURNSTILE_VERIFY_URL,
         data=data,
         method="POST",
         headers={
@@ -2,15 +2,21 @@ from datetime import timedelta
 from hashlib import sha256
 
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 
+from api.idempotency import idempotent
+
 from .models import Submission
+from .notifications import enqueue_notifications
 from .serializers import SubmissionCreateSerializer
+from .spam import spam_classifier
 from .turnstile import verify_turnstile
 
 COOLDOWN_SECONDS = 60
@@ -29,6 +35,7 @@ def compute_content_hash(*, kind: str, email: str, subject: str, message: str) -
     return sha256(normalized.encode("utf-8")).hexdigest()
 
 
+@method_decorator(idempotent, name="dispatch")
 class SubmissionCreateView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
@@ -124,6 +131,16 @@ class SubmissionCreateView(APIView):
                 status=status.HTTP_409_CONFLICT,
             )
 
+        # 3) Spam pre-classifier: obvious junk never costs a Turnstile call.
+        spam_score = spam_classifier.score(
+            subject=subject, message=message, email=email, name=name
+        )
+        if spam_score is not None and spam_score >= settings.SPAM_REJECT_THRESHOLD:
+            return Response(
+                {"detail": "SPAM_REJECTED"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # Turnstile config comes from Django settings (source of truth).
         turnstile_enabled = getattr(settings, "TURNSTILE_ENABLED", True)
         turnstile_configured = getattr(settings, "TURNSTILE_CONFIGURED", False)
@@ -172,20 +189,24 @@ class SubmissionCreateView(APIView):
             captcha_verified = False
             captcha_error_codes = None
 
-        Submission.objects.create(
-            kind=kind,
-            name=name,
-            email=email,
-            subject=subject,
-            message=message,
-            page_url=(data.get("page_url") or "").strip(),
-            ip_address=remoteip if remoteip else None,
-            user_agent=(request.META.get("HTTP_USER_AGENT") or "")[:300],
-            captcha_provider=captcha_provider,
-            captcha_verified=captcha_verified,
-            captcha_error_codes=captcha_error_codes,
-            content_hash=content_hash,
-        )
+        with transaction.atomic():
+            submission = Submission.objects.create(
+                kind=kind,
+                name=name,
+                email=email,
+                subject=subject,
+                message=message,
+                page_url=(data.get("page_url") or "").strip(),
+                ip_address=remoteip if remoteip else None,
+                user_agent=(request.META.get("HTTP_USER_AGENT") or "")[:300],
+                captcha_provider=captcha_provider,
+                captcha_verified=captcha_verified,
+                captcha_error_codes=captcha_error_codes,
+                content_hash=content_hash,
+                spam_score=spam_score,
+            )
+            # outbox: delivered by `manage.py deliver_notifications`
+            enqueue_notifications(submission)
 
         return Response(
             {"status": "ok", "cooldown_seconds": COOLDOWN_SECONDS},
@@ -0,0 +1,638 @@
+"""
+HTTP load test for the API: throughput and tail latency per endpoint.
+
+Run from backend/:
+
+    python -m benchmarks.loadtest run --server gunicorn --output before.json
+    python -m benchmarks.loadtest run --server asgi --workers 2
+    python -m benchmarks.loadtest run --url http://127.0.0.1:8000 --scenario health
+    python -m benchmarks.loadtest compare before.json after.json --threshold 10
+
+`run` starts the server itself (gunicorn like the Dockerfile, or uvicorn on
+config.asgi) against a fresh migrated + seeded SQLite file, unless
+--database-url or --url says otherwise. Turnstile verification goes to a local
+stub, so submissions take the production code path without the network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# ---------------- Scenarios ----------------
+
+
+def _submission_body(n: int) -> bytes:
+    # unique content: the view dedupes identical messages for 10 minutes
+    return json.dumps(
+        {
+            "kind": "contact",
+            "name": f"Load Test {n}",
+            "email": f"loadtest{n}@example.com",
+            "subject": f"Load test message {n}",
+            "message": f"Hello, this is load test message number {n}.",
+            "turnstile_token": "loadtest",
+        }
+    ).encode()
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: Callable[[int], bytes] | None = None
+    # Submissions are limited to one per client IP per minute, so every request
+    # comes from a new connection on its own loopback address (127.x.y.z), as
+    # it would from a new visitor.
+    per_request_ip: bool = False
+
+
+SCENARIOS = {
+    s.name: s
+    for s in (
+        Scenario("health", "GET", "/api/health/"),
+        Scenario("projects", "GET", "/api/content/projects/"),
+        Scenario(
+            "submissions",
+            "POST",
+            "/api/submissions/",
+            body=_submission_body,
+            per_request_ip=True,
+        ),
+    )
+}
+
+# ---------------- HTTP/1.1 client ----------------
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reopened when the server closes it."""
+
+    def __init__(self, host: str, port: int, local_ip: str | None = None) -> None:
+        self.host = host
+        self.port = port
+        self.local_ip = local_ip
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def _open(self) -> None:
+        local_addr = (self.local_ip, 0) if self.local_ip else None
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, local_addr=local_addr
+        )
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(
+        self, method: str, path: str, body: bytes | None = None, *, close: bool = False
+    ) -> tuple[int, bytes]:
+        if self._writer is None:
+            await self._open()
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "User-Agent: loadtest",
+            "Accept: application/json",
+        ]
+        if body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        if close:
+            head.append("Connection: close")
+        self._writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + (body or b""))
+        try:
+            status, keep_alive, payload = await self._read_response()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as exc:
+            self.close()
+            raise HttpError(repr(exc)) from exc
+        if close or not keep_alive:
+            self.close()
+        return status, payload
+
+    async def _read_response(self) -> tuple[int, bool, bytes]:
+        reader = self._reader
+        raw = await reader.readuntil(b"\r\n\r\n")
+        status_line, *lines = raw.decode("latin-1").split("\r\n")
+        version, status = status_line.split(" ", 2)[:2]
+        headers = {}
+        for line in lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (
+            version == "HTTP/1.1" or connection == "keep-alive"
+        )
+        if "content-length" in headers:
+            payload = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            await reader.readuntil(b"\r\n")  # no trailers expected
+            payload = b"".join(chunks)
+        else:
+            payload = await reader.read()
+            keep_alive = False
+        return int(status), keep_alive, payload
+
+
+def _loopback_ips() -> Iterator[str]:
+    """Distinct 127.x.y.z addresses, from a random start so reruns don't collide."""
+    start = random.randrange(1 << 16, 1 << 23)
+    for n in count(start):
+        n %= 1 << 24
+        if n & 0xFF in (0, 255) or n < 1 << 8:
+            continue
+        yield f"127.{n >> 16 & 0xFF}.{n >> 8 & 0xFF}.{n & 0xFF}"
+
+
+def _can_bind_loopback_range() -> bool:
+    # Linux routes all of 127/8 to lo; macOS only has 127.0.0.1 by default.
+    with socket.socket() as sock:
+        try:
+            sock.bind(("127.0.0.2", 0))
+        except OSError:
+            return False
+    return True
+
+
+# ---------------- Load ----------------
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(
+    latencies_ms: list[float], statuses: Counter, errors: int, elapsed: float
+) -> dict:
+    latencies_ms = sorted(latencies_ms)
+    requests = len(latencies_ms)
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(latencies_ms[-1], 2) if latencies_ms else 0.0,
+        "errors": errors + sum(n for s, n in statuses.items() if s >= 500),
+        "statuses": {str(s): n for s, n in sorted(statuses.items())},
+    }
+
+
+async def run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    rate: float | None = None,
+    timeout: float = 10.0,
+    bind_ips: bool = True,
+) -> dict:
+    """
+    Closed loop by default: `concurrency` clients each send their next request
+    as soon as the previous one returns. With `rate` (requests/s) it is open
+    loop: requests are due on a fixed schedule and latency counts from when a
+    request was due, so a stalled server can't hide its queueing delay
+    (coordinated omission).
+    """
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    sequence = count()
+    slots = count()
+    ips = _loopback_ips() if scenario.per_request_ip and bind_ips else None
+
+    async def client() -> None:
+        nonlocal errors
+        conn = None if scenario.per_request_ip else Connection(host, port)
+        while True:
+            if rate:
+                due = started + next(slots) / rate
+                if due >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, due - loop.time()))
+            else:
+                due = loop.time()
+                if due >= deadline:
+                    break
+            n = next(sequence)
+            body = scenario.body(n) if scenario.body else None
+            if scenario.per_request_ip:
+                conn = Connection(host, port, next(ips) if ips else None)
+            try:
+                status, _ = await asyncio.wait_for(
+                    conn.request(
+                        scenario.method,
+                        scenario.path,
+                        body,
+                        close=scenario.per_request_ip,
+                    ),
+                    timeout,
+                )
+            except (HttpError, OSError, asyncio.TimeoutError):
+                conn.close()
+                status = None
+            if due < measure_from:
+                continue
+            if status is None:
+                errors += 1
+            else:
+                statuses[status] += 1
+                latencies.append((loop.time() - due) * 1000)
+        if conn is not None:
+            conn.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = min(loop.time(), deadline + timeout) - measure_from
+    return summarize(latencies, statuses, errors, elapsed)
+
+
+# ---------------- Local server ----------------
+
+
+class _TurnstileStub(BaseHTTPRequestHandler):
+    delay = 0.0
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.delay:
+            time.sleep(self.delay)
+        body = b'{"success": true, "error-codes": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def turnstile_stub(delay_ms: float = 0.0) -> Iterator[str]:
+    handler = type("Handler", (_TurnstileStub,), {"delay": delay_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/siteverify"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode: str, port: int, workers: int) -> list[str]:
+    if mode == "gunicorn":
+        # as in the Dockerfile (sync workers, --preload)
+        return [
+            sys.executable, "-m", "gunicorn", "config.wsgi:application",
+            "--preload", "--workers", str(workers),
+            "--bind", f"127.0.0.1:{port}",
+        ]  # fmt: skip
+    return [
+        sys.executable, "-m", "uvicorn", "config.asgi:application",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log",
+    ]  # fmt: skip
+
+
+def _wait_ready(proc: subprocess.Popen, base_url: str, timeout: float) -> None:
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with status {proc.returncode}.")
+        try:
+            with socket.create_connection((url.hostname, url.port), timeout=1) as s:
+                s.sendall(b"GET /api/health/ HTTP/1.0\r\nHost: 127.0.0.1\r\n\r\n")
+                if s.recv(64).split(b" ")[1:2] == [b"200"]:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server not ready after {timeout:.0f}s.")
+
+
+@contextlib.contextmanager
+def local_server(
+    mode: str,
+    *,
+    workers: int,
+    turnstile_url: str,
+    database_url: str | None = None,
+    env: dict[str, str] | None = None,
+) -> Iterator[str]:
+    if mode == "asgi":
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise SystemExit(
+                "ASGI mode needs uvicorn: pip install -r requirements.txt"
+            ) from None
+
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    server_env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "config.settings",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "loadtest"),
+        "DJANGO_DEBUG": "0",
+        "ALLOWED_HOSTS": "127.0.0.1,localhost",
+        "DATABASE_URL": database_url or f"sqlite:///{workdir / 'db.sqlite3'}",
+        "TURNSTILE_ENABLED": "1",
+        "TURNSTILE_SECRET_KEY": "loadtest",
+        "TURNSTILE_VERIFY_URL": turnstile_url,
+        "SPAM_MODEL_PATH": str(workdir / "spam_model.bin"),  # none: not scored
+        "PROFILE_DIR": str(workdir / "profiles"),
+        **(env or {}),
+    }
+    server_env.pop("DATABASE_REPLICA_URLS", None)
+
+    for command in (["migrate", "--verbosity", "0"], ["seed_projects"]):
+        subprocess.run(
+            [sys.executable, "manage.py", *command],
+            cwd=BACKEND_DIR,
+            env=server_env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    log_path = workdir / "server.log"
+    with open(log_path, "wb") as log:
+        proc = subprocess.Popen(
+            server_command(mode, port, workers),
+            cwd=BACKEND_DIR,
+            env=server_env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    failed = True
+    try:
+        _wait_ready(proc, base_url, timeout=60)
+        yield base_url
+        failed = False
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        if failed:
+            tail = log_path.read_text(errors="replace")[-3000:]
+            print(f"--- server log ({log_path}) ---\n{tail}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---------------- Results ----------------
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=BACKEND_DIR,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# higher is worse for all of these except rps
+COMPARED_METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Print the change of every metric, and return the regressions: any metric
+    more than `threshold` percent worse, or errors where the baseline had none.
+    """
+    regressions = []
+    print(f"vs baseline {baseline.get('commit')} (threshold {threshold:g}%):")
+    for key in ("server", "load"):
+        if baseline.get(key) != current.get(key):
+            print(f"  warning: {key} differs: {baseline.get(key)} vs {current.get(key)}")
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            print(f"  {name:<12} (not in baseline)")
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before[metric], now[metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if metric == "rps" else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric} {old:g} -> {new:g}")
+            print(
+                f"  {name:<12} {metric:<7} {old:10.2f} -> {new:10.2f} "
+                f"({change:+.1f}%){flag}"
+            )
+        if now["errors"] and not before["errors"]:
+            regressions.append(f"{name} errors 0 -> {now['errors']}")
+            print(f"  {name:<12} errors  0 -> {now['errors']}  REGRESSION")
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    server = results["server"]
+    load = results["load"]
+    mode = f"rate {load['rate']}/s" if load["rate"] else "closed loop"
+    print(
+        f"commit={results['commit']} python={results['python']} "
+        f"server={server['mode']} workers={server['workers']} "
+        f"concurrency={load['concurrency']} {mode}"
+    )
+    print(
+        f"  {'scenario':<12} {'requests':>9} {'rps':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}  statuses"
+    )
+    for name, r in results["scenarios"].items():
+        print(
+            f"  {name:<12} {r['requests']:>9} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} "
+            f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f} "
+            f"{r['errors']:>7}  {r['statuses']}"
+        )
+
+
+# ---------------- CLI ----------------
+
+
+def _run(args: argparse.Namespace) -> int:
+    names = args.scenarios or list(SCENARIOS)
+    bind_ips = _can_bind_loopback_range()
+    if "submissions" in names and not bind_ips:
+        print(
+            "warning: can't bind 127.0.0.2; submissions will mostly hit the "
+            "per-IP cooldown (429)",
+            file=sys.stderr,
+        )
+
+    async def drive(base_url: str) -> dict:
+        scenarios = {}
+        for name in names:
+            scenarios[name] = await run_scenario(
+                base_url,
+                SCENARIOS[name],
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                rate=args.rate,
+                timeout=args.timeout,
+                bind_ips=bind_ips,
+            )
+        return scenarios
+
+    with contextlib.ExitStack() as stack:
+        if args.url:
+            mode, base_url = "external", args.url.rstrip("/")
+        else:
+            mode = args.server
+            turnstile_url = stack.enter_context(
+                turnstile_stub(args.turnstile_delay_ms)
+            )
+            base_url = stack.enter_context(
+                local_server(
+                    mode,
+                    workers=args.workers,
+                    turnstile_url=turnstile_url,
+                    database_url=args.database_url,
+                )
+            )
+        scenarios = asyncio.run(drive(base_url))
+
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "server": {"mode": mode, "workers": None if args.url else args.workers},
+        "load": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "rate": args.rate,
+        },
+        "scenarios": scenarios,
+    }
+    print_results(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Wrote {args.output}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"regression: {line}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Load a server and report RPS/latency.")
+    run.add_argument("--server", choices=("gunicorn", "asgi"), default="gunicorn")
+    run.add_argument("--url", help="Load this running server instead.")
+    run.add_argument("--workers", type=int, default=2)
+    run.add_argument(
+        "--database-url", help="Instead of a fresh SQLite file (migrated + seeded)."
+    )
+    run.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        choices=list(SCENARIOS),
+        help="Repeatable; default: all.",
+    )
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--duration", type=float, default=10.0, help="Seconds each.")
+    run.add_argument("--warmup", type=float, default=2.0, help="Seconds, unmeasured.")
+    run.add_argument("--rate", type=float, help="Open loop: requests per second.")
+    run.add_argument("--timeout", type=float, default=10.0)
+    run.add_argument("--turnstile-delay-ms", type=float, default=0.0)
+    run.add_argument("--output", help="Write results as JSON here.")
+    run.add_argument("--baseline", help="Compare with this JSON; exit 1 on regression.")
+    run.add_argument("--threshold", type=float, default=10.0, help="Percent.")
+    run.set_defaults(func=_run)
+
+    cmp = commands.add_parser("compare", help="Diff two result files.")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="Percent.")
+    cmp.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "concurrency", 1) < 1:
+        parser.error("--concurrency must be at least 1.")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import asyncio
+from unittest import mock
+
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from benchmarks.loadtest import SCENARIOS, compare, percentile, run_scenario
+
+
+class LoadTestTests(SimpleTestCase):
+    def results(self, **metrics):
+        base = {"rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0}
+        return {"scenarios": {"health": {**base, **metrics, "errors": 0}}}
+
+    def test_nearest_rank_percentiles(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([7.0], 95), 7.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_compare_flags_changes_beyond_threshold(self):
+        baseline = self.results()
+        with mock.patch("builtins.print"):
+            self.assertEqual(compare(baseline, self.results(p99_ms=32.0), 10), [])
+            regressions = compare(
+                baseline, self.results(rps=80.0, p95_ms=25.0, p50_ms=5.0), 10
+            )
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("health rps"))
+        self.assertTrue(regressions[1].startswith("health p95_ms"))
+
+
+class LoadTestClientTests(LiveServerTestCase):
+    def test_closed_loop_against_live_server(self):
+        result = asyncio.run(
+            run_scenario(
+                self.live_server_url,
+                SCENARIOS["health"],
+                concurrency=2,
+                duration=0.3,
+            )
+        )
+
+        self.assertGreater(result["requests"], 0)
+        self.assertEqual(result["statuses"], {"200": result["requests"]})
+        self.assertEqual(result["errors"], 0)
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
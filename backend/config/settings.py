@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import sys
+import tempfile
 import dj_database_url
 from dotenv import load_dotenv
 
@@ -75,11 +76,27 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
     ],
+    # Bearer tokens first: verified from the signature alone (no session or
+    # user query). Sessions keep working for the admin and existing clients.
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "apps.accounts.authentication.SignedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
     "DEFAULT_THROTTLE_RATES": {
         "submissions": os.getenv("SUBMISSIONS_THROTTLE_RATE", "5/min"),
+        "scores": os.getenv("SCORES_THROTTLE_RATE", "30/min"),
+        "auth": os.getenv("AUTH_THROTTLE_RATE", "10/min"),
     },
 }
 
+# Signed API tokens (apps.accounts.tokens), in seconds
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "300"))
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", str(14 * 24 * 60 * 60)))
+TOKEN_REVOCATION_REFRESH_SECONDS = int(
+    os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "30")
+)
+
 
 # Application definition
 
@@ -100,18 +117,24 @@ INSTALLED_APPS = [
     "apps.content.apps.ContentConfig",
     "apps.games.apps.GamesConfig",
     "apps.analytics.apps.AnalyticsConfig",
+    "core.apps.CoreConfig",
 ]
 
 MIDDLEWARE = [
+    "api.logs.RequestLogMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.analytics.live.ActiveVisitorMiddleware",
+    "api.replicas.ReplicaPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -138,14 +161,38 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# DB_POOL=1 swaps per-worker persistent connections for a psycopg3 pool
+# (Django's built-in "pool" option; needs psycopg[pool]). Pooled connections
+# are returned on every request, so CONN_MAX_AGE must be 0. Sizes are per
+# worker process: the server-side total is workers * DB_POOL_MAX_SIZE.
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+DB_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+    # seconds
+    "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "5")),
+}
+CONN_MAX_AGE = 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "600"))
+
+
+def database_from_url(url: str) -> dict:
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=CONN_MAX_AGE,
+        conn_health_checks=True,
+        # sqlite URLs are handy for local replica testing; no sslmode there
+        ssl_require=not url.startswith("sqlite"),
+    )
+    if DB_POOL and config["ENGINE"] == "django.db.backends.postgresql":
+        # CONN_HEALTH_CHECKS also makes Django ping pooled connections on checkout
+        config.setdefault("OPTIONS", {})["pool"] = DB_POOL_OPTIONS
+    return config
+
+
 if DATABASE_URL:
-    DATABASES = {
-        "default": dj_database_url.parse(
-            DATABASE_URL,
-            conn_max_age=600,
-            ssl_require=True,
-        )
-    }
+    DATABASES = {"default": database_from_url(DATABASE_URL)}
 else:
     DATABASES = {
         "default": {
@@ -155,18 +202,144 @@ else:
             "PASSWORD": os.getenv("DB_PASSWORD"),
             "HOST": os.getenv("DB_HOST"),
             "PORT": os.getenv("DB_PORT"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
         }
     }
+    if DB_POOL:
+        DATABASES["default"]["OPTIONS"] = {"pool": DB_POOL_OPTIONS}
+
+# Read replicas (see api/replicas.py): comma-separated DATABASE_URL-style URLs,
+# exposed as aliases replica1..N. Safe reads go to a replica unless the client
+# wrote within REPLICA_PIN_SECONDS or the replica lags more than
+# REPLICA_MAX_LAG_SECONDS (re-checked every REPLICA_CHECK_INTERVAL seconds).
+REPLICA_DATABASES = []
+for i, url in enumerate(csv_env("DATABASE_REPLICA_URLS"), start=1):
+    DATABASES[f"replica{i}"] = database_from_url(url)
+    REPLICA_DATABASES.append(f"replica{i}")
+
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
 
 # Use an in-memory SQLite DB when running tests so `manage.py test` works
-# without needing Postgres env vars locally.
+# without needing Postgres env vars locally. `replica1` is only used by tests
+# that opt in (router tests); nothing routes to it by default.
 if "test" in sys.argv:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": ":memory:",
+        },
+        "replica1": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        },
+    }
+    REPLICA_DATABASES = []
+
+DATABASE_ROUTERS = ["api.replicas.ReplicaRouter"] if REPLICA_DATABASES else []
+
+# Logging (api/logs.py): JSON lines on stdout via a queue + listener thread,
+# so request threads never block on I/O. LOG_SAMPLE_RATES keeps a fraction of
+# INFO/DEBUG records per logger, e.g. "api.access=0.1"; warnings and errors
+# are always kept. Quiet under tests.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "CRITICAL" if IS_TESTING else "INFO")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "api.logs.RequestIdFilter"},
+        "sampling": {
+            "()": "api.logs.SamplingFilter",
+            "rates": os.getenv("LOG_SAMPLE_RATES", ""),
+        },
+    },
+    "handlers": {
+        "json": {
+            "()": "api.logs.QueueListenerHandler",
+            "level": LOG_LEVEL,
+            "filters": ["request_id", "sampling"],
+        },
+    },
+    "root": {"handlers": ["json"], "level": LOG_LEVEL},
+}
+
+# In-process content search (apps.content.search): how often a worker checks
+# the shared generation number for other workers' edits, and a full-rebuild
+# backstop for when the cache is per-process.
+SEARCH_REFRESH_SECONDS = float(os.getenv("SEARCH_REFRESH_SECONDS", "5"))
+SEARCH_MAX_AGE_SECONDS = float(os.getenv("SEARCH_MAX_AGE_SECONDS", "300"))
+
+# Submission spam pre-classifier (apps.submissions.spam), trained with
+# `manage.py train_spam_model`. No model file = no pre-classification.
+SPAM_MODEL_PATH = os.getenv("SPAM_MODEL_PATH", str(BASE_DIR / "spam_model.bin"))
+SPAM_REJECT_THRESHOLD = float(os.getenv("SPAM_REJECT_THRESHOLD", "0.99"))
+SPAM_MODEL_CHECK_SECONDS = float(os.getenv("SPAM_MODEL_CHECK_SECONDS", "10"))
+
+# Outgoing mail (Django's SMTP backend). For local testing point it at a
+# debugging server, e.g. `python -m aiosmtpd -n -l localhost:1025`.
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "0") == "1"
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+
+# Submission notifications (apps.submissions.notifications): outbox rows are
+# written only for configured channels. Retries back off exponentially from
+# NOTIFY_BACKOFF_SECONDS up to NOTIFY_BACKOFF_MAX_SECONDS.
+NOTIFY_EMAILS = [
+    e.strip() for e in os.getenv("NOTIFY_EMAILS", "").split(",") if e.strip()
+]
+NOTIFY_WEBHOOK_URL = os.getenv("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "8"))
+NOTIFY_BACKOFF_SECONDS = int(os.getenv("NOTIFY_BACKOFF_SECONDS", "30"))
+NOTIFY_BACKOFF_MAX_SECONDS = int(os.getenv("NOTIFY_BACKOFF_MAX_SECONDS", "3600"))
+NOTIFY_LEASE_SECONDS = int(os.getenv("NOTIFY_LEASE_SECONDS", "300"))
+
+# Cache: shared Redis when REDIS_URL is set (idempotency replays and DRF
+# throttle counters then hold across workers), per-process memory otherwise.
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
         }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10_000},
+        }
+    }
+
+# Idempotency-Key replays (api/idempotency.py), in seconds
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "30"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "5"))
+
+# On-demand request profiling (api/profiling.py). Profiles are written to
+# PROFILE_DIR (newest PROFILE_MAX_FILES kept) and listed at /admin/profiles/.
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "profiles")
+)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "2"))
+PROFILE_TOKEN_MAX_AGE = int(os.getenv("PROFILE_TOKEN_MAX_AGE", "3600"))
+
+# Live stats stream (apps.analytics.live, ASGI only): one shared snapshot per
+# process every LIVE_STATS_TICK_SECONDS, built from a ring of the last
+# LIVE_STATS_RING_SIZE solves/submissions.
+LIVE_STATS_TICK_SECONDS = float(os.getenv("LIVE_STATS_TICK_SECONDS", "2"))
+LIVE_STATS_PING_SECONDS = float(os.getenv("LIVE_STATS_PING_SECONDS", "15"))
+LIVE_STATS_RING_SIZE = int(os.getenv("LIVE_STATS_RING_SIZE", "4096"))
+LIVE_STATS_MAX_CONNECTIONS = int(os.getenv("LIVE_STATS_MAX_CONNECTIONS", "500"))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
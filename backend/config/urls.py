@@ -1,9 +1,25 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from api.batch import batch
+from core.admin import profile_download, profile_list
+
 urlpatterns = [
+    path(
+        "admin/profiles/",
+        admin.site.admin_view(profile_list),
+        name="admin-profiles",
+    ),
+    path(
+        "admin/profiles/<str:filename>",
+        admin.site.admin_view(profile_download),
+        name="admin-profile-download",
+    ),
     path("admin/", admin.site.urls),
+    path("api/batch/", batch),
+    path("api/", include("apps.accounts.urls")),
     path("api/", include("apps.analytics.urls")),
     path("api/", include("apps.content.urls")),
+    path("api/", include("apps.games.urls")),
     path("api/", include("apps.submissions.urls")),
 ]
@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf (and with it every view, DRF, ...) now rather than on the
+# first request each worker serves; with `gunicorn --preload` this happens
+# once in the master before forking.
+get_resolver().url_patterns
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+
+from api.profiling import list_profiles, profile_file
+
+# Profiles (api/profiling.py) are files, not models, so they get plain admin
+# views (wrapped in admin.site.admin_view in config/urls.py: staff only).
+
+
+def profile_list(request):
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "profiles": list_profiles(),
+    }
+    return TemplateResponse(request, "admin/core/profiles.html", context)
+
+
+def profile_download(request, filename):
+    path = profile_file(filename)
+    if path is None:
+        raise Http404("No such profile.")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=filename)
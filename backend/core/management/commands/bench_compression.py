@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from hashlib import md5
+
+from django.core.management.base import BaseCommand
+
+from api.compression import brotli
+
+
+def _payload(projects: int) -> bytes:
+    # Shaped like /api/content/projects/ output.
+    rows = [
+        {
+            "slug": f"project-{i}",
+            "title": f"Project {i}",
+            "description": (
+                f"Project {i}: a small web app built with Django, React and "
+                "TypeScript, deployed on DigitalOcean with a Vercel frontend."
+            ),
+            "live_url": f"https://example.com/projects/{i}",
+            "repo_url": f"https://github.com/example/project-{i}",
+            "sort_order": i,
+            "is_featured": i % 5 == 0,
+        }
+        for i in range(projects)
+    ]
+    return json.dumps(rows).encode("utf-8")
+
+
+def _per_call_us(fn, body: bytes, budget_s: float) -> float:
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < budget_s:
+        fn(body)
+        calls += 1
+    return elapsed / calls * 1e6
+
+
+class Command(BaseCommand):
+    help = "CPU cost vs bytes saved for gzip/brotli levels on API-shaped JSON."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--sizes", default="2,10,50,250", help="Comma-separated project counts."
+        )
+        parser.add_argument("--budget", type=float, default=0.2, help="Seconds/cell.")
+
+    def handle(self, *args, **options) -> None:
+        codecs = {
+            f"gzip-{level}": (
+                lambda body, level=level: gzip.compress(body, level, mtime=0)
+            )
+            for level in (1, 6, 9)
+        }
+        if brotli is not None:
+            codecs.update(
+                {
+                    f"br-{q}": (lambda body, q=q: brotli.compress(body, quality=q))
+                    for q in (1, 5, 9, 11)
+                }
+            )
+        else:
+            self.stdout.write("brotli not installed; gzip only")
+
+        cache_hit = {"k": b""}
+        self.stdout.write(
+            f"{'payload':>10} {'codec':>8} {'out':>8} {'saved':>7} "
+            f"{'us/call':>9} {'us/KB saved':>12}"
+        )
+        for count in (int(x) for x in options["sizes"].split(",")):
+            body = _payload(count)
+            for name, fn in codecs.items():
+                out = len(fn(body))
+                us = _per_call_us(fn, body, options["budget"])
+                saved = len(body) - out
+                per_kb = us / (saved / 1024) if saved > 0 else float("inf")
+                self.stdout.write(
+                    f"{len(body):>9}B {name:>8} {out:>7}B "
+                    f"{saved / len(body):>6.0%} {us:>9.1f} {per_kb:>12.2f}"
+                )
+
+            # what a cached repeat hit costs instead: content digest + lookup
+            hit_us = _per_call_us(
+                lambda b: cache_hit.get(md5(b, usedforsecurity=False).hexdigest()),
+                body,
+                options["budget"],
+            )
+            self.stdout.write(f"{len(body):>9}B {'cached':>8} {'':>17} {hit_us:>9.1f}")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+
+from apps.analytics.metrics import db_pool_stats
+
+
+def _worker(path: str, requests: int) -> list[float]:
+    client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 500:
+                raise CommandError(f"{path} -> {response.status_code}")
+            # what request_finished does outside the test client: keep a
+            # persistent connection, or hand a pooled one back
+            close_old_connections()
+    finally:
+        connections.close_all()
+    return latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "In-process DB-bound load test against the configured database. "
+        "Run once with DB_POOL=0 and once with DB_POOL=1 to compare."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--path", default="/api/content/projects/")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200, help="Per thread.")
+
+    def handle(self, *args, **options) -> None:
+        threads, per_thread = options["threads"], options["requests"]
+        if threads < 1 or per_thread < 1:
+            raise CommandError("--threads and --requests must be at least 1.")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(_worker, options["path"], per_thread)
+                for _ in range(threads)
+            ]
+            latencies = sorted(ms for f in futures for ms in f.result())
+        elapsed = time.perf_counter() - start
+
+        def pct(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        db = settings.DATABASES["default"]
+        pooled = "pool" in db.get("OPTIONS", {})
+        self.stdout.write(
+            f"pool={'on' if pooled else 'off'} conn_max_age={db.get('CONN_MAX_AGE')} "
+            f"threads={threads} requests={len(latencies)}"
+        )
+        self.stdout.write(
+            f"rps={len(latencies) / elapsed:.1f} "
+            f"p50={statistics.median(latencies):.2f}ms "
+            f"p95={pct(0.95):.2f}ms p99={pct(0.99):.2f}ms"
+        )
+        self.stdout.write(f"db={json.dumps(db_pool_stats())}")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from api.logs import JsonFormatter, QueueListenerHandler, access_logger
+
+
+class SlowSink(io.TextIOBase):
+    """/dev/null that takes `delay_s` per write, like a backed-up stdout pipe."""
+
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self._null = open(os.devnull, "w")
+
+    def write(self, s: str) -> int:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return self._null.write(s)
+
+    def flush(self) -> None:
+        self._null.flush()
+
+
+def _worker(path: str, requests: int) -> list[float]:
+    host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost"
+    client = Client(HTTP_HOST=host)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Latency overhead of access logging on a cheap endpoint: "
+        "off vs synchronous JSON handler vs the queue pipeline."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--path", default="/api/health/")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=500, help="Per thread.")
+        parser.add_argument(
+            "--sink-delay-ms",
+            type=float,
+            default=0.0,
+            help="Simulated cost of each stdout write.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        queue_handler = next(
+            (
+                h
+                for h in logging.getLogger().handlers
+                if isinstance(h, QueueListenerHandler)
+            ),
+            None,
+        )
+        if queue_handler is None:
+            raise CommandError(
+                "LOGGING has no QueueListenerHandler on the root logger."
+            )
+
+        sink = SlowSink(options["sink_delay_ms"] / 1000)
+        sync_handler = logging.StreamHandler(sink)
+        sync_handler.setFormatter(JsonFormatter())
+        original_stream = queue_handler.target.setStream(sink)
+
+        def run() -> list[float]:
+            with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+                futures = [
+                    executor.submit(_worker, options["path"], options["requests"])
+                    for _ in range(options["threads"])
+                ]
+                return sorted(ms for f in futures for ms in f.result())
+
+        results = {}
+        try:
+            access_logger.disabled = True
+            results["off"] = run()
+            access_logger.disabled = False
+
+            access_logger.propagate = False
+            access_logger.addHandler(sync_handler)
+            results["sync"] = run()
+            access_logger.removeHandler(sync_handler)
+            access_logger.propagate = True
+
+            dropped = queue_handler.dropped
+            results["queue"] = run()
+            dropped = queue_handler.dropped - dropped
+        finally:
+            access_logger.disabled = False
+            access_logger.propagate = True
+            access_logger.removeHandler(sync_handler)
+            queue_handler.stop()  # drain into the sink before restoring stdout
+            queue_handler.target.setStream(original_stream)
+
+        baseline = statistics.mean(results["off"])
+        for mode, latencies in results.items():
+            mean = statistics.mean(latencies)
+            p50 = statistics.median(latencies)
+            p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+            self.stdout.write(
+                f"{mode:>6}: mean={mean:.3f}ms p50={p50:.3f}ms "
+                f"p99={p99:.3f}ms overhead={mean - baseline:+.3f}ms"
+            )
+        self.stdout.write(f"queue records dropped: {dropped}")
+        self.stdout.write(self.style.SUCCESS("Done."))
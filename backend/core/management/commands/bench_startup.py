@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ["/api/health/", "/api/content/projects/"]
+
+# Runs in a fresh interpreter so every measurement is a true cold start.
+# The DB is swapped for in-memory SQLite (migrated outside the timed parts)
+# so the numbers don't depend on a reachable Postgres.
+CHILD_SCRIPT = r"""
+import json, os, sys, time
+
+t0 = time.perf_counter()
+from django.conf import settings
+settings.INSTALLED_APPS  # loads config.settings (dotenv, dj_database_url, ...)
+t_settings = time.perf_counter()
+
+settings.DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+}
+settings.ALLOWED_HOSTS = ["*"]
+
+import config.wsgi  # the production entry point: django.setup() + warm-up
+t_setup = time.perf_counter()
+
+from django.core.management import call_command
+call_command("migrate", verbosity=0)
+
+from django.test import Client
+client = Client()
+result = {
+    "settings_ms": (t_settings - t0) * 1000,
+    "setup_ms": (t_setup - t_settings) * 1000,
+}
+for path in json.loads(os.environ["BENCH_PATHS"]):
+    for label in ("first", "warm"):
+        start = time.perf_counter()
+        response = client.get(path)
+        result[f"{label}_request_ms {path}"] = (time.perf_counter() - start) * 1000
+        if response.status_code >= 500:
+            raise SystemExit(f"{path} -> {response.status_code}")
+print(json.dumps(result))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _run_child(paths: list[str], importtime: bool) -> tuple[dict, str]:
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "config.settings"
+        ),
+        "BENCH_PATHS": json.dumps(paths),
+    }
+    flags = ["-X", "importtime"] if importtime else []
+    cmd = [sys.executable, *flags, "-c", CHILD_SCRIPT]
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        cmd, capture_output=True, text=True, cwd=settings.BASE_DIR, env=env
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise CommandError(f"Benchmark child failed:\n{proc.stderr[-2000:]}")
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall_ms"] = wall_ms
+    return result, proc.stderr
+
+
+def parse_importtime(stderr: str) -> tuple[dict[str, float], dict[str, float]]:
+    """-> (cumulative ms per module, self ms summed per top-level package)"""
+    modules: dict[str, float] = {}
+    packages: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        modules[name] = int(cumulative_us) / 1000
+        packages[name.split(".")[0]] += int(self_us) / 1000
+    return modules, dict(packages)
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start cost: imports, django.setup() and first requests."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--path", action="append", dest="paths")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--output", help="Write results as JSON here.")
+        parser.add_argument("--compare", help="Baseline JSON to diff against.")
+
+    def handle(self, *args, **options) -> None:
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        paths = options["paths"] or DEFAULT_PATHS
+
+        # Import-time profile from its own run: -X importtime skews timings.
+        _, stderr = _run_child(paths, importtime=True)
+        modules, packages = parse_importtime(stderr)
+
+        runs = [
+            _run_child(paths, importtime=False)[0] for _ in range(options["runs"])
+        ]
+        metrics = {
+            key: round(statistics.median(run[key] for run in runs), 2)
+            for key in runs[0]
+        }
+
+        results = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "runs": options["runs"],
+            "metrics": metrics,
+            "packages_self_ms": {
+                name: round(ms, 2)
+                for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])
+            },
+        }
+
+        self.stdout.write(f"commit={results['commit']} python={results['python']}")
+        self.stdout.write(f"median of {options['runs']} cold starts:")
+        for key, value in metrics.items():
+            self.stdout.write(f"  {key:<45} {value:9.2f} ms")
+
+        self.stdout.write(f"top {options['top']} imports (cumulative):")
+        top = sorted(modules.items(), key=lambda kv: -kv[1])[: options["top"]]
+        for name, ms in top:
+            self.stdout.write(f"  {name:<45} {ms:9.2f} ms")
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            self.stdout.write(f"vs baseline {baseline.get('commit')}:")
+            for key, value in metrics.items():
+                before = baseline.get("metrics", {}).get(key)
+                if not before:
+                    continue
+                change = (value - before) / before * 100
+                self.stdout.write(
+                    f"  {key:<45} {before:9.2f} -> {value:9.2f} ({change:+.1f}%)"
+                )
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.profiling import MODES, PROFILE_HEADER, make_profile_token
+
+
+class Command(BaseCommand):
+    help = "Print a signed X-Profile header value that profiles a request."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--mode", choices=MODES, default="cprofile")
+
+    def handle(self, *args, **options) -> None:
+        token = make_profile_token(options["mode"])
+        self.stdout.write(f"{PROFILE_HEADER}: {token}")
+        self.stdout.write(
+            f"Valid for {settings.PROFILE_TOKEN_MAX_AGE}s; the response carries "
+            "X-Profile-ID, and the files are listed at /admin/profiles/."
+        )
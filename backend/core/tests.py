@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.management.commands.bench_startup import parse_importtime
+from core.management.commands.boot import FINGERPRINT_FILE
+
+
+class BootCommandTests(TestCase):
+    def test_collectstatic_runs_once_then_is_skipped(self):
+        with TemporaryDirectory() as static_root, override_settings(
+            STATIC_ROOT=static_root
+        ):
+            first, second = StringIO(), StringIO()
+            call_command("boot", "--no-migrate", stdout=first)
+            call_command("boot", "--no-migrate", stdout=second)
+
+            assert "collected" in first.getvalue()
+            assert "skipped (fingerprint match)" in second.getvalue()
+            assert (Path(static_root) / FINGERPRINT_FILE).exists()
+
+    def test_changed_fingerprint_recollects(self):
+        with TemporaryDirectory() as static_root, override_settings(
+            STATIC_ROOT=static_root
+        ):
+            call_command("boot", "--no-migrate", stdout=StringIO())
+            (Path(static_root) / FINGERPRINT_FILE).write_text("stale")
+
+            out = StringIO()
+            call_command("boot", "--no-migrate", stdout=out)
+
+            assert "collected" in out.getvalue()
+
+    def test_migrate_is_skipped_when_plan_is_empty(self):
+        out = StringIO()
+        call_command("boot", "--no-static", stdout=out)
+
+        assert "skipped (no pending migrations)" in out.getvalue()
+        assert "total" in out.getvalue()
+
+
+class BenchStartupParserTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        stderr = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |     django.utils",
+                "import time:      1500 |       1620 |   django.http",
+                "import time:      2000 |       2000 | yaml",
+                "some unrelated warning",
+            ]
+        )
+
+        modules, packages = parse_importtime(stderr)
+
+        self.assertEqual(modules["django.http"], 1.62)
+        self.assertEqual(modules["yaml"], 2.0)
+        self.assertAlmostEqual(packages["django"], 1.62)
+        self.assertEqual(len(modules), 3)
+
+
+PREFORK_SCRIPT = r"""
+import json, os, threading
+
+import config.wsgi
+from django.db import connection, connections
+
+pools = sorted(type(connections["default"])._connection_pools)
+threads = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+pid = os.fork()
+if pid == 0:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        os._exit(0 if connection.pool is not None else 1)
+_, status = os.waitpid(pid, 0)
+print(json.dumps({
+    "pooled": "pool" in connection.settings_dict["OPTIONS"],
+    "pools": pools,
+    "threads": threads,
+    "worker": os.waitstatus_to_exitcode(status),
+}))
+"""
+
+
+class PreforkTests(TestCase):
+    @skipUnless(os.getenv("TEST_POSTGRES_URL"), "needs TEST_POSTGRES_URL")
+    def test_wsgi_import_leaves_no_pool_to_workers(self):
+        env = {
+            **os.environ,
+            "DATABASE_URL": os.environ["TEST_POSTGRES_URL"],
+            "DB_POOL": "1",
+            "SECRET_KEY": "x",
+        }
+        proc = subprocess.run(
+            [sys.executable, "-c", PREFORK_SCRIPT],
+            cwd=Path(__file__).resolve().parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        result = json.loads(proc.stdout.splitlines()[-1])
+
+        self.assertTrue(result["pooled"])
+        self.assertEqual(result["pools"], [])  # no queries before the fork
+        self.assertEqual(result["threads"], [])  # no pool workers either
+        self.assertEqual(result["worker"], 0)  # the worker got its own pool
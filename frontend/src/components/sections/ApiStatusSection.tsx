@@ -1,5 +1,10 @@
 import { useEffect, useMemo, useState } from 'react';
-import { ApiError, apiGet } from '@/lib/api';
+import {
+  ApiError,
+  apiBatch,
+  unwrapBatchResult,
+  type BatchResult,
+} from '@/lib/api';
 import { StatusBadge } from '@/components/ui/StatusBadge/StatusBadge';
 import { Container } from '../layout/Container';
 import styles from './ApiStatusSection.module.css';
@@ -16,6 +21,29 @@ function badgeLabelFor(kind: ApiStatusState['kind']) {
   return kind === 'loading' ? 'Loading...' : kind === 'ok' ? 'OK' : 'Error';
 }
 
+function errorStateFor(err: unknown): ApiStatusState {
+  if (err instanceof ApiError) {
+    return {
+      kind: 'error',
+      message: err.code ? `${err.code}: ${err.message}` : err.message,
+    };
+  }
+  return {
+    kind: 'error',
+    message: err instanceof Error ? err.message : 'Unknown error',
+  };
+}
+
+function statusStateFor(result: BatchResult | undefined): ApiStatusState {
+  try {
+    const data = unwrapBatchResult<HealthResponse | AuthCheckResponse>(result);
+    if ((data as { status?: unknown }).status === 'ok') return { kind: 'ok' };
+    return { kind: 'error', message: 'Unexpected response shape' };
+  } catch (err) {
+    return errorStateFor(err);
+  }
+}
+
 function StatusRow(props: {
   label: string;
   path: string;
@@ -63,41 +91,28 @@ export function ApiStatusSection() {
   useEffect(() => {
     const abortController = new AbortController();
 
-    async function runCheck<T>(
-      path: string,
-      setState: (s: ApiStatusState) => void,
-    ) {
+    // Both checks in one round trip (POST /api/batch/).
+    async function runChecks() {
       try {
-        setState({ kind: 'loading' });
-
-        const data = await apiGet<T>(path, { signal: abortController.signal });
-
-        if ((data as { status?: unknown }).status === 'ok') {
-          setState({ kind: 'ok' });
-          return;
-        }
-
-        setState({ kind: 'error', message: 'Unexpected response shape' });
+        const results = await apiBatch(
+          [
+            { id: 'health', path: '/api/health/' },
+            { id: 'authCheck', path: '/api/auth-check/' },
+          ],
+          { signal: abortController.signal },
+        );
+        setHealth(statusStateFor(results.health));
+        setAuthCheck(statusStateFor(results.authCheck));
       } catch (err) {
         if (err instanceof DOMException && err.name === 'AbortError') return;
 
-        if (err instanceof ApiError) {
-          setState({
-            kind: 'error',
-            message: err.code ? `${err.code}: ${err.message}` : err.message,
-          });
-          return;
-        }
-
-        setState({
-          kind: 'error',
-          message: err instanceof Error ? err.message : 'Unknown error',
-        });
+        const state = errorStateFor(err);
+        setHealth(state);
+        setAuthCheck(state);
       }
     }
 
-    runCheck<HealthResponse>('/api/health/', setHealth);
-    runCheck<AuthCheckResponse>('/api/auth-check/', setAuthCheck);
+    runChecks();
 
     return () => abortController.abort();
   }, []);
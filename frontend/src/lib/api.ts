@@ -152,3 +152,51 @@ export async function apiRequest<T>(
 export function apiGet<T>(path: string, options?: { signal?: AbortSignal }) {
   return apiRequest<T>(path, { method: 'GET', signal: options?.signal });
 }
+
+export type BatchResult = {
+  id: string;
+  status: number;
+  body: unknown;
+  etag?: string;
+};
+
+/**
+ * Run several GET requests in one round trip via `POST /api/batch/`.
+ * Results are keyed by id; unwrap each with `unwrapBatchResult`.
+ */
+export async function apiBatch(
+  requests: { id: string; path: string }[],
+  options?: { signal?: AbortSignal },
+): Promise<Record<string, BatchResult>> {
+  const data = await apiRequest<{ responses: BatchResult[] }>('/api/batch/', {
+    method: 'POST',
+    signal: options?.signal,
+    body: { requests },
+  });
+  return Object.fromEntries(data.responses.map((r) => [r.id, r]));
+}
+
+/** The body of a 2xx sub-response; throws `ApiError` like `apiRequest`. */
+export function unwrapBatchResult<T>(result: BatchResult | undefined): T {
+  if (!result) {
+    throw new ApiError({
+      status: 0,
+      statusText: '',
+      message: 'Missing batch response',
+    });
+  }
+  if (result.status >= 200 && result.status < 300) return result.body as T;
+
+  const isAuthFailure = result.status === 401 || result.status === 403;
+  const envelope = isErrorEnvelope(result.body) ? result.body : undefined;
+
+  throw new ApiError({
+    status: result.status,
+    statusText: '',
+    code: envelope?.error.code,
+    message: isAuthFailure
+      ? friendlyAuthMessage(result.status)
+      : (envelope?.error.message ?? `HTTP ${result.status}`),
+    details: envelope ? envelope.error.details : result.body,
+  });
+}
@@ -4,6 +4,8 @@ import react from '@vitejs/plugin-react';
 
 const apiProxyTarget =
   process.env.VITE_API_PROXY_TARGET ?? 'http://localhost:8000';
+const streamProxyTarget =
+  process.env.VITE_STREAM_PROXY_TARGET ?? 'http://localhost:8001';
 
 export default defineConfig({
   plugins: [react()],
@@ -15,6 +17,11 @@ export default defineConfig({
   server: {
     host: true,
     proxy: {
+      // Long-lived SSE connections go to the ASGI app (uvicorn).
+      '/api/stats/stream': {
+        target: streamProxyTarget,
+        changeOrigin: true,
+      },
       // Proxy API requests during local dev to the Django backend container.
       '/api': {
         target: apiProxyTarget,